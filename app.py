@@ -0,0 +1,92 @@
+import base64
+import binascii
+from concurrent.futures import TimeoutError
+from dataclasses import replace
+from flask import Flask, request, jsonify, render_template
+from flask_cors import CORS
+from cnnClassifier import logger
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.components.micro_batcher import MicroBatcher, QueueFullError
+from cnnClassifier.pipeline.prediction import (
+    MappedPredictionPipeline,
+    PredictionPipeline,
+)
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+def create_app(predictor, serving_config) -> Flask:
+    """Build the Flask app around a loaded predictor.
+
+    Requests to ``/predict`` are decoded in the request thread and then
+    handed to a shared ``MicroBatcher`` so concurrent images reach the model
+    as one batch.
+    """
+
+    app = Flask(__name__)
+    CORS(app)
+
+    batcher = MicroBatcher(
+        predict_fn=predictor.predict,
+        max_batch_size=serving_config.max_batch_size,
+        max_wait_ms=serving_config.max_wait_ms,
+        max_queue_size=serving_config.max_queue_size,
+    )
+    app.config["BATCHER"] = batcher
+
+    @app.route("/", methods=["GET"])
+    def home():
+        return render_template("index.html")
+
+    @app.route("/predict", methods=["POST"])
+    def predict():
+        payload = request.get_json(silent=True) or {}
+        if "image" not in payload:
+            return jsonify({"error": "Missing 'image' field"}), 400
+
+        try:
+            image = predictor.load_image(base64.b64decode(payload["image"]))
+        except (binascii.Error, ValueError) as e:
+            return jsonify({"error": f"Invalid image: {e}"}), 400
+        except Exception as e:
+            logger.error(f"Failed to decode request image: {e}")
+            return jsonify({"error": "Invalid image"}), 400
+
+        try:
+            future = batcher.submit(image)
+        except QueueFullError as e:
+            return jsonify({"error": str(e)}), 503
+
+        try:
+            result = future.result(timeout=REQUEST_TIMEOUT_SECONDS)
+        except TimeoutError:
+            # leaves the queue unless its batch is already being predicted
+            future.cancel()
+            return jsonify({"error": "Prediction timed out"}), 504
+        except Exception as e:
+            logger.error(f"Prediction failed: {e}")
+            return jsonify({"error": "Prediction failed"}), 500
+
+        return jsonify(result)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return jsonify(batcher.metrics())
+
+    return app
+
+
+if __name__ == "__main__":
+    config_manager = ConfigurationManager()
+    serving_config = config_manager.get_serving_config()
+    prediction_config = config_manager.get_prediction_config()
+    if serving_config.model_dir.exists():
+        # weights mapped in place: fast start, pages shared between workers
+        predictor = MappedPredictionPipeline(
+            replace(prediction_config, trained_model_path=serving_config.model_dir)
+        )
+    else:
+        predictor = PredictionPipeline(prediction_config)
+
+    app = create_app(predictor, serving_config)
+    app.run(host=serving_config.host, port=serving_config.port, threaded=True)
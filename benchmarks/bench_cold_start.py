@@ -0,0 +1,146 @@
+"""Compare the cold start of a serving process for the ``.keras`` model and
+the memory-mapped serving model.
+
+Saves an untrained VGG16 classifier in both formats, then starts
+``--runs`` fresh interpreters per format. Each one imports TensorFlow,
+loads the model and predicts one batch, reporting the time of every step
+and its private (anonymous) and shared (file-backed) resident memory.
+Private memory is what every extra serving worker adds.
+
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def resident_mb() -> dict:
+    """Private and file-backed resident memory of this process."""
+
+    memory = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("RssAnon", "RssFile"):
+                memory[key] = int(value.split()[0]) / 1024
+    return {"private_mb": memory["RssAnon"], "shared_mb": memory["RssFile"]}
+
+
+def child(model_format: str, path: str, image_size: int) -> None:
+    """One cold start; prints its timings as JSON."""
+
+    start = time.perf_counter()
+    import numpy as np
+    import tensorflow as tf
+
+    timings = {"import_seconds": time.perf_counter() - start}
+    baseline = resident_mb()
+
+    start = time.perf_counter()
+    if model_format == "keras":
+        model = tf.keras.models.load_model(path)
+    else:
+        from cnnClassifier.components.serving_artifact import MappedModel
+
+        model = MappedModel(path)
+    timings["load_seconds"] = time.perf_counter() - start
+
+    images = np.zeros((1, image_size, image_size, 3), dtype=np.float32)
+    start = time.perf_counter()
+    model.predict_on_batch(images)
+    timings["first_prediction_seconds"] = time.perf_counter() - start
+
+    memory = resident_mb()
+    timings["private_mb"] = memory["private_mb"] - baseline["private_mb"]
+    timings["shared_mb"] = memory["shared_mb"] - baseline["shared_mb"]
+    print(json.dumps(timings))
+
+
+def save_models(args) -> dict:
+    import tensorflow as tf
+    from cnnClassifier.components.base_model import BaseModel
+    from cnnClassifier.components.serving_artifact import save_serving_model
+
+    backbone = tf.keras.applications.vgg16.VGG16(
+        input_shape=(args.image_size, args.image_size, 3),
+        weights=None,
+        include_top=False,
+    )
+    model = BaseModel._prepare_full_model(
+        model=backbone,
+        classes=2,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01,
+    )
+    os.makedirs(args.work_dir, exist_ok=True)
+    paths = {
+        "keras": os.path.join(args.work_dir, "model.keras"),
+        "mapped": os.path.join(args.work_dir, "serving_model"),
+    }
+    model.save(paths["keras"])
+    save_serving_model(model, paths["mapped"])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--work-dir", default="artifacts/benchmarks/cold_start")
+    parser.add_argument(
+        "--output", default="artifacts/benchmarks/cold_start.json", help="JSON report"
+    )
+    parser.add_argument("--child", nargs=2, metavar=("FORMAT", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.image_size)
+        return
+
+    paths = save_models(args)
+    results = {}
+    for model_format, path in paths.items():
+        runs = []
+        for _ in range(args.runs):
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--image-size",
+                    str(args.image_size),
+                    "--child",
+                    model_format,
+                    path,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        results[model_format] = {
+            key: round(statistics.median(run[key] for run in runs), 3)
+            for key in runs[0]
+        }
+        print(f"{model_format:>7}: {results[model_format]}")
+
+    keras, mapped = results["keras"], results["mapped"]
+    speedup = round(keras["load_seconds"] / mapped["load_seconds"], 1)
+    print(f"load speedup {speedup}x")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(
+            {"args": vars(args), "results": results, "load_speedup": speedup},
+            f,
+            indent=4,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the classifier HEAD options by size and latency.
+
+Builds the full VGG16 model once per head with ``WEIGHTS: None`` (offline),
+saves it as ``.keras`` and reports parameter count, artifact size,
+single-image and batched inference latency and training step time.
+
+    python benchmarks/bench_heads.py --image-size 224 --runs 20
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import numpy as np
+import tensorflow as tf
+from cnnClassifier.components.base_model import HEADS, BaseModel
+from cnnClassifier.utils.profiling import latency
+
+
+def run_head(head: str, args) -> dict:
+    image_shape = (args.image_size, args.image_size, 3)
+    backbone = tf.keras.applications.vgg16.VGG16(
+        input_shape=image_shape, weights=None, include_top=False
+    )
+    model = BaseModel._prepare_full_model(
+        model=backbone,
+        classes=2,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01,
+        head=head,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.keras")
+        model.save(path)
+        size_mb = os.path.getsize(path) / 2**20
+
+    single = np.random.rand(1, *image_shape).astype(np.float32)
+    batch = np.random.rand(args.batch_size, *image_shape).astype(np.float32)
+    labels = np.eye(2, dtype=np.float32)[np.arange(args.batch_size) % 2]
+
+    return {
+        "head": head,
+        "params": int(model.count_params()),
+        "trainable_params": int(sum(np.prod(w.shape) for w in model.trainable_weights)),
+        "artifact_mb": round(size_mb, 2),
+        "single_image": latency(lambda: model.predict_on_batch(single), args.runs),
+        f"batch_{args.batch_size}": latency(
+            lambda: model.predict_on_batch(batch), args.runs
+        ),
+        "train_step": latency(lambda: model.train_on_batch(batch, labels), args.runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--output", default="artifacts/benchmarks/heads.json", help="JSON report"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for head in HEADS:
+        result = run_head(head, args)
+        results.append(result)
+        print(
+            f"{head:>18}  params={result['params']:>11,}  "
+            f"size={result['artifact_mb']:7.1f} MB  "
+            f"single p50={result['single_image']['p50_ms']:7.1f} ms  "
+            f"train p50={result['train_step']['p50_ms']:7.1f} ms"
+        )
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"args": vars(args), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare training step time and accuracy across PRECISION / JIT_COMPILE.
+
+Runs offline on a synthetic two-class problem with an untrained VGG16
+backbone (``WEIGHTS: None``), so absolute accuracy is only meaningful
+relative to the float32 baseline. ``mixed_float16`` is opt-in: most CPUs
+have no native float16 convolutions and it is far slower there.
+
+    python benchmarks/bench_precision.py --image-size 64 --steps 20
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from cnnClassifier.components.base_model import BaseModel
+
+
+def synthetic_batch(batch_size: int, image_size: int, seed: int) -> tuple:
+    """Two classes separable by mean intensity, in the [0, 1] range."""
+
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, size=batch_size)
+    images = rng.random((batch_size, image_size, image_size, 3), dtype=np.float32)
+    images = 0.5 * images + 0.4 * labels[:, None, None, None]
+    return images.astype(np.float32), np.eye(2, dtype=np.float32)[labels]
+
+
+def run_mode(precision: str, jit_compile: bool, args) -> dict:
+    tf.keras.mixed_precision.set_global_policy(precision)
+    backbone = tf.keras.applications.vgg16.VGG16(
+        input_shape=(args.image_size, args.image_size, 3),
+        weights=None,
+        include_top=False,
+    )
+    model = BaseModel._prepare_full_model(
+        model=backbone,
+        classes=2,
+        freeze_all=False,
+        freeze_till=None,
+        learning_rate=args.learning_rate,
+        precision=precision,
+        jit_compile=jit_compile,
+    )
+
+    x, y = synthetic_batch(args.batch_size, args.image_size, seed=0)
+    for _ in range(args.warmup):
+        model.train_on_batch(x, y)
+
+    step_times = []
+    for step in range(args.steps):
+        x, y = synthetic_batch(args.batch_size, args.image_size, seed=step + 1)
+        start = time.perf_counter()
+        model.train_on_batch(x, y)
+        step_times.append(time.perf_counter() - start)
+
+    x, y = synthetic_batch(4 * args.batch_size, args.image_size, seed=10_000)
+    _, accuracy = model.evaluate(x, y, batch_size=args.batch_size, verbose=0)
+
+    return {
+        "precision": precision,
+        "jit_compile": jit_compile,
+        "median_step_s": float(np.median(step_times)),
+        "mean_step_s": float(np.mean(step_times)),
+        "accuracy": float(accuracy),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image-size", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--learning-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--precisions",
+        nargs="+",
+        default=["float32", "mixed_bfloat16"],
+        choices=["float32", "mixed_bfloat16", "mixed_float16"],
+    )
+    parser.add_argument(
+        "--output", default="artifacts/benchmarks/precision.json", help="JSON report"
+    )
+    args = parser.parse_args()
+
+    results = []
+    modes = [(p, jit) for p in args.precisions for jit in (False, True)]
+    for precision, jit_compile in modes:
+        result = run_mode(precision, jit_compile, args)
+        results.append(result)
+        print(
+            f"{precision:>15}  jit={str(jit_compile):<5}  "
+            f"step={result['median_step_s'] * 1000:8.1f} ms  "
+            f"accuracy={result['accuracy']:.3f}"
+        )
+
+    tf.keras.mixed_precision.set_global_policy("float32")
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"args": vars(args), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Check that orchestration commands start fast.
+
+Runs ``python -X importtime`` on a module (``main`` by default) in a fresh
+interpreter, prints the slowest imports and fails when the total import
+time exceeds ``--budget-ms`` or a heavy dependency is loaded eagerly.
+
+    python benchmarks/bench_startup.py --budget-ms 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# must only be imported once a stage actually needs them
+HEAVY_MODULES = ("tensorflow", "keras", "mlflow", "dagshub", "gdown", "joblib")
+
+
+def import_times(module: str) -> dict:
+    """Return ``{module: cumulative_us}`` for one cold import of ``module``."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--output", default="artifacts/benchmarks/startup.json", help="JSON report"
+    )
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    total_ms = statistics.median(run[args.module] for run in runs) / 1000
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    packages = {name.split(".")[0] for name in runs[-1]}
+    heavy = sorted(packages.intersection(HEAVY_MODULES))
+
+    for name, cumulative in slowest[: args.top]:
+        print(f"{cumulative / 1000:9.1f} ms  {name}")
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms} ms)")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "args": vars(args),
+                "import_ms": total_ms,
+                "heavy_modules": heavy,
+                "slowest": dict(slowest[: args.top]),
+            },
+            f,
+            indent=4,
+        )
+
+    errors = []
+    if heavy:
+        errors.append(f"heavy modules imported eagerly: {', '.join(heavy)}")
+    if total_ms > args.budget_ms:
+        errors.append(f"import took {total_ms:.1f} ms, over {args.budget_ms} ms")
+    if errors:
+        sys.exit("\n".join(errors))
+
+
+if __name__ == "__main__":
+    main()
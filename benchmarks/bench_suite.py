@@ -0,0 +1,288 @@
+"""Offline benchmark of the input pipeline, training step and inference.
+
+Generates a synthetic kidney-CT-like image tree (``Normal`` / ``Tumor``),
+prepares the model with ``WEIGHTS: None`` and measures:
+
+* images/sec through ``Training.train_valid_generator``,
+* per-step time of ``model.fit``,
+* p50/p99 latency of ``PredictionPipeline`` for one image and for a batch.
+
+Results are written as JSON and compared against a stored baseline; any
+metric worse than the baseline by more than ``--tolerance`` fails the run,
+as does a missing baseline. Timings depend on the machine, so the baseline
+is recorded where the gate runs rather than committed.
+
+    python benchmarks/bench_suite.py --update-baseline   # record a baseline
+    python benchmarks/bench_suite.py                     # compare against it
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier.components.base_model import BaseModel
+from cnnClassifier.components.model_training import Training
+from cnnClassifier.entity.config_entity import (
+    BaseModelConfig,
+    PredictionConfig,
+    TrainingConfig,
+)
+from cnnClassifier.pipeline.prediction import PredictionPipeline
+from cnnClassifier.utils.profiling import latency
+
+CLASS_NAMES = ("Normal", "Tumor")
+
+# metric -> True when larger is better
+METRICS = {
+    "input_pipeline.images_per_sec": True,
+    "fit.step_p50_ms": False,
+    "inference.single_p50_ms": False,
+    "inference.single_p99_ms": False,
+    "inference.batch_p50_ms": False,
+    "inference.batch_p99_ms": False,
+}
+
+# arguments that change what is measured; baselines are only comparable
+# when these match
+WORKLOAD_ARGS = ("images", "image_size", "batch_size", "augmentation", "head")
+
+# the AUGMENTATIONS default in params.yaml
+AUGMENTATIONS = [
+    {"type": "flip", "mode": "horizontal"},
+    {"type": "rotation", "factor": 0.1},
+    {"type": "zoom", "factor": 0.2},
+    {"type": "translation", "factor": 0.1},
+]
+
+
+def synthetic_slice(rng: np.random.Generator, size: int, tumor: bool) -> np.ndarray:
+    """A dark slice with a noisy kidney-shaped ellipse; tumours add a bright
+    round lesion inside it."""
+
+    y, x = np.mgrid[0:size, 0:size] / size
+    cy, cx = rng.uniform(0.4, 0.6, size=2)
+    ry, rx = rng.uniform(0.2, 0.3), rng.uniform(0.12, 0.2)
+    kidney = ((y - cy) / ry) ** 2 + ((x - cx) / rx) ** 2 < 1
+
+    image = rng.normal(30, 10, (size, size))
+    image[kidney] = rng.normal(120, 20, kidney.sum())
+    if tumor:
+        ly, lx = cy + rng.uniform(-0.5, 0.5) * ry, cx + rng.uniform(-0.5, 0.5) * rx
+        lesion = (y - ly) ** 2 + (x - lx) ** 2 < rng.uniform(0.04, 0.08) ** 2
+        image[lesion] = rng.normal(220, 15, lesion.sum())
+
+    image = np.clip(image, 0, 255).astype(np.uint8)
+    return np.repeat(image[..., None], 3, axis=-1)
+
+
+def make_image_tree(root: Path, num_images: int, size: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    for label, class_name in enumerate(CLASS_NAMES):
+        class_dir = root / class_name
+        os.makedirs(class_dir, exist_ok=True)
+        for i in range(num_images // len(CLASS_NAMES)):
+            image = synthetic_slice(rng, size, tumor=bool(label))
+            tf.io.write_file(str(class_dir / f"{i:05d}.jpg"), tf.io.encode_jpeg(image))
+
+
+def make_configs(root: Path, args) -> tuple:
+    image_size = (args.image_size, args.image_size, 3)
+    base_model_config = BaseModelConfig(
+        root_dir=root,
+        base_model_path=root / "base_model.keras",
+        updated_base_model_path=root / "base_model_updated.keras",
+        params_image_size=image_size,
+        params_learning_rate=0.01,
+        params_include_top=False,
+        params_weights=None,
+        params_classes=len(CLASS_NAMES),
+        params_precision="float32",
+        params_jit_compile=False,
+        params_head=args.head,
+        params_head_units=256,
+        params_head_dropout=0.5,
+    )
+    training_config = TrainingConfig(
+        root_dir=root,
+        trained_model_path=root / "model.keras",
+        updated_base_model_path=base_model_config.updated_base_model_path,
+        training_data=root / "data",
+        local_data_file=root / "data.zip",
+        feature_cache_dir=root / "feature_cache",
+        shards_dir=root / "shards",
+        augmented_epochs_dir=root / "augmented_epochs",
+        checkpoint_dir=root / "checkpoints",
+        params_epochs=1,
+        params_batch_size=args.batch_size,
+        params_is_augmentation=args.augmentation,
+        params_augmentations=AUGMENTATIONS,
+        params_augmented_epochs=0,
+        params_image_size=image_size,
+        params_cache_features=False,
+        params_use_shards=False,
+        params_cache_dataset=False,
+        params_read_from_zip=False,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_distribution="none",
+        params_num_cpu_devices=1,
+        params_checkpoint_every=1,
+        params_early_stopping_patience=0,
+    )
+    prediction_config = PredictionConfig(
+        trained_model_path=training_config.trained_model_path,
+        class_names=list(CLASS_NAMES),
+        params_image_size=image_size,
+        params_batch_size=args.batch_size,
+    )
+    return base_model_config, training_config, prediction_config
+
+
+class StepTimer(tf.keras.callbacks.Callback):
+    def on_train_begin(self, logs=None):
+        self.times = []
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.times.append(time.perf_counter() - self._start)
+
+
+def images_per_sec(dataset: tf.data.Dataset, passes: int) -> float:
+    """Best throughput over several full passes; the first one also pays
+    for file listing and graph tracing."""
+
+    best = 0.0
+    for _ in range(passes):
+        start = time.perf_counter()
+        count = sum(int(images.shape[0]) for images, _ in dataset)
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def run(root: Path, args) -> dict:
+    base_model_config, training_config, prediction_config = make_configs(root, args)
+    make_image_tree(training_config.training_data, args.images, args.image_size)
+
+    base_model = BaseModel(config=base_model_config)
+    base_model.get_base_model()
+    base_model.update_base_model()
+
+    training = Training(training_config, base_model_config)
+    training.get_base_model()
+    training.train_valid_generator()
+    throughput = images_per_sec(training.train_generator, args.passes)
+
+    timer = StepTimer()
+    training.fit_model.fit(
+        training.train_generator, epochs=args.epochs, callbacks=[timer], verbose=0
+    )
+    step_times = timer.times[1:]  # the first step traces the train function
+    training.save_model(path=training_config.trained_model_path, model=training.model)
+
+    predictor = PredictionPipeline(prediction_config)
+    rng = np.random.default_rng(1)
+    single = synthetic_slice(rng, args.image_size, tumor=True)
+    batch = [
+        synthetic_slice(rng, args.image_size, tumor=bool(i % 2))
+        for i in range(args.batch_size)
+    ]
+    single_latency = latency(lambda: predictor.predict_proba(single), args.runs)
+    batch_latency = latency(lambda: predictor.predict_proba(batch), args.runs)
+
+    return {
+        "input_pipeline.images_per_sec": throughput,
+        "fit.step_p50_ms": float(np.percentile(step_times, 50) * 1000),
+        "inference.single_p50_ms": single_latency["p50_ms"],
+        "inference.single_p99_ms": single_latency["p99_ms"],
+        "inference.batch_p50_ms": batch_latency["p50_ms"],
+        "inference.batch_p99_ms": batch_latency["p99_ms"],
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return one message per metric that regressed by more than
+    ``tolerance`` (a fraction) against the baseline."""
+
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        if metric not in baseline:
+            continue
+        old, new = baseline[metric], results[metric]
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        status = "REGRESSION" if change > tolerance else "ok"
+        print(
+            f"{metric:>32}  {old:10.2f} -> {new:10.2f}  "
+            f"({(new - old) / old:+.1%})  {status}"
+        )
+        if change > tolerance:
+            regressions.append(f"{metric} regressed by {change:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=128)
+    parser.add_argument("--image-size", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--passes", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--head", default="flatten")
+    parser.add_argument("--no-augmentation", dest="augmentation", action="store_false")
+    parser.add_argument(
+        "--output", default="artifacts/benchmarks/suite.json", help="JSON report"
+    )
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed slowdown fraction"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store this run as the new baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = run(Path(tmp_dir), args)
+
+    report = {"args": vars(args), "results": results}
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(results, indent=4))
+        sys.exit(
+            f"No baseline at {args.baseline}; record one on the machine that "
+            "runs the gate with --update-baseline"
+        )
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    mismatched = [
+        key for key in WORKLOAD_ARGS if baseline["args"].get(key) != report["args"][key]
+    ]
+    if mismatched:
+        sys.exit(f"Baseline was recorded with different {', '.join(mismatched)}")
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        sys.exit("\n".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,214 @@
-from cnnClassifier import logger
+import argparse
+from functools import partial
 from cnnClassifier.pipeline.stage_1_data_ingestion import DataIngestionTrainingPipeline
+from cnnClassifier.pipeline.stage_1_data_sharding import DataShardingPipeline
+from cnnClassifier.pipeline.stage_1_augmentation import AugmentationPipeline
 from cnnClassifier.pipeline.stage_2_prepare_base_model import (
     PrepareBaseModelTrainingPipeline,
 )
 from cnnClassifier.pipeline.stage_3_model_training import ModelTrainingPipeline
+from cnnClassifier.pipeline.stage_4_model_evaluation import ModelEvaluationPipeline
+from cnnClassifier.pipeline.stage_4_model_export import ModelExportPipeline
+from cnnClassifier.pipeline.stage_5_distillation import DistillationPipeline
+from cnnClassifier.pipeline.runner import Stage, StageRunner
+from cnnClassifier.components.artifact_context import ArtifactContext
+from cnnClassifier.utils.profiling import Profiler, profiling
 from cnnClassifier.config.configuration import ConfigurationManager
-from cnnClassifier.global_flags import DAGSHUB_INITIALIZED
-import dagshub
 
+INGESTED_MANIFEST = "manifest:data_ingestion.unzip_dir"
 
-config_manager = ConfigurationManager()
-dagshub_config = config_manager.get_dagshub_config()
+# hands the prepared model to training without a save/load round trip
+context = ArtifactContext()
 
-if dagshub_config.mlflow:
-    dagshub.init(
-        repo_owner=dagshub_config.repo_owner,
-        repo_name=dagshub_config.repo_name,
-        mlflow=True,
+STAGES = [
+    Stage(
+        name="Data Ingestion stage",
+        pipeline=DataIngestionTrainingPipeline,
+        config_sections=("data_ingestion",),
+        params=("READ_FROM_ZIP",),
+        outputs=("data_ingestion.local_data_file", INGESTED_MANIFEST),
+    ),
+    Stage(
+        name="Data sharding stage",
+        pipeline=DataShardingPipeline,
+        config_sections=("data_sharding",),
+        params=("IMAGE_SIZE", "NUM_SHARDS", "USE_SHARDS"),
+        inputs=(INGESTED_MANIFEST,),
+        outputs=("data_sharding.shards_dir",),
+        enabled_by="USE_SHARDS",
+    ),
+    Stage(
+        name="Augmentation stage",
+        pipeline=AugmentationPipeline,
+        config_sections=("augmentation",),
+        params=(
+            "IMAGE_SIZE",
+            "AUGMENTATION",
+            "AUGMENTATIONS",
+            "AUGMENTED_EPOCHS",
+            "READ_FROM_ZIP",
+        ),
+        inputs=(INGESTED_MANIFEST,),
+        outputs=("augmentation.epochs_dir",),
+    ),
+    Stage(
+        name="Prepare base model",
+        pipeline=partial(PrepareBaseModelTrainingPipeline, context=context),
+        config_sections=("base_model",),
+        params=(
+            "IMAGE_SIZE",
+            "INCLUDE_TOP",
+            "WEIGHTS",
+            "CLASSES",
+            "LEARNING_RATE",
+            "PRECISION",
+            "JIT_COMPILE",
+            "HEAD",
+            "HEAD_UNITS",
+            "HEAD_DROPOUT",
+        ),
+        outputs=("base_model.base_model_path", "base_model.updated_base_model_path"),
+    ),
+    Stage(
+        name="Training model",
+        # DagsHub is initialised once in __main__
+        pipeline=partial(ModelTrainingPipeline, dagshub_config=None, context=context),
+        config_sections=("training",),
+        params=(
+            "AUGMENTATION",
+            "AUGMENTATIONS",
+            "AUGMENTED_EPOCHS",
+            "IMAGE_SIZE",
+            "BATCH_SIZE",
+            "EPOCHS",
+            "LEARNING_RATE",
+            "CACHE_FEATURES",
+            "USE_SHARDS",
+            "CACHE_DATASET",
+            "READ_FROM_ZIP",
+            "PRECISION",
+            "JIT_COMPILE",
+            "DISTRIBUTION",
+            "NUM_CPU_DEVICES",
+            "CHECKPOINT_EVERY",
+            "EARLY_STOPPING_PATIENCE",
+        ),
+        inputs=(
+            "base_model.updated_base_model_path",
+            "data_ingestion.local_data_file",
+            INGESTED_MANIFEST,
+            "data_sharding.shards_dir",
+            "augmentation.epochs_dir",
+        ),
+        outputs=("training.trained_model_path",),
+    ),
+    Stage(
+        name="Model evaluation stage",
+        pipeline=ModelEvaluationPipeline,
+        config_sections=("evaluation", "prediction"),
+        params=("IMAGE_SIZE", "EVALUATION_BATCH_SIZE", "READ_FROM_ZIP"),
+        inputs=(
+            "training.trained_model_path",
+            "data_ingestion.local_data_file",
+            INGESTED_MANIFEST,
+        ),
+        outputs=("evaluation.scores_file",),
+    ),
+    Stage(
+        name="Model export stage",
+        pipeline=ModelExportPipeline,
+        config_sections=("model_export", "prediction"),
+        params=(
+            "IMAGE_SIZE",
+            "BATCH_SIZE",
+            "EXPORT_CALIBRATION_SAMPLES",
+            "READ_FROM_ZIP",
+        ),
+        inputs=(
+            "training.trained_model_path",
+            "data_ingestion.local_data_file",
+            INGESTED_MANIFEST,
+        ),
+        outputs=(
+            "model_export.dynamic_range_model_path",
+            "model_export.int8_model_path",
+            "model_export.report_file",
+            "model_export.serving_model_dir",
+        ),
+    ),
+    Stage(
+        name="Distillation stage",
+        pipeline=DistillationPipeline,
+        config_sections=("distillation", "prediction"),
+        params=(
+            "IMAGE_SIZE",
+            "BATCH_SIZE",
+            "READ_FROM_ZIP",
+            "DISTILL",
+            "STUDENT",
+            "DISTILL_EPOCHS",
+            "DISTILL_LEARNING_RATE",
+            "DISTILL_TEMPERATURE",
+            "DISTILL_ALPHA",
+        ),
+        inputs=("training.trained_model_path", INGESTED_MANIFEST),
+        outputs=("distillation.student_model_path", "distillation.report_file"),
+        enabled_by="DISTILL",
+    ),
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the training pipeline, skipping stages whose inputs "
+        "have not changed since their last successful run."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run every stage regardless of fingerprints",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=[stage.name for stage in STAGES],
+        help="force this stage and every stage after it",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="capture a TensorFlow profiler trace of every stage that runs",
     )
+    return parser.parse_args(argv)
 
 
-# STAGE_NAMES = ["Data Ingestion stage", "Prepare base model", "Training model"]
+if __name__ == "__main__":
+    args = parse_args()
 
-# STAGE_PIPELINES = [
-#     DataIngestionTrainingPipeline,
-#     PrepareBaseModelTrainingPipeline,
-#     ModelTrainingPipeline,
-# ]
+    config_manager = ConfigurationManager()
+    if config_manager.params.DISTRIBUTION == "mirrored":
+        from cnnClassifier.components.distribution import configure_cpu_devices
 
-STAGE_NAMES = ["Prepare base model", "Training model"]
+        # the CPU can only be split before TensorFlow runs its first op
+        configure_cpu_devices(config_manager.params.NUM_CPU_DEVICES)
 
-STAGE_PIPELINES = [
-    PrepareBaseModelTrainingPipeline,
-    ModelTrainingPipeline,
-]
+    dagshub_config = config_manager.get_dagshub_config()
+    if dagshub_config.mlflow:
+        import dagshub
 
+        dagshub.init(
+            repo_owner=dagshub_config.repo_owner,
+            repo_name=dagshub_config.repo_name,
+            mlflow=True,
+        )
 
-if __name__ == "__main__":
-    DAGSHUB_INITIALIZED = True
-    for stage_name, StagePipeline in zip(STAGE_NAMES, STAGE_PIPELINES):
-        try:
-            logger.info(f"*********** {stage_name} started ***********")
-            logger.info(f"Stage name: {stage_name}")
-            if stage_name == "Training model":
-                pipeline = StagePipeline(dagshub_config)
-            else:
-                pipeline = StagePipeline()
-            pipeline.main()
-            logger.info(f"*********** {stage_name} completed ***********")
-        except Exception as e:
-            logger.exception(f"{stage_name} pipeline failed: {e}")
-            raise
+    profiling_config = config_manager.get_profiling_config()
+    profiler = Profiler(trace_dir=profiling_config.trace_dir if args.trace else None)
+
+    runner = StageRunner(STAGES, config_manager, context=context)
+    try:
+        with profiling(profiler):
+            runner.run(force=args.force, from_stage=args.from_stage)
+    finally:
+        profiler.save(profiling_config.report_file)
+        if dagshub_config.mlflow:
+            profiler.log_to_mlflow(profiling_config.report_file)
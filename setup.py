@@ -26,4 +26,5 @@ setuptools.setup(
     },
     package_dir={"": "src"},
     packages=setuptools.find_packages(where="src"),
+    entry_points={"console_scripts": ["cnnClassifier=cnnClassifier.cli:main"]},
 )
@@ -0,0 +1,71 @@
+import argparse
+from dataclasses import replace
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.config.configuration import ConfigurationManager
+
+
+def score(args: argparse.Namespace) -> dict:
+    from cnnClassifier.components.batch_scoring import BatchScorer
+
+    config = ConfigurationManager().get_batch_scoring_config()
+    overrides = {
+        "trained_model_path": args.model,
+        "params_batch_size": args.batch_size,
+        "params_workers": args.workers,
+    }
+    config = replace(
+        config, **{key: value for key, value in overrides.items() if value is not None}
+    )
+    return BatchScorer(config).score(args.source, args.output, args.format)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cnnClassifier", description="Kidney CT scan classifier tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = commands.add_parser(
+        "score",
+        help="score every image of a directory or manifest offline",
+        description="Score images in bulk with the trained model. Rerunning "
+        "with the same output resumes an interrupted run.",
+    )
+    score_parser.add_argument(
+        "source", type=Path, help="image directory or .manifest.npz file"
+    )
+    score_parser.add_argument(
+        "output",
+        type=Path,
+        help="predictions .csv file, or directory of Parquet part files",
+    )
+    score_parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        help="output format (default: csv for a .csv output, else parquet)",
+    )
+    score_parser.add_argument(
+        "--batch-size", type=int, help="images per model call (SCORING_BATCH_SIZE)"
+    )
+    score_parser.add_argument(
+        "--workers", type=int, help="image decoding processes (SCORING_WORKERS)"
+    )
+    score_parser.add_argument(
+        "--model", type=Path, help="model to score with instead of the trained one"
+    )
+    score_parser.set_defaults(handler=score)
+    return parser
+
+
+def main(argv: list = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except Exception as e:
+        logger.exception(f"cnnClassifier {args.command} failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
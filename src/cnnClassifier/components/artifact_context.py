@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from cnnClassifier import logger
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+
+class ArtifactContext:
+    """Live artifacts handed from one stage to the next within one process.
+
+    Objects are keyed by the path they are saved to, so a downstream stage
+    asks for the same config path it would otherwise load from disk.
+    Models are written by a single background thread; callers must
+    ``wait`` for a path before mutating the model saved there.
+    """
+
+    def __init__(self):
+        self._artifacts = {}
+        self._saves = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def get(self, path: Path):
+        return self._artifacts.get(Path(path))
+
+    def save_model(self, path: Path, model: "tf.keras.Model") -> Future:
+        path = Path(path)
+        self._artifacts[path] = model
+        logger.info(f"Saving {path} in the background")
+        self._saves[path] = self._executor.submit(model.save, path)
+        return self._saves[path]
+
+    def wait(self, path: Path = None) -> None:
+        """Block until the save of ``path`` (or of every path) has finished,
+        re-raising any error from the background thread."""
+
+        paths = list(self._saves) if path is None else [Path(path)]
+        for key in paths:
+            save = self._saves.pop(key, None)
+            if save is not None:
+                save.result()
@@ -0,0 +1,279 @@
+import os
+import json
+import math
+import hashlib
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.entity.config_entity import AugmentationConfig
+from cnnClassifier.components.manifest import Manifest
+from cnnClassifier.components.data_split import SPLIT_SEED
+from cnnClassifier.components.feature_cache import load_image
+
+GEOMETRIC = ("flip", "rotation", "zoom", "translation")
+PHOTOMETRIC = ("brightness", "contrast")
+AUGMENTATIONS = GEOMETRIC + PHOTOMETRIC
+FLIP_MODES = ("horizontal", "vertical", "horizontal_and_vertical")
+
+
+class Augmenter:
+    """Random augmentation of whole batches from a declarative spec list,
+    e.g. ``[{"type": "rotation", "factor": 0.1}, {"type": "flip"}]``.
+
+    Factors follow the Keras preprocessing layers: rotation in fractions
+    of a full turn, zoom and translation in fractions of the image size,
+    brightness as an offset and contrast as a scale around the image mean.
+    All geometric ops are fused into one affine transform per image and
+    applied with a single resampling; everything is stateless-random, so
+    the same seed always yields the same batch.
+    """
+
+    def __init__(self, specs: list, image_size: tuple):
+        self.image_size = tuple(image_size)
+        self.specs = []
+        for spec in specs:
+            spec = dict(spec)
+            kind = spec.pop("type", None)
+            if kind not in AUGMENTATIONS:
+                raise ValueError(
+                    f"Unknown augmentation '{kind}', expected one of {AUGMENTATIONS}"
+                )
+            if kind == "flip":
+                spec.setdefault("mode", "horizontal")
+                if spec["mode"] not in FLIP_MODES:
+                    raise ValueError(
+                        f"Unknown flip mode '{spec['mode']}', "
+                        f"expected one of {FLIP_MODES}"
+                    )
+            elif "factor" not in spec:
+                raise ValueError(f"Augmentation '{kind}' needs a factor")
+            self.specs.append((kind, spec))
+
+    def _affine(self, kind: str, spec: dict, batch: tf.Tensor, seed) -> tuple:
+        """Return the ``(matrix, shift)`` one geometric op applies to output
+        coordinates (x, y) measured from the image centre."""
+
+        height, width = self.image_size[0], self.image_size[1]
+        ones, zeros = tf.ones([batch]), tf.zeros([batch])
+        shift = tf.zeros([batch, 2])
+
+        if kind == "flip":
+            flip = tf.random.stateless_uniform([batch, 2], seed) < 0.5
+            allowed = tf.constant(
+                [spec["mode"] != "vertical", spec["mode"] != "horizontal"]
+            )
+            sign = tf.where(flip & allowed, -1.0, 1.0)
+            matrix = tf.stack([sign[:, 0], zeros, zeros, sign[:, 1]], axis=1)
+        elif kind == "rotation":
+            factor = spec["factor"] * 2 * math.pi
+            angle = tf.random.stateless_uniform([batch], seed, -factor, factor)
+            cos, sin = tf.cos(angle), tf.sin(angle)
+            matrix = tf.stack([cos, -sin, sin, cos], axis=1)
+        elif kind == "zoom":
+            zoom = tf.random.stateless_uniform(
+                [batch], seed, 1 - spec["factor"], 1 + spec["factor"]
+            )
+            matrix = tf.stack([zoom, zeros, zeros, zoom], axis=1)
+        else:  # translation
+            offset = tf.random.stateless_uniform(
+                [batch, 2], seed, -spec["factor"], spec["factor"]
+            )
+            matrix = tf.stack([ones, zeros, zeros, ones], axis=1)
+            shift = offset * [width, height]
+        return tf.reshape(matrix, [batch, 2, 2]), shift
+
+    def __call__(self, images: tf.Tensor, seed) -> tf.Tensor:
+        """Augment a float ``[batch, height, width, channels]`` batch in [0, 1]."""
+
+        height, width = self.image_size[0], self.image_size[1]
+        batch = tf.shape(images)[0]
+        seed = tf.cast(seed, tf.int64)
+
+        matrix = tf.eye(2, batch_shape=[batch])
+        shift = tf.zeros([batch, 2])
+        geometric = False
+        for index, (kind, spec) in enumerate(self.specs):
+            op_seed = tf.random.experimental.stateless_fold_in(seed, index)
+            if kind in GEOMETRIC:
+                op_matrix, op_shift = self._affine(kind, spec, batch, op_seed)
+                matrix = tf.matmul(matrix, op_matrix)
+                shift = shift + op_shift
+                geometric = True
+            elif kind == "brightness":
+                delta = tf.random.stateless_uniform(
+                    [batch, 1, 1, 1], op_seed, -spec["factor"], spec["factor"]
+                )
+                images = images + delta
+            else:  # contrast
+                scale = tf.random.stateless_uniform(
+                    [batch, 1, 1, 1], op_seed, 1 - spec["factor"], 1 + spec["factor"]
+                )
+                mean = tf.reduce_mean(images, axis=[1, 2, 3], keepdims=True)
+                images = (images - mean) * scale + mean
+
+        if geometric:
+            # input = centre + matrix @ (output - centre) - shift
+            centre = tf.constant([(width - 1) / 2, (height - 1) / 2])
+            offset = centre - tf.linalg.matvec(matrix, centre) - shift
+            transforms = tf.concat(
+                [
+                    matrix[:, 0, :],
+                    offset[:, :1],
+                    matrix[:, 1, :],
+                    offset[:, 1:],
+                    tf.zeros([batch, 2]),
+                ],
+                axis=1,
+            )
+            images = tf.keras.ops.image.affine_transform(
+                images,
+                transforms,
+                interpolation="bilinear",
+                fill_mode="reflect",
+                data_format="channels_last",
+            )
+        return tf.clip_by_value(images, 0.0, 1.0)
+
+    def augment_dataset(
+        self, dataset: tf.data.Dataset, seed: int = SPLIT_SEED
+    ) -> tf.data.Dataset:
+        """Augment every ``(images, labels)`` batch; each epoch draws new,
+        but reproducible, seeds."""
+
+        seeds = tf.data.Dataset.random(
+            seed=seed, rerandomize_each_iteration=True
+        ).batch(2)
+        return tf.data.Dataset.zip((dataset, seeds)).map(
+            lambda batch, batch_seed: (self(batch[0], batch_seed), batch[1]),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+
+
+def materialize_epochs(
+    file_paths: list,
+    hashes: list,
+    augmenter: Augmenter,
+    num_epochs: int,
+    root_dir: Path,
+    batch_size: int = 64,
+) -> Path:
+    """Write ``num_epochs`` seeded augmented copies of every image to a
+    uint8 ``[epoch, image, height, width, channels]`` array and return its
+    path. The directory is keyed by the manifest hashes of the images, the
+    specs and the epoch count, so training runs and sweep trials with the
+    same settings share one copy.
+    """
+
+    sha = hashlib.sha256()
+    key = {
+        "specs": augmenter.specs,
+        "image_size": list(augmenter.image_size),
+        "epochs": num_epochs,
+        "hashes": list(hashes),
+    }
+    sha.update(json.dumps(key, sort_keys=True).encode())
+    out_file = Path(root_dir) / sha.hexdigest()[:16] / "epochs.npy"
+    if out_file.exists():
+        logger.info(f"Reusing {num_epochs} augmented epochs in {out_file}")
+        return out_file
+
+    logger.info(f"Writing {num_epochs} augmented epochs to {out_file}")
+    os.makedirs(out_file.parent, exist_ok=True)
+    tmp_file = out_file.with_suffix(".tmp.npy")
+    epochs = np.lib.format.open_memmap(
+        tmp_file,
+        mode="w+",
+        dtype=np.uint8,
+        shape=(num_epochs, len(file_paths), *augmenter.image_size),
+    )
+    dataset = (
+        tf.data.Dataset.from_tensor_slices([str(p) for p in file_paths])
+        .map(
+            lambda p: load_image(p, augmenter.image_size),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    row = 0
+    for index, images in enumerate(dataset):
+        # decode once, augment once per epoch
+        for epoch in range(num_epochs):
+            augmented = augmenter(images, [SPLIT_SEED + epoch, index])
+            epochs[epoch, row : row + len(images)] = np.round(
+                augmented.numpy() * 255
+            ).astype(np.uint8)
+        row += len(images)
+    epochs.flush()
+    del epochs
+
+    os.replace(tmp_file, out_file)
+    return out_file
+
+
+def augmented_epochs_dataset(
+    epochs_file: Path,
+    rows: np.ndarray,
+    one_hot: np.ndarray,
+    batch_size: int,
+) -> tf.data.Dataset:
+    """Endless ``(images, labels)`` batches cycling through the stored
+    epochs; ``rows`` selects the samples (a split or a fold) and is
+    reshuffled every epoch."""
+
+    epochs = np.load(epochs_file, mmap_mode="r")
+    image_shape = epochs.shape[2:]
+    rows = np.asarray(rows)
+
+    def gather(epoch, batch_rows):
+        batch = tf.numpy_function(
+            lambda e, r: epochs[e][r], [epoch, batch_rows], tf.uint8
+        )
+        batch = tf.ensure_shape(batch, (None, *image_shape))
+        labels = tf.gather(one_hot, batch_rows)
+        return tf.cast(batch, tf.float32) / 255.0, labels
+
+    # drawn up front: a tensor shuffle seed fails once a global seed is set
+    orders = np.stack(
+        [
+            np.random.RandomState(SPLIT_SEED + epoch).permutation(rows)
+            for epoch in range(len(epochs))
+        ]
+    )
+
+    def epoch_batches(epoch):
+        return (
+            tf.data.Dataset.from_tensor_slices(tf.gather(orders, epoch))
+            .batch(batch_size)
+            .map(lambda batch_rows: (epoch, batch_rows))
+        )
+
+    dataset = tf.data.Dataset.range(len(epochs)).repeat().flat_map(epoch_batches)
+    return dataset.map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+
+
+class Augmentation:
+    """Pipeline stage that materializes ``AUGMENTED_EPOCHS`` augmented
+    epochs ahead of training (a no-op when on-the-fly augmentation is
+    used)."""
+
+    def __init__(self, config: AugmentationConfig):
+        self.config = config
+
+    def materialize(self) -> Path:
+        config = self.config
+        if not (config.params_is_augmentation and config.params_augmented_epochs):
+            logger.info("AUGMENTED_EPOCHS is 0, augmenting on the fly")
+            return None
+        if config.params_read_from_zip:
+            raise ValueError("AUGMENTED_EPOCHS needs the extracted images")
+
+        manifest = Manifest.load(config.training_data)
+        return materialize_epochs(
+            manifest.paths,
+            manifest.hashes,
+            Augmenter(config.params_augmentations, config.params_image_size),
+            config.params_augmented_epochs,
+            config.epochs_dir,
+        )
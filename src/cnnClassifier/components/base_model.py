@@ -1,19 +1,34 @@
 import tensorflow as tf
 from pathlib import Path
 from cnnClassifier.entity.config_entity import BaseModelConfig
+from cnnClassifier.components.artifact_context import ArtifactContext
+
+HEADS = ("flatten", "gap", "gap_dropout_dense")
+HEAD_MODEL_PREFIX = "vgg16_head_"
+
+
+def get_head_type(model: tf.keras.Model) -> str:
+    """Return the classifier head recorded in the model name by
+    ``BaseModel._prepare_full_model``."""
+
+    if model.name.startswith(HEAD_MODEL_PREFIX):
+        return model.name[len(HEAD_MODEL_PREFIX) :]
+    return "flatten"  # models saved before the head became configurable
 
 
 class BaseModel:
-    def __init__(self, config: BaseModelConfig):
+    def __init__(self, config: BaseModelConfig, context: ArtifactContext = None):
         self.config = config
+        self.context = context
 
     def get_base_model(self) -> None:
+        tf.keras.mixed_precision.set_global_policy(self.config.params_precision)
         self.model = tf.keras.applications.vgg16.VGG16(
             input_shape=self.config.params_image_size,
             weights=self.config.params_weights,
             include_top=self.config.params_include_top,
         )
-        self.save_model(path=self.config.base_model_path, model=self.model)
+        self._save(path=self.config.base_model_path, model=self.model)
 
     @staticmethod
     def _prepare_full_model(
@@ -22,6 +37,11 @@ class BaseModel:
         freeze_all: bool,
         freeze_till: int,
         learning_rate: float,
+        precision: str = "float32",
+        jit_compile: bool = False,
+        head: str = "flatten",
+        head_units: int = 256,
+        head_dropout: float = 0.5,
     ) -> tf.keras.models.Model:
         if freeze_all:
             for layer in model.layers:
@@ -30,31 +50,66 @@ class BaseModel:
             for layer in model.layers[:-freeze_till]:
                 layer.trainable = False
 
-        flatten_in = tf.keras.layers.Flatten()(model.output)
-        prediction = tf.keras.layers.Dense(units=classes, activation="softmax")(
-            flatten_in
+        if head == "flatten":
+            x = tf.keras.layers.Flatten()(model.output)
+        elif head == "gap":
+            x = tf.keras.layers.GlobalAveragePooling2D()(model.output)
+        elif head == "gap_dropout_dense":
+            x = tf.keras.layers.GlobalAveragePooling2D()(model.output)
+            x = tf.keras.layers.Dropout(head_dropout)(x)
+            x = tf.keras.layers.Dense(units=head_units, activation="relu")(x)
+        else:
+            raise ValueError(f"Unknown head '{head}', expected one of {HEADS}")
+
+        # softmax stays in float32 under mixed precision for a stable loss
+        prediction = tf.keras.layers.Dense(
+            units=classes, activation="softmax", dtype="float32"
+        )(x)
+
+        full_model = tf.keras.models.Model(
+            inputs=model.input, outputs=prediction, name=HEAD_MODEL_PREFIX + head
         )
 
-        full_model = tf.keras.models.Model(inputs=model.input, outputs=prediction)
+        optimizer = tf.keras.optimizers.SGD(learning_rate=learning_rate)
+        if precision == "mixed_float16":
+            # float16 gradients underflow without loss scaling; bfloat16 has
+            # float32's exponent range and does not need it
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
 
         full_model.compile(
-            optimizer=tf.keras.optimizers.SGD(learning_rate=learning_rate),
+            optimizer=optimizer,
             loss=tf.keras.losses.CategoricalCrossentropy(),
             metrics=["accuracy"],
+            jit_compile=jit_compile,
         )
 
         full_model.summary()
         return full_model
 
     def update_base_model(self):
+        if self.context:
+            # freezing below mutates the layers still being written
+            self.context.wait(self.config.base_model_path)
+
         self.full_model = self._prepare_full_model(
             model=self.model,
             classes=self.config.params_classes,
             freeze_all=True,
             freeze_till=None,
             learning_rate=self.config.params_learning_rate,
+            precision=self.config.params_precision,
+            jit_compile=self.config.params_jit_compile,
+            head=self.config.params_head,
+            head_units=self.config.params_head_units,
+            head_dropout=self.config.params_head_dropout,
         )
-        self.save_model(path=self.config.updated_base_model_path, model=self.full_model)
+        self._save(path=self.config.updated_base_model_path, model=self.full_model)
+
+    def _save(self, path: Path, model: tf.keras.Model):
+        if self.context:
+            self.context.save_model(path, model)
+        else:
+            self.save_model(path=path, model=model)
 
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
@@ -0,0 +1,281 @@
+import os
+import csv
+import time
+import multiprocessing
+import numpy as np
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from cnnClassifier import logger
+from cnnClassifier.entity.config_entity import BatchScoringConfig
+from cnnClassifier.components.manifest import (
+    IMAGE_EXTENSIONS,
+    MANIFEST_SUFFIX,
+    Manifest,
+)
+
+# Parquet rows buffered before a part file is finalized (the resume unit)
+ROWS_PER_PART = 10_000
+
+
+def list_images(source: Path) -> list:
+    """Images to score: every image below a directory, sorted, or the rows
+    of a ``.manifest.npz``."""
+
+    source = Path(source)
+    if source.name.endswith(MANIFEST_SUFFIX):
+        directory = source.with_name(source.name[: -len(MANIFEST_SUFFIX)])
+        return Manifest.read(directory, source).paths
+    if not source.is_dir():
+        raise ValueError(f"{source} is neither a directory nor a manifest")
+
+    found, pending = [], [source]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(Path(entry.path))
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(entry.path)
+    return sorted(found)
+
+
+def _interpolation(in_size: int, out_size: int) -> tuple:
+    # half-pixel centres, as tf.image.resize samples
+    x = (np.arange(out_size) + 0.5) * (in_size / out_size) - 0.5
+    floor = np.floor(x)
+    lower = np.clip(floor, 0, in_size - 1).astype(np.int64)
+    upper = np.clip(np.ceil(x), 0, in_size - 1).astype(np.int64)
+    return lower, upper, (x - floor).astype(np.float32)
+
+
+def resize_bilinear(image: np.ndarray, size: tuple) -> np.ndarray:
+    """``tf.image.resize(image, size)`` (bilinear, no antialiasing) in
+    NumPy, so decode workers need not import TensorFlow."""
+
+    image = image.astype(np.float32)
+    y_lower, y_upper, y_lerp = _interpolation(image.shape[0], size[0])
+    x_lower, x_upper, x_lerp = _interpolation(image.shape[1], size[1])
+    x_lerp = x_lerp[None, :, None]
+    top_left, top_right = image[y_lower][:, x_lower], image[y_lower][:, x_upper]
+    bottom_left = image[y_upper][:, x_lower]
+    bottom_right = image[y_upper][:, x_upper]
+    top = top_left + (top_right - top_left) * x_lerp
+    bottom = bottom_left + (bottom_right - bottom_left) * x_lerp
+    return top + (bottom - top) * y_lerp[:, None, None]
+
+
+def decode_batch(paths: list, image_size: tuple) -> tuple:
+    """Decode and resize a chunk of images in a worker process. Returns a
+    float32 ``[n, height, width, 3]`` array in [0, 255] and one error
+    message (or ``None``) per path; failed images are left black."""
+
+    images = np.zeros((len(paths), *image_size), dtype=np.float32)
+    errors = []
+    for i, path in enumerate(paths):
+        try:
+            with Image.open(path) as image:
+                array = np.asarray(image.convert("RGB"))
+            images[i] = resize_bilinear(array, image_size[:2])
+            errors.append(None)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    return images, errors
+
+
+class CsvWriter:
+    """Append rows to a CSV; the rows already on disk are the checkpoint."""
+
+    def __init__(self, path: Path, fields: list):
+        self.path = Path(path)
+        self.fields = fields
+        self.done = set()
+        if self.path.exists():
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                # drop a row cut short by an interruption
+                f.truncate(data.rfind(b"\n") + 1)
+            with open(self.path, newline="") as f:
+                self.done = {row["path"] for row in csv.DictReader(f)}
+        os.makedirs(self.path.parent, exist_ok=True)
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=fields)
+        if new:
+            self._writer.writeheader()
+
+    def write(self, rows: list) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Write rows as ``part-*.parquet`` files in a directory. Each part is
+    finalized atomically, so finished parts are the checkpoint; rows still
+    buffered when a run is interrupted are scored again."""
+
+    def __init__(self, path: Path, fields: list):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow installed") from e
+
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = Path(path)
+        self.schema = pyarrow.schema(
+            [
+                (
+                    field,
+                    (
+                        pyarrow.float64()
+                        if field == "confidence" or field.startswith("prob_")
+                        else pyarrow.string()
+                    ),
+                )
+                for field in fields
+            ]
+        )
+        self._rows = []
+        os.makedirs(self.path, exist_ok=True)
+        parts = sorted(self.path.glob("part-*.parquet"))
+        self._next_part = len(parts)
+        self.done = set()
+        for part in parts:
+            self.done.update(
+                self.parquet.read_table(part, columns=["path"]).column(0).to_pylist()
+            )
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        table = self.pyarrow.Table.from_pylist(self._rows, schema=self.schema)
+        part = self.path / f"part-{self._next_part:05d}.parquet"
+        tmp_part = part.with_suffix(".tmp")
+        self.parquet.write_table(table, tmp_part)
+        os.replace(tmp_part, part)
+        self._next_part += 1
+        self._rows = []
+
+    def write(self, rows: list) -> None:
+        self._rows.extend(rows)
+        if len(self._rows) >= ROWS_PER_PART:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+
+
+WRITERS = {"csv": CsvWriter, "parquet": ParquetWriter}
+
+
+class BatchScorer:
+    """Offline scoring of large image collections.
+
+    Images are decoded in a pool of processes, ``batch_size`` at a time,
+    with a bounded number of batches in flight; the model always sees the
+    same padded batch shape. Each prediction row holds the path, the
+    predicted class, its confidence and every class probability.
+    """
+
+    def __init__(self, config: BatchScoringConfig):
+        self.config = config
+        self.image_size = tuple(config.params_image_size)
+        self.fields = [
+            "path",
+            "prediction",
+            "confidence",
+            *[f"prob_{name}" for name in config.class_names],
+            "error",
+        ]
+
+    def _rows(self, paths: list, probabilities: np.ndarray, errors: list) -> list:
+        rows = []
+        for path, p, error in zip(paths, probabilities, errors):
+            row = {"path": path, "error": error}
+            if error is None:
+                row["prediction"] = self.config.class_names[int(np.argmax(p))]
+                row["confidence"] = float(np.max(p))
+                for name, value in zip(self.config.class_names, p):
+                    row[f"prob_{name}"] = float(value)
+            else:
+                row["prediction"] = row["confidence"] = None
+                for name in self.config.class_names:
+                    row[f"prob_{name}"] = None
+            rows.append(row)
+        return rows
+
+    def score(self, source: Path, output: Path, output_format: str = None) -> dict:
+        output_format = output_format or (
+            "csv" if Path(output).suffix == ".csv" else "parquet"
+        )
+        if output_format not in WRITERS:
+            raise ValueError(
+                f"Unknown output format '{output_format}', expected one of "
+                f"{sorted(WRITERS)}"
+            )
+        writer = WRITERS[output_format](output, self.fields)
+        paths = list_images(source)
+        pending = [p for p in paths if p not in writer.done]
+        logger.info(
+            f"Scoring {len(pending)} of {len(paths)} images from {source} "
+            f"into {output} ({len(paths) - len(pending)} already done)"
+        )
+
+        # imported here: the decode workers import this module too
+        import tensorflow as tf
+
+        batch_size = self.config.params_batch_size
+        model = tf.keras.models.load_model(self.config.trained_model_path)
+        chunks = [
+            pending[i : i + batch_size] for i in range(0, len(pending), batch_size)
+        ]
+        max_in_flight = 2 * self.config.params_workers
+
+        start = time.perf_counter()
+        failed = 0
+        # spawn: the parent already runs TensorFlow threads
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.config.params_workers, mp_context=context
+            ) as executor:
+                in_flight = deque()
+                for chunk in chunks:
+                    in_flight.append(
+                        (chunk, executor.submit(decode_batch, chunk, self.image_size))
+                    )
+                    if len(in_flight) >= max_in_flight:
+                        failed += self._score_chunk(model, writer, *in_flight.popleft())
+                while in_flight:
+                    failed += self._score_chunk(model, writer, *in_flight.popleft())
+        finally:
+            writer.close()
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "num_images": len(paths),
+            "scored": len(pending) - failed,
+            "failed": failed,
+            "skipped": len(paths) - len(pending),
+            "seconds": round(elapsed, 3),
+            "images_per_second": round(len(pending) / elapsed, 2) if elapsed else None,
+        }
+        logger.info(f"Batch scoring finished: {summary}")
+        return summary
+
+    def _score_chunk(self, model, writer, chunk: list, future) -> int:
+        images, errors = future.result()
+        padding = self.config.params_batch_size - len(images)
+        if padding:
+            images = np.concatenate(
+                [images, np.zeros((padding, *images.shape[1:]), images.dtype)]
+            )
+        probabilities = np.asarray(model.predict_on_batch(images / 255.0))
+        writer.write(self._rows(chunk, probabilities[: len(chunk)], errors))
+        return sum(error is not None for error in errors)
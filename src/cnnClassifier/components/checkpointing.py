@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.components.distribution import is_chief
+
+RUN_FILE = "mlflow_run.json"
+WEIGHTS_FILE = "latest.weights.h5"
+BEST_WEIGHTS_FILE = "best_weights.npz"
+METADATA_FILE = "training_metadata.json"
+
+
+class TrainingCheckpoint(tf.keras.callbacks.Callback):
+    """Resumable training state under ``checkpoint_dir``.
+
+    Every ``every_n_epochs`` epochs the weights with the optimizer state
+    and the number of finished epochs are written; a later ``fit`` with the
+    same callback and ``initial_epoch=checkpoint.initial_epoch()`` restores
+    them and continues from that epoch. With ``early_stopping`` its best
+    value, patience counter and best weights are kept as well; it must come
+    before the checkpoint in the callback list, so each save sees the epoch
+    just finished and each restore follows its reset at the start of
+    training. The MLflow run id is kept next to
+    them so a resumed run keeps logging to the same run. Only the chief
+    writes (every worker restores) and the directory is removed once
+    training completes.
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: Path,
+        every_n_epochs: int = 1,
+        early_stopping: tf.keras.callbacks.EarlyStopping = None,
+    ):
+        super().__init__()
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.every_n_epochs = every_n_epochs
+        self.early_stopping = early_stopping
+
+    @property
+    def weights_path(self) -> Path:
+        return self.checkpoint_dir / WEIGHTS_FILE
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.checkpoint_dir / METADATA_FILE
+
+    @property
+    def best_weights_path(self) -> Path:
+        return self.checkpoint_dir / BEST_WEIGHTS_FILE
+
+    @property
+    def run_file(self) -> Path:
+        return self.checkpoint_dir / RUN_FILE
+
+    def resumable(self) -> bool:
+        return self.metadata_path.exists()
+
+    def _metadata(self) -> dict:
+        with open(self.metadata_path) as f:
+            return json.load(f)
+
+    def initial_epoch(self) -> int:
+        """Epoch to resume at: the number of epochs already checkpointed."""
+
+        if not self.resumable():
+            return 0
+        return self._metadata()["epoch"]
+
+    def resumed_run_id(self) -> str:
+        """The MLflow run of the interrupted attempt, or ``None``."""
+
+        if not (self.resumable() and self.run_file.exists()):
+            return None
+        with open(self.run_file) as f:
+            return json.load(f)["run_id"]
+
+    def save_run_id(self, run_id: str) -> None:
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with open(self.run_file, "w") as f:
+            json.dump({"run_id": run_id}, f)
+
+    def on_train_begin(self, logs=None):
+        if not self.resumable():
+            return
+        optimizer = self.model.optimizer
+        if optimizer is not None and not optimizer.built:
+            # the optimizer variables must exist to receive their state
+            optimizer.build(self.model.trainable_variables)
+        self.model.load_weights(self.weights_path)
+        state = self._metadata().get("early_stopping")
+        if self.early_stopping is not None and state is not None:
+            self._restore_early_stopping(state)
+        logger.info(
+            f"Resuming training at epoch {self.initial_epoch()} "
+            f"from {self.checkpoint_dir}"
+        )
+
+    def _early_stopping_state(self) -> dict:
+        """State of ``early_stopping``, writing its best weights alongside."""
+
+        callback = self.early_stopping
+        state = {
+            "wait": callback.wait,
+            "best": None if callback.best is None else float(callback.best),
+            "best_epoch": callback.best_epoch,
+            "has_best_weights": callback.best_weights is not None,
+        }
+        if callback.best_weights is not None:
+            tmp_best = self.checkpoint_dir / f"tmp.{BEST_WEIGHTS_FILE}"
+            np.savez(tmp_best, *callback.best_weights)
+            os.replace(tmp_best, self.best_weights_path)
+        return state
+
+    def _restore_early_stopping(self, state: dict) -> None:
+        callback = self.early_stopping
+        callback.wait = state["wait"]
+        callback.best = state["best"]
+        callback.best_epoch = state["best_epoch"]
+        if state["has_best_weights"]:
+            with np.load(self.best_weights_path) as arrays:
+                callback.best_weights = [
+                    arrays[f"arr_{i}"] for i in range(len(arrays.files))
+                ]
+
+    def _save(self, epoch: int) -> None:
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        # weights first, then the metadata that refers to them, each
+        # replaced atomically so an interruption never leaves a mismatch
+        tmp_weights = self.checkpoint_dir / f"tmp.{WEIGHTS_FILE}"
+        self.model.save_weights(tmp_weights)
+        os.replace(tmp_weights, self.weights_path)
+        metadata = {"epoch": epoch}
+        if self.early_stopping is not None:
+            metadata["early_stopping"] = self._early_stopping_state()
+        tmp_metadata = self.metadata_path.with_suffix(".tmp")
+        with open(tmp_metadata, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_metadata, self.metadata_path)
+
+    def on_epoch_end(self, epoch, logs=None):
+        if is_chief() and (epoch + 1) % self.every_n_epochs == 0:
+            self._save(epoch + 1)
+
+    def on_train_end(self, logs=None):
+        if is_chief():
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
@@ -1,50 +1,247 @@
 import os
+import shutil
 import zipfile
-import gdown
+import threading
+import multiprocessing
+import urllib.error
+import urllib.request
 from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from PIL import Image
 from cnnClassifier import logger
-from cnnClassifier.utils.common import get_size
+from cnnClassifier.utils.common import get_size, get_sha256, save_json, load_json
 from cnnClassifier.entity.config_entity import DataIngestionConfig
+from cnnClassifier.components.manifest import Manifest
+
+DOWNLOAD_TIMEOUT = 60
+
+# formats tf.io.decode_image can read
+DECODABLE_FORMATS = ("BMP", "GIF", "JPEG", "PNG")
+
+
+def _trial_decode(path: str) -> str:
+    """Fully decode one image; return why it is unusable, or ``None``."""
+
+    try:
+        with Image.open(path) as image:
+            if image.format not in DECODABLE_FORMATS:
+                return f"unsupported format {image.format}"
+            image.load()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
 
 
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
 
+    def _is_downloaded(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        if not self.config.source_sha256:
+            logger.info(f"{path} already exists and no checksum is configured")
+            return True
+        if get_sha256(path) == self.config.source_sha256:
+            logger.info(f"{path} already exists with the expected SHA-256")
+            return True
+        logger.warning(f"{path} exists but its SHA-256 does not match, re-downloading")
+        return False
+
+    def _verify_checksum(self, path: Path) -> None:
+        if not self.config.source_sha256:
+            return
+        digest = get_sha256(path)
+        if digest != self.config.source_sha256:
+            os.remove(path)
+            raise ValueError(
+                f"SHA-256 mismatch for {path}: expected "
+                f"{self.config.source_sha256}, got {digest}"
+            )
+        logger.info(f"SHA-256 verified for {path}")
+
+    @staticmethod
+    def _probe(url: str) -> tuple:
+        """Return ``(content_length, accepts_ranges)`` from a HEAD request;
+        ``(None, False)``, a plain single-stream GET, when the server rejects
+        HEAD."""
+
+        request = urllib.request.Request(url, method="HEAD")
+        try:
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                length = response.headers.get("Content-Length")
+                accepts_ranges = response.headers.get("Accept-Ranges", "") == "bytes"
+        except urllib.error.HTTPError as e:
+            logger.warning(
+                f"HEAD {url} failed with {e.code}, downloading in one stream"
+            )
+            return None, False
+        return (int(length) if length else None), accepts_ranges
+
+    @staticmethod
+    def _stream_download(
+        url: str, part_path: Path, resume: bool, size: int = None
+    ) -> None:
+        """Single-stream download that continues an existing partial file
+        with an HTTP Range request when the server supports it."""
+
+        offset = part_path.stat().st_size if resume and part_path.exists() else 0
+        request = urllib.request.Request(url)
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+            logger.info(f"Resuming download of {part_path} from byte {offset}")
+
+        try:
+            response = urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            # 416 "Range Not Satisfiable" for a partial file that is complete
+            content_range = e.headers.get("Content-Range", "")
+            if content_range.startswith("bytes */"):
+                size = int(content_range.split("/")[1])
+            if e.code == 416 and offset and offset == size:
+                logger.info(f"{part_path} is already complete")
+                return
+            raise
+
+        with response:
+            mode = "ab" if response.status == 206 else "wb"
+            with open(part_path, mode) as f:
+                shutil.copyfileobj(response, f, length=1 << 20)
+
+    def _parallel_download(self, url: str, part_path: Path, size: int) -> None:
+        """Fetch fixed-size byte ranges in a thread pool. Finished chunks are
+        recorded next to the partial file so a restart only fetches the
+        missing ones."""
+
+        chunk_size = self.config.download_chunk_size
+        chunks = [
+            (start, min(start + chunk_size, size) - 1)
+            for start in range(0, size, chunk_size)
+        ]
+        state_path = part_path.with_name(part_path.name + ".chunks")
+
+        done = set()
+        if part_path.exists() and state_path.exists():
+            state = load_json(state_path)
+            if state.size == size and state.chunk_size == chunk_size:
+                done = set(state.done)
+        if not done:
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+
+        lock = threading.Lock()
+
+        def fetch(index: int) -> None:
+            start, end = chunks[index]
+            request = urllib.request.Request(
+                url, headers={"Range": f"bytes={start}-{end}"}
+            )
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status != 206:
+                    raise IOError(f"Server ignored range request for {url}")
+                data = response.read()
+            if len(data) != end - start + 1:
+                raise IOError(f"Short read for bytes {start}-{end} of {url}")
+
+            with open(part_path, "r+b") as f:
+                f.seek(start)
+                f.write(data)
+            with lock:
+                done.add(index)
+                save_json(
+                    state_path,
+                    {"size": size, "chunk_size": chunk_size, "done": sorted(done)},
+                )
+
+        pending = [i for i in range(len(chunks)) if i not in done]
+        logger.info(
+            f"Downloading {len(pending)} of {len(chunks)} chunks with "
+            f"{self.config.download_workers} workers"
+        )
+        with ThreadPoolExecutor(max_workers=self.config.download_workers) as executor:
+            list(executor.map(fetch, pending))
+
+        os.remove(state_path)
+
+    def _http_download(self, url: str, path: Path) -> None:
+        part_path = path.with_name(path.name + ".part")
+        size, accepts_ranges = self._probe(url)
+
+        if (
+            accepts_ranges
+            and size
+            and self.config.download_workers > 1
+            and size > self.config.download_chunk_size
+        ):
+            self._parallel_download(url, part_path, size)
+        else:
+            self._stream_download(url, part_path, resume=accepts_ranges, size=size)
+
+        os.replace(part_path, path)
+
     def download_file(self) -> Path:
-        """Fetch data from Google Drive URL"""
+        """Fetch data from a Google Drive or plain HTTP(S) URL, skipping the
+        download when the local file is already present and valid."""
 
         dataset_url = self.config.source_url
         zip_download_path = Path(self.config.local_data_file)
 
         os.makedirs(zip_download_path.parent, exist_ok=True)
 
+        if self._is_downloaded(zip_download_path):
+            return zip_download_path
+
         logger.info(
             f"Downloading data from {dataset_url} into file {zip_download_path}"
         )
 
         try:
-            file_id = dataset_url.split("/")[-2]
-            prefix = "https://drive.google.com/uc?/export=download&id="
-            gdown.download(prefix + file_id, str(zip_download_path), quiet=False)
+            if "drive.google.com" in dataset_url:
+                import gdown
+
+                file_id = dataset_url.split("/")[-2]
+                prefix = "https://drive.google.com/uc?/export=download&id="
+                gdown.download(
+                    prefix + file_id, str(zip_download_path), quiet=False, resume=True
+                )
+            else:
+                self._http_download(dataset_url, zip_download_path)
         except Exception as e:
             logger.error(f"Failed to download file from {dataset_url}: {e}")
             raise
 
+        self._verify_checksum(zip_download_path)
         logger.info(f"Downloaded file size: {get_size(zip_download_path)}")
         return zip_download_path
 
     def extract_zip_file(self) -> None:
         """Extracts the downloaded ZIP file into the target directory"""
 
+        if self.config.params_read_from_zip:
+            logger.info(
+                f"READ_FROM_ZIP is enabled, training reads images directly from "
+                f"{self.config.local_data_file}; skipping extraction"
+            )
+            return
+
         unzip_path = Path(self.config.unzip_dir)
         os.makedirs(unzip_path, exist_ok=True)
 
         logger.info(f"Extracting {self.config.local_data_file} into {unzip_path}")
 
+        quarantined = self._quarantined()
         try:
             with zipfile.ZipFile(self.config.local_data_file, "r") as zip_ref:
-                zip_ref.extractall(unzip_path)
+                members = [
+                    name for name in zip_ref.namelist() if name not in quarantined
+                ]
+                if quarantined:
+                    logger.info(
+                        f"Skipping {len(zip_ref.namelist()) - len(members)} "
+                        f"members already quarantined in {self.config.quarantine_dir}"
+                    )
+                zip_ref.extractall(unzip_path, members=members)
         except zipfile.BadZipFile as e:
             logger.error(f"Corrupted zip file {self.config.local_data_file}: {e}")
             raise
@@ -55,3 +252,115 @@ class DataIngestion:
             raise
 
         logger.info(f"Extraction completed successfully: {unzip_path}")
+
+    def build_manifest(self) -> None:
+        """Index the extracted tree; unchanged images are not re-read."""
+
+        if self.config.params_read_from_zip:
+            return
+        Manifest.build(self.config.unzip_dir, workers=self.config.manifest_workers)
+
+    def _quarantined(self) -> set:
+        """Relative paths of the images moved to ``quarantine_dir`` by an
+        earlier validation, for any reason."""
+
+        quarantine_dir = Path(self.config.quarantine_dir)
+        if not quarantine_dir.is_dir():
+            return set()
+        return {
+            path.relative_to(reason_dir).as_posix()
+            for reason_dir in quarantine_dir.iterdir()
+            if reason_dir.is_dir()
+            for path in reason_dir.rglob("*")
+            if path.is_file()
+        }
+
+    def _quarantine(self, relative: str, reason: str) -> None:
+        source = Path(self.config.unzip_dir) / relative
+        target = Path(self.config.quarantine_dir) / reason / relative
+        os.makedirs(target.parent, exist_ok=True)
+        os.replace(source, target)
+
+    def validate_images(self) -> dict:
+        """Trial-decode every indexed image in a process pool and move
+        corrupt files and exact duplicates (by manifest SHA-256) out of the
+        tree into ``quarantine_dir``, so training never meets them.
+
+        Duplicates within a class keep their first copy; an image present
+        in several classes has no trustworthy label and is removed from all
+        of them. The manifest is refreshed afterwards and a report is
+        written to ``validation_report``, keeping the findings of earlier
+        runs whose images are no longer extracted.
+        """
+
+        if self.config.params_read_from_zip:
+            logger.info("READ_FROM_ZIP is enabled, skipping image validation")
+            return None
+
+        manifest = Manifest.load(self.config.unzip_dir)
+        relative_paths = manifest.columns["path"].tolist()
+        logger.info(
+            f"Trial-decoding {len(manifest)} images with "
+            f"{self.config.validation_workers} processes"
+        )
+        # spawn: the parent may already run TensorFlow threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.config.validation_workers, mp_context=context
+        ) as executor:
+            errors = list(executor.map(_trial_decode, manifest.paths, chunksize=64))
+
+        corrupt = {
+            relative: error
+            for relative, error in zip(relative_paths, errors)
+            if error is not None
+        }
+        by_hash = defaultdict(list)
+        for relative, digest, label in zip(
+            relative_paths, manifest.hashes, manifest.labels
+        ):
+            if relative not in corrupt:
+                by_hash[digest].append((relative, label))
+
+        duplicates, conflicts = {}, {}
+        for digest, copies in by_hash.items():
+            if len({label for _, label in copies}) > 1:
+                conflicts[digest] = [relative for relative, _ in copies]
+            elif len(copies) > 1:
+                duplicates[copies[0][0]] = [relative for relative, _ in copies[1:]]
+
+        for relative in corrupt:
+            self._quarantine(relative, "corrupt")
+        for copies in duplicates.values():
+            for relative in copies:
+                self._quarantine(relative, "duplicate")
+        for copies in conflicts.values():
+            for relative in copies:
+                self._quarantine(relative, "label_conflict")
+
+        manifest = Manifest.build(
+            self.config.unzip_dir, workers=self.config.manifest_workers
+        )
+        report = {
+            "num_images": len(relative_paths),
+            "num_valid": len(manifest),
+            "corrupt": corrupt,
+            "duplicates": duplicates,
+            "label_conflicts": conflicts,
+        }
+        report_path = Path(self.config.validation_report)
+        if report_path.exists():
+            previous = load_json(report_path)
+            report["num_images"] += previous.num_images - previous.num_valid
+            for key in ("corrupt", "duplicates", "label_conflicts"):
+                report[key] = {**previous[key], **report[key]}
+        save_json(report_path, report)
+        removed = len(relative_paths) - len(manifest)
+        if removed:
+            logger.warning(
+                f"Quarantined {removed} of {len(relative_paths)} images in "
+                f"{self.config.quarantine_dir}: {len(corrupt)} corrupt, "
+                f"{sum(map(len, duplicates.values()))} duplicates, "
+                f"{sum(map(len, conflicts.values()))} with conflicting labels"
+            )
+        return report
@@ -0,0 +1,96 @@
+import os
+import tensorflow as tf
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+from cnnClassifier.entity.config_entity import DataShardingConfig
+from cnnClassifier.components.data_split import split_files
+
+SUBSETS = ("training", "validation")
+
+FEATURE_DESCRIPTION = {
+    "image": tf.io.FixedLenFeature([], tf.string),
+    "label": tf.io.FixedLenFeature([], tf.int64),
+}
+
+
+def parse_example(record: tf.Tensor, image_size: tuple) -> tuple:
+    """Parse one serialized example back into a uint8 image and its label."""
+
+    example = tf.io.parse_single_example(record, FEATURE_DESCRIPTION)
+    image = tf.reshape(tf.io.decode_raw(example["image"], tf.uint8), image_size)
+    return image, example["label"]
+
+
+class DataSharding:
+    """Decode and resize the extracted images once and store them as raw
+    uint8 tensors in sharded TFRecord files, one set per subset."""
+
+    def __init__(self, config: DataShardingConfig):
+        self.config = config
+        self.image_size = tuple(config.params_image_size)
+
+    def _encode(self, path: str, label: int) -> bytes:
+        image = tf.io.decode_image(
+            tf.io.read_file(path), channels=self.image_size[-1], expand_animations=False
+        )
+        image = tf.image.resize(image, self.image_size[:2])
+        image = tf.cast(tf.clip_by_value(tf.round(image), 0, 255), tf.uint8)
+
+        example = tf.train.Example(
+            features=tf.train.Features(
+                feature={
+                    "image": tf.train.Feature(
+                        bytes_list=tf.train.BytesList(value=[image.numpy().tobytes()])
+                    ),
+                    "label": tf.train.Feature(
+                        int64_list=tf.train.Int64List(value=[label])
+                    ),
+                }
+            )
+        )
+        return example.SerializeToString()
+
+    def _write_shard(self, shard_path: Path, samples: list) -> int:
+        tmp_path = shard_path.with_suffix(".tmp")
+        with tf.io.TFRecordWriter(str(tmp_path)) as writer:
+            for path, label in samples:
+                writer.write(self._encode(path, label))
+        os.replace(tmp_path, shard_path)
+        return len(samples)
+
+    def write_shards(self) -> None:
+        num_shards = self.config.params_num_shards
+        metadata = {"image_size": list(self.image_size), "num_examples": {}}
+
+        for subset in SUBSETS:
+            file_paths, labels, class_names = split_files(
+                self.config.source_dir, subset
+            )
+            samples = list(zip(file_paths, labels))
+
+            subset_dir = Path(self.config.shards_dir) / subset
+            os.makedirs(subset_dir, exist_ok=True)
+            for stale in subset_dir.glob("*.tfrecord"):
+                stale.unlink()
+
+            shard_paths = [
+                subset_dir / f"shard-{i:05d}-of-{num_shards:05d}.tfrecord"
+                for i in range(num_shards)
+            ]
+            logger.info(
+                f"Writing {len(samples)} {subset} images into {num_shards} shards "
+                f"under {subset_dir}"
+            )
+            with ThreadPoolExecutor(max_workers=num_shards) as executor:
+                written = executor.map(
+                    self._write_shard,
+                    shard_paths,
+                    [samples[i::num_shards] for i in range(num_shards)],
+                )
+                metadata["num_examples"][subset] = sum(written)
+
+            metadata["class_names"] = class_names
+
+        save_json(Path(self.config.shards_dir) / "metadata.json", metadata)
@@ -0,0 +1,113 @@
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier.components.manifest import Manifest
+
+VALIDATION_SPLIT = 0.2
+SPLIT_SEED = 42
+
+
+def _load(path: tf.Tensor, label: tf.Tensor, image_size: tuple, num_classes: int):
+    image = tf.io.decode_image(
+        tf.io.read_file(path), channels=3, expand_animations=False
+    )
+    image = tf.image.resize(image, image_size)
+    return image, tf.one_hot(label, num_classes)
+
+
+def directory_split(
+    directory: Path, subset: str, image_size: tuple, batch_size: int
+) -> tf.data.Dataset:
+    """Return one subset of the image tree as batched ``(image, one_hot)``
+    pairs with pixels in [0, 255], split the same way everywhere in the
+    project. Only the training subset is shuffled."""
+
+    file_paths, labels, class_names = split_files(directory, subset)
+    return samples_dataset(
+        file_paths,
+        labels,
+        len(class_names),
+        image_size,
+        batch_size,
+        shuffle=(subset == "training"),
+    )
+
+
+def samples_dataset(
+    file_paths: list,
+    labels: list,
+    num_classes: int,
+    image_size: tuple,
+    batch_size: int,
+    shuffle: bool = False,
+) -> tf.data.Dataset:
+    """Batched ``(image, one_hot)`` pairs of arbitrary samples, decoded and
+    resized like ``directory_split``."""
+
+    # explicit dtypes keep an empty sample list a valid, empty dataset
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (
+            tf.constant(file_paths, dtype=tf.string),
+            tf.constant(labels, dtype=tf.int32),
+        )
+    )
+    if shuffle:
+        dataset = dataset.shuffle(len(file_paths), seed=SPLIT_SEED)
+    dataset = dataset.map(
+        lambda path, label: _load(path, label, image_size, num_classes),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not shuffle,
+    )
+    return dataset.batch(batch_size)
+
+
+def split_files(directory: Path, subset: str) -> tuple:
+    """Return ``(file_paths, labels, class_names)`` for one subset from the
+    tree's manifest, without decoding any image."""
+
+    manifest = Manifest.load(directory)
+    file_paths, labels = split_samples(manifest.paths, manifest.labels, subset)
+    return file_paths, labels, manifest.class_names
+
+
+def split_hashes(directory: Path, subset: str) -> list:
+    """SHA-256 of every image in one subset, aligned with ``split_files``."""
+
+    manifest = Manifest.load(directory)
+    hashes = manifest.hashes
+    return [hashes[i] for i in split_rows(manifest.labels, subset)]
+
+
+def list_samples(directory: Path) -> tuple:
+    """Return ``(file_paths, labels, class_names)`` of the whole tree, in the
+    sorted order ``split_samples`` expects."""
+
+    manifest = Manifest.load(directory)
+    return manifest.paths, manifest.labels, manifest.class_names
+
+
+def split_rows(labels: list, subset: str) -> np.ndarray:
+    """Row indices of one subset of a sorted sample list, stratified so
+    every class keeps the same validation share. Validation rows stay in
+    sorted order; training rows are shuffled with the split seed."""
+
+    labels = np.asarray(labels)
+    rng = np.random.RandomState(SPLIT_SEED)
+    train, valid = [], []
+    for label in np.unique(labels):
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        num_validation = int(VALIDATION_SPLIT * len(rows))
+        valid.append(rows[:num_validation])
+        train.append(rows[num_validation:])
+
+    if subset == "training":
+        return rng.permutation(np.concatenate(train or [[]]).astype(np.int64))
+    return np.sort(np.concatenate(valid or [[]]).astype(np.int64))
+
+
+def split_samples(paths: list, labels: list, subset: str) -> tuple:
+    """Split an already indexed, sorted sample list exactly like
+    ``directory_split`` splits the extracted tree."""
+
+    rows = split_rows(labels, subset)
+    return [paths[i] for i in rows], [labels[i] for i in rows]
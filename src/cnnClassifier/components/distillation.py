@@ -0,0 +1,244 @@
+import os
+import numpy as np
+import tensorflow as tf
+from dataclasses import replace
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+from cnnClassifier.entity.config_entity import DistillationConfig, PredictionConfig
+from cnnClassifier.components.data_split import (
+    SPLIT_SEED,
+    samples_dataset,
+    split_files,
+    split_hashes,
+)
+from cnnClassifier.components.feature_cache import (
+    FeatureCache,
+    backbone_fingerprint,
+    load_image,
+)
+from cnnClassifier.components.model_export import predictor_latency
+from cnnClassifier.pipeline.prediction import PredictionPipeline
+
+STUDENTS = ("small_cnn", "mobilenet_v2")
+
+
+def build_student(name: str, image_size: tuple, classes: int) -> tf.keras.Model:
+    """Compact classifier that outputs logits (no softmax)."""
+
+    inputs = tf.keras.Input(shape=image_size)
+    if name == "small_cnn":
+        x = inputs
+        for filters in (32, 64, 128, 128):
+            x = tf.keras.layers.Conv2D(filters, 3, padding="same", use_bias=False)(x)
+            x = tf.keras.layers.BatchNormalization()(x)
+            x = tf.keras.layers.ReLU()(x)
+            x = tf.keras.layers.MaxPooling2D()(x)
+    elif name == "mobilenet_v2":
+        backbone = tf.keras.applications.MobileNetV2(
+            input_shape=image_size, alpha=0.35, include_top=False, weights=None
+        )
+        # the pipeline feeds [0, 1]; MobileNetV2 expects [-1, 1]
+        x = backbone(tf.keras.layers.Rescaling(2.0, offset=-1.0)(inputs))
+    else:
+        raise ValueError(f"Unknown student '{name}', expected one of {STUDENTS}")
+
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    logits = tf.keras.layers.Dense(classes, dtype="float32")(x)
+    return tf.keras.Model(inputs, logits, name=f"student_{name}")
+
+
+def distillation_loss(num_classes: int, temperature: float, alpha: float):
+    """Hinton et al. loss on targets packed as ``[one_hot, soft_teacher]``.
+
+    The soft term is scaled by ``temperature**2`` so its gradients keep the
+    same magnitude as the hard term whatever the temperature.
+    """
+
+    kl = tf.keras.losses.KLDivergence()
+    cross_entropy = tf.keras.losses.CategoricalCrossentropy(from_logits=True)
+
+    def loss(y_true, logits):
+        hard, soft = y_true[:, :num_classes], y_true[:, num_classes:]
+        soft_loss = kl(soft, tf.nn.softmax(logits / temperature))
+        hard_loss = cross_entropy(hard, logits)
+        return alpha * temperature**2 * soft_loss + (1 - alpha) * hard_loss
+
+    return loss
+
+
+def hard_accuracy(num_classes: int):
+    def accuracy(y_true, logits):
+        labels = tf.argmax(y_true[:, :num_classes], axis=-1)
+        return tf.cast(tf.equal(labels, tf.argmax(logits, axis=-1)), tf.float32)
+
+    return accuracy
+
+
+class Distillation:
+    """Train a compact student on the trained model's soft targets.
+
+    The teacher's probabilities are cached per image (keyed by file hash,
+    like the backbone feature cache), so the teacher runs once per image
+    across epochs and reruns.
+    """
+
+    def __init__(self, config: DistillationConfig):
+        self.config = config
+        self.image_size = tuple(config.params_image_size)
+        self.num_classes = len(config.class_names)
+
+    def _teacher_outputs(self, file_paths: list, hashes: list) -> tuple:
+        teacher = tf.keras.models.load_model(self.config.teacher_model_path)
+        cache = FeatureCache(
+            root_dir=self.config.teacher_cache_dir,
+            backbone=teacher,
+            backbone_key=backbone_fingerprint(
+                teacher, weights="trained", image_size=self.image_size
+            ),
+            image_size=self.image_size,
+            batch_size=self.config.params_batch_size,
+        )
+        return cache.get_features(file_paths, hashes)
+
+    def _dataset(self, paths, labels, probabilities, shuffle: bool):
+        # soften the teacher's distribution: softmax(log(p) / T)
+        log_p = (
+            np.log(np.clip(probabilities, 1e-7, 1.0)) / self.config.params_temperature
+        )
+        soft = np.exp(log_p - log_p.max(axis=-1, keepdims=True))
+        soft /= soft.sum(axis=-1, keepdims=True)
+        targets = np.concatenate(
+            [np.eye(self.num_classes, dtype=np.float32)[labels], soft], axis=-1
+        ).astype(np.float32)
+
+        dataset = tf.data.Dataset.from_tensor_slices(([str(p) for p in paths], targets))
+        if shuffle:
+            dataset = dataset.shuffle(len(paths), seed=SPLIT_SEED)
+        dataset = dataset.map(
+            lambda path, target: (load_image(path, self.image_size), target),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+        return dataset.batch(self.config.params_batch_size).prefetch(tf.data.AUTOTUNE)
+
+    def train(self) -> None:
+        if self.config.params_read_from_zip:
+            raise ValueError("Distillation needs the extracted images")
+
+        data_dir = self.config.training_data
+        train_paths, train_labels, _ = split_files(data_dir, "training")
+        valid_paths, valid_labels, _ = split_files(data_dir, "validation")
+
+        probabilities, rows = self._teacher_outputs(
+            train_paths + valid_paths,
+            split_hashes(data_dir, "training") + split_hashes(data_dir, "validation"),
+        )
+        probabilities = np.asarray(probabilities[rows])
+        num_train = len(train_paths)
+
+        student = build_student(
+            self.config.params_student, self.image_size, self.num_classes
+        )
+        student.compile(
+            optimizer=tf.keras.optimizers.Adam(self.config.params_learning_rate),
+            loss=distillation_loss(
+                self.num_classes,
+                self.config.params_temperature,
+                self.config.params_alpha,
+            ),
+            metrics=[hard_accuracy(self.num_classes)],
+        )
+        student.fit(
+            self._dataset(
+                train_paths, train_labels, probabilities[:num_train], shuffle=True
+            ),
+            epochs=self.config.params_epochs,
+            validation_data=self._dataset(
+                valid_paths, valid_labels, probabilities[num_train:], shuffle=False
+            ),
+        )
+
+        # serve probabilities, like the teacher
+        serving = tf.keras.Model(
+            student.input, tf.keras.layers.Softmax()(student.output), name=student.name
+        )
+        serving.save(self.config.student_model_path)
+        logger.info(f"Student model saved at {self.config.student_model_path}")
+
+    def evaluate(self) -> dict:
+        """Compare teacher and student on the validation split, decoded one
+        batch at a time with the training preprocessing; only the counts of
+        correct and agreeing predictions are kept."""
+
+        valid_paths, valid_labels, _ = split_files(
+            self.config.training_data, "validation"
+        )
+        if not valid_paths:
+            raise ValueError("The validation split is empty")
+        valid_labels = np.array(valid_labels)
+
+        prediction_config = PredictionConfig(
+            trained_model_path=self.config.teacher_model_path,
+            class_names=self.config.class_names,
+            params_image_size=self.image_size,
+            params_batch_size=1,  # latency of a single scan
+        )
+        paths = {
+            "teacher": self.config.teacher_model_path,
+            "student": self.config.student_model_path,
+        }
+        predictors = {
+            name: PredictionPipeline(
+                replace(prediction_config, trained_model_path=path)
+            )
+            for name, path in paths.items()
+        }
+
+        dataset = samples_dataset(
+            valid_paths,
+            valid_labels,
+            len(self.config.class_names),
+            self.image_size[:2],
+            self.config.params_batch_size,
+        )
+        correct = dict.fromkeys(paths, 0)
+        agreeing, sample = 0, None
+        for images, one_hot in dataset:
+            images = images.numpy()
+            labels = np.argmax(one_hot.numpy(), axis=-1)
+            if sample is None:
+                sample = images[0]
+
+            predicted = {
+                name: np.argmax(predictor.predict_proba(images), axis=-1)
+                for name, predictor in predictors.items()
+            }
+            for name in paths:
+                correct[name] += int(np.sum(predicted[name] == labels))
+            agreeing += int(np.sum(predicted["student"] == predicted["teacher"]))
+
+        num_images = len(valid_labels)
+        report = {"num_validation_images": num_images, "models": {}}
+        for name, path in paths.items():
+            report["models"][name] = {
+                "path": str(path),
+                "params": int(predictors[name].model.count_params()),
+                "size_mb": round(os.path.getsize(path) / 2**20, 3),
+                "accuracy": correct[name] / num_images,
+                "latency": predictor_latency(
+                    predictors[name], sample, self.config.latency_runs
+                ),
+            }
+
+        teacher, student = report["models"]["teacher"], report["models"]["student"]
+        report["student_vs_teacher"] = {
+            "accuracy_delta": student["accuracy"] - teacher["accuracy"],
+            "agreement": agreeing / num_images,
+            "params_ratio": round(teacher["params"] / student["params"], 2),
+            "speedup_p50": round(
+                teacher["latency"]["p50_ms"] / student["latency"]["p50_ms"], 2
+            ),
+        }
+        logger.info(f"Distillation: {report['student_vs_teacher']}")
+
+        save_json(self.config.report_file, report)
+        return report
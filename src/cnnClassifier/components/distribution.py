@@ -0,0 +1,97 @@
+import os
+import json
+import socket
+import tensorflow as tf
+from cnnClassifier import logger
+
+STRATEGIES = ("none", "mirrored", "multi_worker")
+
+
+def configure_cpu_devices(num_devices: int) -> None:
+    """Split the host CPU into ``num_devices`` logical devices so
+    ``MirroredStrategy`` can run one replica per device.
+
+    Must run before TensorFlow executes its first op; afterwards the
+    device list is fixed and only a warning is logged.
+    """
+
+    if num_devices <= 1:
+        return
+    cpu = tf.config.list_physical_devices("CPU")[0]
+    try:
+        tf.config.set_logical_device_configuration(
+            cpu, [tf.config.LogicalDeviceConfiguration()] * num_devices
+        )
+    except RuntimeError:
+        logger.warning(
+            f"Could not split the CPU into {num_devices} logical devices, "
+            "the TensorFlow runtime is already initialised"
+        )
+
+
+class _MultiWorkerMirroredStrategy(tf.distribute.MultiWorkerMirroredStrategy):
+    """Works around Keras 3 calling ``reduce`` with nested batches and with
+    ``axis=0`` on scalar metrics, neither of which the collective
+    all-reduce accepts."""
+
+    def reduce(self, reduce_op, value, axis):
+        def reduce_one(v):
+            rank = self.experimental_local_results(v)[0].shape.rank
+            parent = super(_MultiWorkerMirroredStrategy, self)
+            return parent.reduce(reduce_op, v, axis if rank else None)
+
+        return tf.nest.map_structure(reduce_one, value)
+
+
+def get_strategy(name: str, num_cpu_devices: int = 1) -> tf.distribute.Strategy:
+    if name == "none":
+        return tf.distribute.get_strategy()
+
+    if name == "mirrored":
+        configure_cpu_devices(num_cpu_devices)
+        devices = [d.name for d in tf.config.list_logical_devices("CPU")]
+        strategy = tf.distribute.MirroredStrategy(
+            devices=devices[:num_cpu_devices],
+            # NCCL all-reduce is GPU only
+            cross_device_ops=tf.distribute.ReductionToOneDevice(),
+        )
+    elif name == "multi_worker":
+        # the cluster comes from TF_CONFIG
+        strategy = _MultiWorkerMirroredStrategy()
+    else:
+        raise ValueError(f"Unknown distribution '{name}', expected one of {STRATEGIES}")
+
+    logger.info(
+        f"Training with {type(strategy).__name__} over "
+        f"{strategy.num_replicas_in_sync} replicas"
+    )
+    return strategy
+
+
+def is_chief() -> bool:
+    """True unless TF_CONFIG names this process as a non-chief worker.
+    Worker 0 acts as chief only in a cluster without a ``chief`` task."""
+
+    tf_config = json.loads(os.environ.get("TF_CONFIG", "{}"))
+    task = tf_config.get("task", {})
+    task_type, task_index = task.get("type"), task.get("index", 0)
+    if task_type in (None, "chief"):
+        return True
+    has_chief = bool(tf_config.get("cluster", {}).get("chief"))
+    return task_type == "worker" and task_index == 0 and not has_chief
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def local_cluster(num_workers: int) -> list:
+    """Return one ``TF_CONFIG`` dict per worker of a localhost cluster."""
+
+    workers = [f"localhost:{_free_port()}" for _ in range(num_workers)]
+    return [
+        {"cluster": {"worker": workers}, "task": {"type": "worker", "index": index}}
+        for index in range(num_workers)
+    ]
@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from cnnClassifier import logger
+from cnnClassifier.utils.common import get_sha256
+
+
+def backbone_fingerprint(
+    backbone: tf.keras.Model,
+    weights: str,
+    image_size: tuple,
+    precision: str = "float32",
+) -> str:
+    """Identify a backbone by name, weights source, input size, compute
+    precision and the actual weight values, so a re-initialised backbone
+    never reuses stale features."""
+
+    sha = hashlib.sha256()
+    key = f"{backbone.name}|{weights}|{tuple(image_size)}|{precision}"
+    sha.update(key.encode())
+    for weight in backbone.get_weights():
+        sha.update(np.ascontiguousarray(weight).tobytes())
+    return sha.hexdigest()[:16]
+
+
+def load_image(path: tf.Tensor, image_size: tuple) -> tf.Tensor:
+    """Decode and resize like ``image_dataset_from_directory``, then rescale
+    to [0, 1] like the training pipeline."""
+
+    image = tf.io.decode_image(
+        tf.io.read_file(path), channels=image_size[-1], expand_animations=False
+    )
+    image = tf.image.resize(image, image_size[:2])
+    return image / 255.0
+
+
+class FeatureCache:
+    """On-disk, memory-mapped cache of backbone outputs.
+
+    Rows are keyed by the SHA-256 of the image file; the cache directory is
+    keyed by the backbone fingerprint. Only images missing from the index
+    are pushed through the backbone.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        backbone: tf.keras.Model,
+        backbone_key: str,
+        image_size: tuple,
+        batch_size: int,
+    ):
+        self.backbone = backbone
+        self.image_size = tuple(image_size)
+        self.batch_size = batch_size
+        self.feature_shape = tuple(backbone.output.shape[1:])
+
+        self.cache_dir = Path(root_dir) / backbone_key
+        self.features_path = self.cache_dir / "features.npy"
+        self.index_path = self.cache_dir / "index.json"
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.index = {}
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def _open(self, mode: str, num_rows: int = None) -> np.memmap:
+        if mode == "w+":
+            return np.lib.format.open_memmap(
+                self.features_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(num_rows, *self.feature_shape),
+            )
+        return np.load(self.features_path, mmap_mode=mode)
+
+    def _grow(self, num_new: int) -> np.memmap:
+        num_old = len(self.index)
+        tmp_path = self.features_path.with_suffix(".tmp.npy")
+
+        if num_old:
+            old = self._open("r")
+            new = np.lib.format.open_memmap(
+                tmp_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(num_old + num_new, *self.feature_shape),
+            )
+            new[:num_old] = old[:num_old]
+            new.flush()
+            del old, new
+            os.replace(tmp_path, self.features_path)
+            return self._open("r+")
+
+        return self._open("w+", num_new)
+
+    def _compute(self, file_paths: list, out: np.memmap) -> None:
+        """Stream images through the backbone batch by batch into ``out``."""
+
+        dataset = (
+            tf.data.Dataset.from_tensor_slices(file_paths)
+            .map(
+                lambda p: load_image(p, self.image_size),
+                num_parallel_calls=tf.data.AUTOTUNE,
+            )
+            .batch(self.batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        row = 0
+        for batch in dataset:
+            features = self.backbone.predict_on_batch(batch)
+            out[row : row + len(features)] = features
+            row += len(features)
+
+    def get_features(self, file_paths: list, hashes: list = None) -> tuple:
+        """Return ``(features, rows)`` where ``features[rows[i]]`` holds the
+        backbone output for ``file_paths[i]``. Pass the manifest ``hashes``
+        to skip re-hashing the images."""
+
+        if hashes is None:
+            with ThreadPoolExecutor() as executor:
+                hashes = list(executor.map(get_sha256, file_paths))
+
+        missing = {}
+        for path, digest in zip(file_paths, hashes):
+            if digest not in self.index and digest not in missing:
+                missing[digest] = path
+
+        if missing:
+            logger.info(
+                f"Computing backbone features for {len(missing)} of "
+                f"{len(file_paths)} images in {self.cache_dir}"
+            )
+            features = self._grow(len(missing))
+            start = len(self.index)
+            self._compute([str(p) for p in missing.values()], features[start:])
+            features.flush()
+            del features
+
+            for row, digest in enumerate(missing, start=start):
+                self.index[digest] = row
+            with open(self.index_path, "w") as f:
+                json.dump(self.index, f)
+        else:
+            logger.info(f"All {len(file_paths)} backbone features found in cache")
+
+        rows = np.array([self.index[digest] for digest in hashes], dtype=np.int64)
+        return self._open("r"), rows
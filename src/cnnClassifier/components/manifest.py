@@ -0,0 +1,189 @@
+import os
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from cnnClassifier import logger
+from cnnClassifier.utils.common import get_sha256
+
+IMAGE_EXTENSIONS = (".bmp", ".gif", ".jpeg", ".jpg", ".png")
+MANIFEST_SUFFIX = ".manifest.npz"
+COLUMNS = ("path", "label", "size", "mtime_ns", "width", "height", "sha256")
+
+
+def manifest_path(directory: Path) -> Path:
+    """The manifest of an image tree lives next to it, e.g.
+    ``artifacts/data_ingestion/data.manifest.npz``."""
+
+    directory = Path(directory)
+    return directory.with_name(directory.name + MANIFEST_SUFFIX)
+
+
+def _scan_class(class_dir: Path) -> list:
+    """``(relative_path, size, mtime_ns)`` of every image under one class,
+    from ``os.scandir`` entries so no file is opened."""
+
+    found, pending = [], [class_dir]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(Path(entry.path))
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    relative = Path(entry.path).relative_to(class_dir.parent)
+                    found.append((relative.as_posix(), stat.st_size, stat.st_mtime_ns))
+    return found
+
+
+def _scan_classes(directory: Path, executor: ThreadPoolExecutor) -> tuple:
+    """``(class_names, files)`` of an image tree, walking the class
+    directories on ``executor``; ``files`` holds ``(label, relative_path,
+    size, mtime_ns)`` in manifest order."""
+
+    class_dirs = sorted(p for p in directory.iterdir() if p.is_dir())
+    files = [
+        (label, relative, size, mtime_ns)
+        for label, scanned in enumerate(executor.map(_scan_class, class_dirs))
+        for relative, size, mtime_ns in sorted(scanned)
+    ]
+    return [p.name for p in class_dirs], files
+
+
+def scan_tree(directory: Path, workers: int = 8) -> tuple:
+    """``(file_paths, labels, class_names)`` of an image tree in manifest
+    order, listed in memory: no image is opened and nothing is written."""
+
+    directory = Path(directory)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        class_names, files = _scan_classes(directory, executor)
+    file_paths = [str(directory / relative) for _, relative, _, _ in files]
+    return file_paths, [label for label, _, _, _ in files], class_names
+
+
+def _describe(path: Path) -> tuple:
+    """``(width, height, sha256)`` of one image; only the header is parsed."""
+
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+    except OSError:
+        width, height = -1, -1  # unreadable header, kept so it can be reported
+    return width, height, get_sha256(path)
+
+
+class Manifest:
+    """Columnar index of an extracted image tree: one row per image with its
+    path relative to the tree, label, byte size, mtime, dimensions and
+    SHA-256, sorted class by class like the directory walk.
+
+    Built once after ingestion and stored as an uncompressed ``.npz``;
+    every split, cache key and dataset is derived from it instead of
+    walking or re-hashing the tree.
+    """
+
+    def __init__(self, directory: Path, columns: dict, class_names: list):
+        self.directory = Path(directory)
+        self.columns = columns
+        self.class_names = list(class_names)
+
+    def __len__(self) -> int:
+        return len(self.columns["path"])
+
+    @property
+    def paths(self) -> list:
+        return [str(self.directory / p) for p in self.columns["path"]]
+
+    @property
+    def labels(self) -> list:
+        return self.columns["label"].tolist()
+
+    @property
+    def hashes(self) -> list:
+        return [h.decode() for h in self.columns["sha256"]]
+
+    def save(self, path: Path) -> None:
+        # per process, so concurrent workers building on first use never clash
+        tmp_path = Path(path).with_suffix(f".{os.getpid()}.tmp.npz")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, class_names=np.array(self.class_names), **self.columns)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read(cls, directory: Path, path: Path = None) -> "Manifest":
+        with np.load(path or manifest_path(directory)) as data:
+            columns = {name: data[name] for name in COLUMNS}
+            class_names = data["class_names"].tolist()
+        return cls(directory, columns, class_names)
+
+    @classmethod
+    def build(cls, directory: Path, workers: int = 8) -> "Manifest":
+        """Index ``directory`` and save the manifest next to it. Rows whose
+        size and mtime are unchanged are reused, so only new or modified
+        images are opened and hashed."""
+
+        directory = Path(directory)
+        path = manifest_path(directory)
+        old, previous = None, {}
+        if path.exists():
+            old = cls.read(directory, path)
+            for i, relative in enumerate(old.columns["path"]):
+                previous[str(relative)] = {
+                    name: old.columns[name][i] for name in COLUMNS
+                }
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            class_names, files = _scan_classes(directory, executor)
+
+            rows, changed = [], []
+            for label, relative, size, mtime_ns in files:
+                row = previous.get(relative)
+                if row is None or (row["size"], row["mtime_ns"]) != (size, mtime_ns):
+                    row = {"path": relative, "size": size, "mtime_ns": mtime_ns}
+                    changed.append(row)
+                row["label"] = label
+                rows.append(row)
+
+            described = executor.map(
+                _describe, [directory / row["path"] for row in changed]
+            )
+            for row, (width, height, digest) in zip(changed, described):
+                row.update(width=width, height=height, sha256=digest)
+
+        dtypes = {
+            "label": np.int16,
+            "size": np.int64,
+            "mtime_ns": np.int64,
+            "width": np.int32,
+            "height": np.int32,
+            "sha256": "S64",
+        }
+        columns = {"path": np.array([row["path"] for row in rows], dtype=str)}
+        for name, dtype in dtypes.items():
+            columns[name] = np.array([row[name] for row in rows], dtype=dtype)
+
+        if (
+            old is not None
+            and not changed
+            and len(rows) == len(old)
+            and class_names == old.class_names
+        ):
+            # left untouched so its mtime keeps downstream stages cached
+            logger.info(f"Manifest {path} is up to date ({len(old)} images)")
+            return old
+
+        manifest = cls(directory, columns, class_names)
+        manifest.save(path)
+        logger.info(
+            f"Indexed {len(manifest)} images in {len(class_names)} classes into "
+            f"{path} ({len(changed)} new or modified)"
+        )
+        return manifest
+
+    @classmethod
+    def load(cls, directory: Path) -> "Manifest":
+        """Read the stored manifest, building it on first use."""
+
+        if manifest_path(directory).exists():
+            return cls.read(directory)
+        return cls.build(directory)
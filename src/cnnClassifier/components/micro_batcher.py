@@ -0,0 +1,116 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from cnnClassifier import logger
+
+
+class QueueFullError(Exception):
+    """Raised when the request queue is at capacity."""
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for a single model call.
+
+    A batch is flushed as soon as it holds ``max_batch_size`` items or the
+    oldest item has waited ``max_wait_ms``, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_queue_size: int,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._batch_size_histogram = Counter()
+        self._queue_depth_histogram = Counter()
+        self._stopped = threading.Event()
+
+        self._worker = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue one item and return a future resolved with its prediction."""
+
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            raise QueueFullError(
+                f"Request queue is full ({self._queue.maxsize} pending items)"
+            )
+        return future
+
+    def _collect_batch(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # requests that timed out and cancelled while queued are dropped
+            batch = [
+                (item, future)
+                for item, future in self._collect_batch()
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+
+            with self._lock:
+                self._batch_size_histogram[len(batch)] += 1
+                self._queue_depth_histogram[self._queue.qsize()] += 1
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.predict_fn(items)
+            except Exception as e:
+                logger.exception(f"Batch prediction failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def metrics(self) -> dict:
+        """Return the current queue depth and the batch-size and queue-depth
+        histograms (value -> number of flushed batches)."""
+
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_size": self._queue.maxsize,
+                "batch_size_histogram": dict(
+                    sorted(self._batch_size_histogram.items())
+                ),
+                "queue_depth_histogram": dict(
+                    sorted(self._queue_depth_histogram.items())
+                ),
+            }
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._worker.join()
@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+import tensorflow as tf
+from mlflow.entities import Metric
+from mlflow.tracking import MlflowClient
+from cnnClassifier import logger
+
+# log_batch accepts at most this many metrics per request
+MAX_METRICS_PER_REQUEST = 1000
+
+# Keras log key -> MLflow metric name for epoch metrics
+EPOCH_METRIC_NAMES = {
+    "loss": "train_loss",
+    "accuracy": "train_accuracy",
+    "val_loss": "val_loss",
+    "val_accuracy": "val_accuracy",
+}
+
+_STOP = object()
+
+
+class MlflowMetricsCallback(tf.keras.callbacks.Callback):
+    """Queue training metrics and send them to MLflow with ``log_batch``
+    from a background thread, so remote logging never blocks a step.
+
+    Batch metrics are dropped (and counted) once ``max_queue_size`` metrics
+    are waiting; epoch metrics always wait for room. ``close`` flushes
+    whatever is left and must be called even if ``fit`` fails. A resumed
+    fit passes the number of batches already trained as ``initial_step`` so
+    batch metrics never reuse a step.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        log_every_n_batches: int = 10,
+        max_queue_size: int = 10_000,
+        flush_interval_s: float = 5.0,
+        client: MlflowClient = None,
+        initial_step: int = 0,
+    ):
+        super().__init__()
+        self.run_id = run_id
+        self.log_every_n_batches = log_every_n_batches
+        self.flush_interval_s = flush_interval_s
+        self.client = client or MlflowClient()
+        self.dropped = 0
+        self._step = initial_step
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._worker, name="mlflow-metrics", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _metrics(logs: dict, names: dict, step: int) -> list:
+        timestamp = int(time.time() * 1000)
+        return [
+            Metric(names.get(key, key), float(value), timestamp, step)
+            for key, value in (logs or {}).items()
+            if key in names
+        ]
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._step += 1
+        if self.log_every_n_batches and self._step % self.log_every_n_batches == 0:
+            names = {"loss": "batch_loss", "accuracy": "batch_accuracy"}
+            for metric in self._metrics(logs, names, self._step):
+                try:
+                    self._queue.put_nowait(metric)
+                except queue.Full:
+                    self.dropped += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        for metric in self._metrics(logs, EPOCH_METRIC_NAMES, epoch):
+            self._queue.put(metric)
+
+    def on_train_end(self, logs=None):
+        self.close()
+
+    def _send(self, metrics: list) -> None:
+        try:
+            self.client.log_batch(self.run_id, metrics=metrics)
+        except Exception as e:
+            logger.warning(f"Failed to log {len(metrics)} metrics to MLflow: {e}")
+
+    def _worker(self) -> None:
+        pending = []
+        deadline = time.monotonic() + self.flush_interval_s
+        while True:
+            timeout = max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP:
+                pending.append(item)
+            if pending and (
+                item is _STOP
+                or len(pending) >= MAX_METRICS_PER_REQUEST
+                or time.monotonic() >= deadline
+            ):
+                self._send(pending)
+                pending = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval_s
+            if item is _STOP:
+                return
+
+    def close(self) -> None:
+        """Flush every queued metric and stop the background thread."""
+
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.dropped:
+            logger.warning(
+                f"Dropped {self.dropped} batch metrics while MLflow logging "
+                "was falling behind"
+            )
@@ -0,0 +1,214 @@
+import time
+import mlflow
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+from cnnClassifier.entity.config_entity import EvaluationConfig
+from cnnClassifier.components.manifest import scan_tree
+from cnnClassifier.components.data_split import samples_dataset, split_files
+from cnnClassifier.components.zip_dataset import ZipImageDataset
+
+# score histogram resolution of the incremental ROC-AUC
+NUM_SCORE_BINS = 1000
+
+
+class StreamingMetrics:
+    """Classification metrics accumulated batch by batch in constant memory.
+
+    Keeps the confusion matrix, the summed cross-entropy and, per class, a
+    histogram of the predicted probability for positive and negative
+    samples. ROC-AUC is the Mann-Whitney statistic over those histograms
+    (scores in the same bin count as ties), so no prediction is stored.
+    """
+
+    def __init__(self, class_names: list, num_bins: int = NUM_SCORE_BINS):
+        self.class_names = list(class_names)
+        num_classes = len(self.class_names)
+        self.num_bins = num_bins
+        self.confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        self.positive = np.zeros((num_classes, num_bins), dtype=np.int64)
+        self.negative = np.zeros((num_classes, num_bins), dtype=np.int64)
+        self.loss_sum = 0.0
+        self.count = 0
+
+    def update(self, probabilities: np.ndarray, labels: np.ndarray) -> None:
+        """Add one batch of ``[batch, classes]`` probabilities and integer
+        labels."""
+
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        labels = np.asarray(labels, dtype=np.int64)
+        predicted = probabilities.argmax(axis=-1)
+        np.add.at(self.confusion, (labels, predicted), 1)
+
+        true_p = probabilities[np.arange(len(labels)), labels]
+        self.loss_sum += float(-np.log(np.clip(true_p, 1e-7, 1.0)).sum())
+        self.count += len(labels)
+
+        bins = np.clip((probabilities * self.num_bins).astype(np.int64), 0, None)
+        bins = np.minimum(bins, self.num_bins - 1)
+        for c in range(len(self.class_names)):
+            is_positive = labels == c
+            self.positive[c] += np.bincount(
+                bins[is_positive, c], minlength=self.num_bins
+            )
+            self.negative[c] += np.bincount(
+                bins[~is_positive, c], minlength=self.num_bins
+            )
+
+    def _roc_auc(self, c: int) -> float:
+        positive, negative = self.positive[c], self.negative[c]
+        num_positive, num_negative = positive.sum(), negative.sum()
+        if not num_positive or not num_negative:
+            return None  # undefined without both outcomes
+        negative_below = np.cumsum(negative) - negative
+        wins = (positive * (negative_below + 0.5 * negative)).sum()
+        return float(wins / (num_positive * num_negative))
+
+    def result(self) -> dict:
+        confusion = self.confusion
+        true_positive = np.diag(confusion)
+        predicted = confusion.sum(axis=0)
+        support = confusion.sum(axis=1)
+
+        per_class = {}
+        for c, name in enumerate(self.class_names):
+            per_class[name] = {
+                "precision": (
+                    float(true_positive[c] / predicted[c]) if predicted[c] else 0.0
+                ),
+                "recall": float(true_positive[c] / support[c]) if support[c] else 0.0,
+                "roc_auc": self._roc_auc(c),
+                "support": int(support[c]),
+            }
+        aucs = [m["roc_auc"] for m in per_class.values() if m["roc_auc"] is not None]
+        return {
+            "num_images": int(self.count),
+            "loss": self.loss_sum / self.count if self.count else None,
+            "accuracy": float(true_positive.sum() / self.count) if self.count else None,
+            "macro_roc_auc": float(np.mean(aucs)) if aucs else None,
+            "per_class": per_class,
+            "confusion_matrix": confusion.tolist(),
+        }
+
+
+class Evaluation:
+    """Stream a labelled image set through the trained model and write
+    ``scores.json``.
+
+    The validation split is evaluated unless ``data_dir`` points at another
+    tree with one sub-directory per class. Images are decoded in parallel,
+    prefetched and scored in large batches; only the running metrics are
+    kept.
+    """
+
+    def __init__(self, config: EvaluationConfig):
+        self.config = config
+        self.image_size = tuple(config.params_image_size)
+
+    def _directory_samples(self, directory: Path) -> tuple:
+        # listed in memory: the tree may be read-only or shared
+        file_paths, labels, class_names = scan_tree(directory)
+        unknown = set(class_names) - set(self.config.class_names)
+        if unknown:
+            raise ValueError(
+                f"{directory} has classes {sorted(unknown)} the model does not "
+                f"know, expected some of {self.config.class_names}"
+            )
+        # the tree may hold only some of the classes
+        mapping = [self.config.class_names.index(name) for name in class_names]
+        return file_paths, [mapping[label] for label in labels]
+
+    def dataset(self) -> tf.data.Dataset:
+        """Batched ``(image, one_hot)`` pairs with pixels in [0, 1]."""
+
+        config = self.config
+        if config.data_dir is None and config.params_read_from_zip:
+            dataset = ZipImageDataset(
+                zip_path=config.local_data_file,
+                image_size=self.image_size,
+                batch_size=config.params_batch_size,
+            ).dataset("validation")
+        else:
+            if config.data_dir is not None:
+                file_paths, labels = self._directory_samples(config.data_dir)
+            else:
+                file_paths, labels, _ = split_files(config.training_data, "validation")
+            dataset = samples_dataset(
+                file_paths,
+                labels,
+                len(config.class_names),
+                self.image_size[:2],
+                config.params_batch_size,
+            )
+        return dataset.map(
+            lambda x, y: (x / 255.0, y), num_parallel_calls=tf.data.AUTOTUNE
+        ).prefetch(tf.data.AUTOTUNE)
+
+    def evaluate(self) -> dict:
+        model = tf.keras.models.load_model(self.config.trained_model_path)
+        metrics = StreamingMetrics(self.config.class_names)
+        logger.info(
+            f"Evaluating {self.config.trained_model_path} on "
+            f"{self.config.data_dir or 'the validation split'} in batches of "
+            f"{self.config.params_batch_size}"
+        )
+
+        input_wait = 0.0
+        start = time.perf_counter()
+        iterator = iter(self.dataset())
+        while True:
+            wait_start = time.perf_counter()
+            batch = next(iterator, None)
+            input_wait += time.perf_counter() - wait_start
+            if batch is None:
+                break
+            images, labels = batch
+            probabilities = model.predict_on_batch(images)
+            metrics.update(probabilities, np.argmax(labels, axis=-1))
+        elapsed = time.perf_counter() - start
+        if metrics.count == 0:
+            raise ValueError(
+                f"No images to evaluate in "
+                f"{self.config.data_dir or 'the validation split'}"
+            )
+
+        scores = metrics.result()
+        scores["throughput"] = {
+            "seconds": round(elapsed, 3),
+            "images_per_second": round(metrics.count / elapsed, 2) if elapsed else None,
+            "input_wait_fraction": round(input_wait / elapsed, 3) if elapsed else None,
+            "batch_size": self.config.params_batch_size,
+        }
+        save_json(self.config.scores_file, scores)
+        logger.info(
+            f"Accuracy {scores['accuracy']:.4f}, macro ROC-AUC "
+            f"{scores['macro_roc_auc']} on {scores['num_images']} images at "
+            f"{scores['throughput']['images_per_second']} images/s"
+        )
+        return scores
+
+    def log_into_mlflow(self, scores: dict) -> None:
+        metrics = {
+            "eval_loss": scores["loss"],
+            "eval_accuracy": scores["accuracy"],
+            "eval_macro_roc_auc": scores["macro_roc_auc"],
+            "eval_images_per_second": scores["throughput"]["images_per_second"],
+        }
+        for name, class_metrics in scores["per_class"].items():
+            for key in ("precision", "recall", "roc_auc"):
+                metrics[f"eval_{key}_{name}"] = class_metrics[key]
+
+        with mlflow.start_run(run_name="evaluation"):
+            mlflow.log_params(
+                {
+                    "model": str(self.config.trained_model_path),
+                    "data": str(self.config.data_dir or "validation"),
+                    "batch_size": self.config.params_batch_size,
+                }
+            )
+            mlflow.log_metrics(
+                {key: value for key, value in metrics.items() if value is not None}
+            )
+            mlflow.log_artifact(str(self.config.scores_file))
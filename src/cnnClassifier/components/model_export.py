@@ -0,0 +1,181 @@
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from dataclasses import replace
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+from cnnClassifier.utils.profiling import latency
+from cnnClassifier.entity.config_entity import ModelExportConfig, PredictionConfig
+from cnnClassifier.components.data_split import directory_split
+from cnnClassifier.components.zip_dataset import ZipImageDataset
+from cnnClassifier.components.serving_artifact import save_serving_model
+from cnnClassifier.pipeline.prediction import (
+    MappedPredictionPipeline,
+    PredictionPipeline,
+    TFLitePredictionPipeline,
+)
+
+
+def predictor_latency(predictor: PredictionPipeline, image, runs: int) -> dict:
+    """p50/p99 wall time of ``predictor.predict_proba`` on one image."""
+
+    return latency(lambda: predictor.predict_proba(image), runs)
+
+
+def _size(path: Path) -> int:
+    path = Path(path)
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.iterdir())
+    return path.stat().st_size
+
+
+class ModelExport:
+    """Convert the trained Keras model for deployment and compare the
+    variants.
+
+    Two TFLite models are written: dynamic-range quantized (int8 weights,
+    float activations) and full-integer int8 with uint8 input and output,
+    calibrated on a representative subset of the training split. The
+    float model is also saved as a memory-mapped serving model, which
+    loads much faster than the ``.keras`` archive.
+    """
+
+    def __init__(self, config: ModelExportConfig):
+        self.config = config
+        self.image_size = tuple(config.params_image_size)
+
+    def _dataset(self, subset: str) -> tf.data.Dataset:
+        """Batched ``(image, one_hot_label)`` pairs, pixels in [0, 255]."""
+
+        if self.config.params_read_from_zip:
+            zip_dataset = ZipImageDataset(
+                zip_path=self.config.local_data_file,
+                image_size=self.image_size,
+                batch_size=self.config.params_batch_size,
+            )
+            return zip_dataset.dataset(subset)
+        return directory_split(
+            self.config.training_data,
+            subset,
+            image_size=self.image_size[:2],
+            batch_size=self.config.params_batch_size,
+        )
+
+    def _representative_dataset(self):
+        samples = (
+            self._dataset("training")
+            .unbatch()
+            .take(self.config.params_calibration_samples)
+        )
+        for image, _ in samples:
+            yield [tf.expand_dims(image / 255.0, 0)]
+
+    def _convert(self, model: tf.keras.Model, full_integer: bool) -> bytes:
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if full_integer:
+            converter.representative_dataset = self._representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.uint8
+            converter.inference_output_type = tf.uint8
+        return converter.convert()
+
+    def export(self) -> None:
+        model = tf.keras.models.load_model(self.config.trained_model_path)
+
+        for path, full_integer in (
+            (self.config.dynamic_range_model_path, False),
+            (self.config.int8_model_path, True),
+        ):
+            logger.info(f"Converting {self.config.trained_model_path} to {path}")
+            tflite_model = self._convert(model, full_integer)
+            tmp_path = Path(path).with_suffix(".tmp")
+            tmp_path.write_bytes(tflite_model)
+            os.replace(tmp_path, path)
+
+        save_serving_model(model, self.config.serving_model_dir)
+
+    def evaluate(self) -> dict:
+        """Report size, load time, single-image CPU latency and validation
+        accuracy of every variant, relative to the Keras model.
+
+        The validation split is streamed: every decoded batch goes through
+        all variants and only the counts of correct and agreeing
+        predictions are kept.
+        """
+
+        prediction_config = PredictionConfig(
+            trained_model_path=self.config.trained_model_path,
+            class_names=self.config.class_names,
+            params_image_size=self.image_size,
+            params_batch_size=1,  # latency of a single scan
+        )
+        variants = {
+            "keras": (PredictionPipeline, self.config.trained_model_path),
+            "dynamic_range": (
+                TFLitePredictionPipeline,
+                self.config.dynamic_range_model_path,
+            ),
+            "int8": (TFLitePredictionPipeline, self.config.int8_model_path),
+            "mapped": (MappedPredictionPipeline, self.config.serving_model_dir),
+        }
+
+        predictors, load_seconds = {}, {}
+        for name, (pipeline_cls, path) in variants.items():
+            start = time.perf_counter()
+            predictors[name] = pipeline_cls(
+                replace(prediction_config, trained_model_path=path)
+            )
+            load_seconds[name] = time.perf_counter() - start  # includes the warm-up
+
+        num_images, sample = 0, None
+        correct = dict.fromkeys(variants, 0)
+        agreeing = dict.fromkeys(variants, 0)
+        for batch_images, batch_labels in self._dataset("validation"):
+            batch_images = batch_images.numpy()
+            labels = np.argmax(batch_labels.numpy(), axis=-1)
+            if sample is None:
+                sample = batch_images[0]
+            num_images += len(labels)
+
+            reference = None
+            for name, predictor in predictors.items():
+                predicted = np.argmax(predictor.predict_proba(batch_images), axis=-1)
+                if reference is None:
+                    reference = predicted  # the Keras model comes first
+                correct[name] += int(np.sum(predicted == labels))
+                agreeing[name] += int(np.sum(predicted == reference))
+        if not num_images:
+            raise ValueError("The validation split is empty")
+
+        report = {"num_validation_images": num_images, "variants": {}}
+        for name, (_, path) in variants.items():
+            report["variants"][name] = {
+                "path": str(path),
+                "size_mb": round(_size(path) / 2**20, 3),
+                "load_seconds": round(load_seconds[name], 3),
+                "accuracy": correct[name] / num_images,
+                "agreement_with_keras": agreeing[name] / num_images,
+                "latency": predictor_latency(
+                    predictors[name], sample, self.config.latency_runs
+                ),
+            }
+
+        keras = report["variants"]["keras"]
+        for variant in report["variants"].values():
+            variant["accuracy_delta"] = variant["accuracy"] - keras["accuracy"]
+            variant["size_ratio"] = round(keras["size_mb"] / variant["size_mb"], 2)
+            variant["speedup_p50"] = round(
+                keras["latency"]["p50_ms"] / variant["latency"]["p50_ms"], 2
+            )
+            logger.info(
+                f"{variant['path']}: {variant['size_mb']} MB, "
+                f"loaded in {variant['load_seconds']} s, "
+                f"p50 {variant['latency']['p50_ms']} ms, "
+                f"accuracy {variant['accuracy']:.4f}"
+            )
+
+        save_json(self.config.report_file, report)
+        return report
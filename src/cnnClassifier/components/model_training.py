@@ -1,82 +1,225 @@
+import math
+import numpy as np
 import tensorflow as tf
 import mlflow
 import mlflow.keras
+from cnnClassifier import logger
 from cnnClassifier.config.configuration import TrainingConfig, BaseModelConfig
+from cnnClassifier.utils.common import load_json
+from cnnClassifier.utils.profiling import span
+from cnnClassifier.components.base_model import get_head_type
+from cnnClassifier.components.artifact_context import ArtifactContext
+from cnnClassifier.components.mlflow_logger import MlflowMetricsCallback
+from cnnClassifier.components.checkpointing import TrainingCheckpoint
+from cnnClassifier.components.distribution import get_strategy, is_chief
+from cnnClassifier.components.feature_cache import FeatureCache, backbone_fingerprint
+from cnnClassifier.components.augmentation import (
+    Augmenter,
+    augmented_epochs_dataset,
+    materialize_epochs,
+)
+from cnnClassifier.components.manifest import Manifest
+from cnnClassifier.components.data_split import (
+    SPLIT_SEED,
+    directory_split,
+    split_files,
+    split_hashes,
+    split_rows,
+    split_samples,
+)
+from cnnClassifier.components.data_sharding import parse_example
+from cnnClassifier.components.zip_dataset import ZipImageDataset
 from pathlib import Path
 
+# last VGG16 layer before the classifier head
+BACKBONE_OUTPUT_LAYER = "block5_pool"
+
 
 class Training:
 
     def __init__(
-        self, training_config: TrainingConfig, base_model_config: BaseModelConfig
+        self,
+        training_config: TrainingConfig,
+        base_model_config: BaseModelConfig,
+        context: ArtifactContext = None,
     ):
         self.training_config = training_config
         self.base_model_config = base_model_config
+        self.context = context
 
     def get_base_model(self):
-        self.model = tf.keras.models.load_model(
-            self.training_config.updated_base_model_path
+        tf.keras.mixed_precision.set_global_policy(
+            self.training_config.params_precision
+        )
+        self.strategy = get_strategy(
+            self.training_config.params_distribution,
+            self.training_config.params_num_cpu_devices,
         )
 
-    def train_valid_generator(self):
+        path = self.training_config.updated_base_model_path
+        self.model = None
+        if self.context:
+            if self.training_config.params_distribution == "none":
+                self.model = self.context.get(path)
+            else:
+                # variables must be created inside the strategy scope
+                self.context.wait(path)
+        if self.model is None:
+            with self.strategy.scope():
+                self.model = tf.keras.models.load_model(path)
+        else:
+            logger.info(f"Using the in-memory model from the previous stage for {path}")
+        self.model.jit_compile = self.training_config.params_jit_compile
+
+    @property
+    def global_batch_size(self) -> int:
+        """BATCH_SIZE is per replica; each step consumes one batch per replica."""
+
+        return (
+            self.training_config.params_batch_size * self.strategy.num_replicas_in_sync
+        )
+
+    def _directory_dataset(self, subset: str) -> tf.data.Dataset:
         img_size = self.training_config.params_image_size[:-1]  # (224,224)
-        batch_size = self.training_config.params_batch_size
-
-        # --- train dataset ---
-        self.train_generator = tf.keras.utils.image_dataset_from_directory(
-            directory=self.training_config.training_data,
-            labels="inferred",
-            label_mode="categorical",  # softmax
-            batch_size=batch_size,
-            image_size=img_size,
-            shuffle=True,
-            validation_split=0.2,
-            subset="training",
-            seed=42,
-        )
-
-        # --- validation dataset ---
-        self.valid_generator = tf.keras.utils.image_dataset_from_directory(
-            directory=self.training_config.training_data,
-            labels="inferred",
-            label_mode="categorical",
-            batch_size=batch_size,
-            image_size=img_size,
-            shuffle=False,
-            validation_split=0.2,
-            subset="validation",
-            seed=42,
-        )
-
-        # --- normalization ---
-        normalization_layer = tf.keras.layers.Rescaling(1.0 / 255)
+        data_dir = self.training_config.training_data
+        return directory_split(data_dir, subset, img_size, self.global_batch_size)
 
-        self.train_generator = self.train_generator.map(
-            lambda x, y: (normalization_layer(x), y),
+    def _directory_datasets(self) -> tuple:
+        data_dir = self.training_config.training_data
+        self.num_train_samples = len(split_files(data_dir, "training")[0])
+        train_dataset = self._directory_dataset("training")
+        valid_dataset = self._directory_dataset("validation")
+        return train_dataset, valid_dataset
+
+    def _zip_datasets(self) -> tuple:
+        zip_dataset = ZipImageDataset(
+            zip_path=self.training_config.local_data_file,
+            image_size=self.training_config.params_image_size,
+            batch_size=self.global_batch_size,
+        )
+        self.num_train_samples = len(
+            split_samples(zip_dataset.members, zip_dataset.labels, "training")[0]
+        )
+        return zip_dataset.dataset("training"), zip_dataset.dataset("validation")
+
+    def _shard_dataset(self, subset: str, num_classes: int) -> tf.data.Dataset:
+        """Read preprocessed uint8 shards with parallel interleave; decoding
+        and resizing already happened in the data sharding stage."""
+
+        shuffle = subset == "training"
+        image_size = self.training_config.params_image_size
+
+        files = tf.data.Dataset.list_files(
+            str(self.training_config.shards_dir / subset / "*.tfrecord"),
+            shuffle=shuffle,
+            seed=SPLIT_SEED,
+        )
+        dataset = files.interleave(
+            tf.data.TFRecordDataset,
+            cycle_length=tf.data.AUTOTUNE,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=not shuffle,
+        )
+        dataset = dataset.map(
+            lambda record: parse_example(record, image_size),
             num_parallel_calls=tf.data.AUTOTUNE,
         )
+        if self.training_config.params_cache_dataset:
+            dataset = dataset.cache()
+        if shuffle:
+            dataset = dataset.shuffle(
+                buffer_size=8 * self.global_batch_size,
+                seed=SPLIT_SEED,
+            )
 
-        self.valid_generator = self.valid_generator.map(
+        dataset = dataset.batch(self.global_batch_size)
+        return dataset.map(
+            lambda x, y: (
+                tf.cast(x, tf.float32) / 255.0,
+                tf.one_hot(y, num_classes),
+            ),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+
+    def _augmented_epochs_generator(self, augmenter: Augmenter) -> None:
+        """Replace the training input with stored augmented epochs, one per
+        Keras epoch."""
+
+        if self.training_config.params_read_from_zip or (
+            self.training_config.params_use_shards
+        ):
+            raise ValueError("AUGMENTED_EPOCHS needs the extracted images")
+
+        manifest = Manifest.load(self.training_config.training_data)
+        epochs_file = materialize_epochs(
+            manifest.paths,
+            manifest.hashes,
+            augmenter,
+            self.training_config.params_augmented_epochs,
+            self.training_config.augmented_epochs_dir,
+        )
+        train_rows = split_rows(manifest.labels, "training")
+        self.train_generator = augmented_epochs_dataset(
+            epochs_file,
+            train_rows,
+            np.eye(len(manifest.class_names), dtype=np.float32)[manifest.labels],
+            self.global_batch_size,
+        )
+        self.num_train_samples = len(train_rows)
+        self.steps_per_epoch = self._steps_for(self.num_train_samples)
+
+    @staticmethod
+    def _normalize(dataset: tf.data.Dataset) -> tf.data.Dataset:
+        normalization_layer = tf.keras.layers.Rescaling(1.0 / 255)
+        return dataset.map(
             lambda x, y: (normalization_layer(x), y),
             num_parallel_calls=tf.data.AUTOTUNE,
         )
 
-        # --- augmentation ---
+    def train_valid_generator(self):
+        self.fit_model = self.model
+        self.steps_per_epoch = None
+
+        if self.training_config.params_cache_features:
+            self._feature_generators()
+            return
+
+        augmenter = None
         if self.training_config.params_is_augmentation:
-            data_augmentation = tf.keras.Sequential(
-                [
-                    tf.keras.layers.RandomFlip("horizontal"),
-                    tf.keras.layers.RandomRotation(0.1),
-                    tf.keras.layers.RandomZoom(0.2),
-                    tf.keras.layers.RandomTranslation(0.1, 0.1),
-                ]
+            augmenter = Augmenter(
+                self.training_config.params_augmentations,
+                self.training_config.params_image_size,
             )
-
-        self.train_generator = self.train_generator.map(
-            lambda x, y: (data_augmentation(x, training=True), y),
-            num_parallel_calls=tf.data.AUTOTUNE,
+        augmented_epochs = (
+            augmenter is not None and self.training_config.params_augmented_epochs
         )
 
+        if augmented_epochs:
+            # the stored epochs are the training input; only validation is read
+            self._augmented_epochs_generator(augmenter)
+            self.valid_generator = self._normalize(
+                self._directory_dataset("validation")
+            )
+        elif self.training_config.params_use_shards:
+            metadata = load_json(self.training_config.shards_dir / "metadata.json")
+            num_classes = len(metadata.class_names)
+            self.num_train_samples = metadata.num_examples.training
+            self.train_generator = self._shard_dataset("training", num_classes)
+            self.valid_generator = self._shard_dataset("validation", num_classes)
+        else:
+            if self.training_config.params_read_from_zip:
+                self.train_generator, self.valid_generator = self._zip_datasets()
+            else:
+                self.train_generator, self.valid_generator = self._directory_datasets()
+
+            # --- normalization ---
+            self.train_generator = self._normalize(self.train_generator)
+            self.valid_generator = self._normalize(self.valid_generator)
+
+        # --- augmentation (after caching, before prefetch) ---
+        if augmenter is not None and not augmented_epochs:
+            self.train_generator = augmenter.augment_dataset(self.train_generator)
+
         # --- pipeline optimalization ---
         self.train_generator = self.train_generator.prefetch(
             buffer_size=tf.data.AUTOTUNE
@@ -85,41 +228,224 @@ class Training:
             buffer_size=tf.data.AUTOTUNE
         )
 
+        by_file = self.training_config.params_use_shards
+        self.train_generator = self._distribute(self.train_generator, by_file)
+        self.valid_generator = self._distribute(self.valid_generator, by_file)
+
+    def _distribute(self, dataset: tf.data.Dataset, by_file: bool) -> tf.data.Dataset:
+        """Tell multi-worker training how to split the input between workers:
+        whole TFRecord shards per worker, otherwise every n-th element.
+
+        With more than one replica the last partial batch is dropped, as a
+        replica left with an empty slice of it fails the step.
+        """
+
+        options = tf.data.Options()
+        options.experimental_distribute.auto_shard_policy = (
+            tf.data.experimental.AutoShardPolicy.FILE
+            if by_file
+            else tf.data.experimental.AutoShardPolicy.DATA
+        )
+        dataset = dataset.with_options(options)
+        if self.strategy.num_replicas_in_sync > 1:
+            dataset = dataset.unbatch().batch(
+                self.global_batch_size, drop_remainder=True
+            )
+        return dataset
+
+    def _split_frozen_model(self) -> tuple:
+        """Split the full model into its frozen backbone and a head model that
+        shares the classifier layers, so training the head updates
+        ``self.model`` in place."""
+
+        backbone_output = self.model.get_layer(BACKBONE_OUTPUT_LAYER)
+        backbone = tf.keras.Model(
+            inputs=self.model.input,
+            outputs=backbone_output.output,
+            name=f"{self.model.name}_backbone",
+        )
+        if backbone.trainable_weights:
+            raise ValueError("Feature caching requires a fully frozen backbone")
+
+        with self.strategy.scope():
+            head_input = tf.keras.Input(shape=backbone_output.output.shape[1:])
+            x = head_input
+            head_layers = self.model.layers[
+                self.model.layers.index(backbone_output) + 1 :
+            ]
+            for layer in head_layers:
+                x = layer(x)
+            head = tf.keras.Model(inputs=head_input, outputs=x)
+
+            head.compile(
+                optimizer=tf.keras.optimizers.deserialize(
+                    tf.keras.optimizers.serialize(self.model.optimizer)
+                ),
+                loss=tf.keras.losses.CategoricalCrossentropy(),
+                metrics=["accuracy"],
+                jit_compile=self.training_config.params_jit_compile,
+            )
+        return backbone, head
+
+    def _feature_dataset(
+        self, features: np.ndarray, rows: np.ndarray, labels: np.ndarray, shuffle
+    ) -> tf.data.Dataset:
+        """Batch row indices and gather their features from the memory-mapped
+        cache, so only the current batch is ever resident in RAM."""
+
+        feature_shape = features.shape[1:]
+
+        def gather(batch_rows, batch_labels):
+            batch = tf.numpy_function(lambda r: features[r], [batch_rows], tf.float32)
+            return tf.ensure_shape(batch, (None, *feature_shape)), batch_labels
+
+        dataset = tf.data.Dataset.from_tensor_slices((rows, labels))
+        if shuffle:
+            dataset = dataset.shuffle(len(rows), seed=42)
+        dataset = dataset.batch(self.global_batch_size)
+        dataset = dataset.map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+        dataset = dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+        return self._distribute(dataset, by_file=False)
+
+    def _feature_generators(self):
+        """Compute (or reuse) backbone features once and feed them to a
+        head-only model for every epoch."""
+
+        if self.training_config.params_read_from_zip:
+            raise ValueError("CACHE_FEATURES needs the extracted images")
+        if self.training_config.params_is_augmentation:
+            logger.warning("Augmentation is ignored when training on cached features")
+
+        backbone, self.fit_model = self._split_frozen_model()
+        cache = FeatureCache(
+            root_dir=self.training_config.feature_cache_dir,
+            backbone=backbone,
+            backbone_key=backbone_fingerprint(
+                backbone,
+                weights=self.base_model_config.params_weights,
+                image_size=self.training_config.params_image_size,
+                precision=self.training_config.params_precision,
+            ),
+            image_size=self.training_config.params_image_size,
+            batch_size=self.training_config.params_batch_size,
+        )
+
+        data_dir = self.training_config.training_data
+        train_paths, train_labels, class_names = split_files(data_dir, "training")
+        valid_paths, valid_labels, _ = split_files(data_dir, "validation")
+        one_hot = np.eye(len(class_names), dtype=np.float32)
+
+        features, rows = cache.get_features(
+            train_paths + valid_paths,
+            split_hashes(data_dir, "training") + split_hashes(data_dir, "validation"),
+        )
+
+        self.num_train_samples = len(train_paths)
+        self.train_generator = self._feature_dataset(
+            features, rows[: len(train_paths)], one_hot[train_labels], shuffle=True
+        )
+        self.valid_generator = self._feature_dataset(
+            features, rows[len(train_paths) :], one_hot[valid_labels], shuffle=False
+        )
+
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
         model.save(path)
 
-    def train(self):
-        with mlflow.start_run():
-            mlflow.log_param("epochs", self.training_config.params_epochs)
-            mlflow.log_param("batch_size", self.training_config.params_batch_size)
-            mlflow.log_param("image_size", self.training_config.params_image_size)
-            mlflow.log_param(
-                "learning_rate", self.base_model_config.params_learning_rate
+    def _callbacks(self) -> tuple:
+        """Return ``(checkpoint, callbacks)``; the checkpoint follows early
+        stopping, whose state it saves after every epoch and restores over
+        the reset at the start of a resumed fit."""
+
+        checkpoint, early_stopping, callbacks = None, None, []
+        if self.training_config.params_early_stopping_patience:
+            early_stopping = tf.keras.callbacks.EarlyStopping(
+                monitor="val_loss",
+                patience=self.training_config.params_early_stopping_patience,
+                restore_best_weights=True,
+                verbose=1,
             )
-            mlflow.log_param(
-                "augmentation", self.training_config.params_is_augmentation
+            callbacks.append(early_stopping)
+        if self.training_config.params_checkpoint_every:
+            checkpoint = TrainingCheckpoint(
+                self.training_config.checkpoint_dir,
+                every_n_epochs=self.training_config.params_checkpoint_every,
+                early_stopping=early_stopping,
             )
+            callbacks.append(checkpoint)
+        return checkpoint, callbacks
 
-        history = self.model.fit(
-            self.train_generator,
-            epochs=self.training_config.params_epochs,
-            validation_data=self.valid_generator,
-        )
+    def _steps_for(self, num_samples: int) -> int:
+        """Training steps over ``num_samples``; with more than one replica
+        ``_distribute`` drops the last partial batch."""
 
-        for epoch in range(self.training_config.params_epochs):
-            mlflow.log_metric("train_loss", history.history["loss"][epoch], step=epoch)
-            mlflow.log_metric(
-                "train_accuracy", history.history["accuracy"][epoch], step=epoch
-            )
-            mlflow.log_metric(
-                "val_loss", history.history["val_loss"][epoch], step=epoch
+        if self.strategy.num_replicas_in_sync > 1:
+            return num_samples // self.global_batch_size
+        return math.ceil(num_samples / self.global_batch_size)
+
+    def _batches_per_epoch(self) -> int:
+        # from the split size, as rebatching hides the dataset cardinality
+        if self.steps_per_epoch is not None:
+            return self.steps_per_epoch
+        return self._steps_for(self.num_train_samples)
+
+    def train(self):
+        checkpoint, callbacks = self._callbacks()
+        initial_epoch = checkpoint.initial_epoch() if checkpoint else 0
+        if not is_chief():
+            # every worker runs the same fit; only the chief logs and saves
+            self.fit_model.fit(
+                self.train_generator,
+                epochs=self.training_config.params_epochs,
+                initial_epoch=initial_epoch,
+                steps_per_epoch=self.steps_per_epoch,
+                validation_data=self.valid_generator,
+                callbacks=callbacks,
             )
-            mlflow.log_metric(
-                "val_accuracy", history.history["val_accuracy"][epoch], step=epoch
+            return
+
+        run_id = checkpoint.resumed_run_id() if checkpoint else None
+        with mlflow.start_run(run_id=run_id) as run:
+            if checkpoint:
+                checkpoint.save_run_id(run.info.run_id)
+            if run_id is None:
+                mlflow.log_param("epochs", self.training_config.params_epochs)
+                mlflow.log_param("batch_size", self.training_config.params_batch_size)
+                mlflow.log_param("image_size", self.training_config.params_image_size)
+                mlflow.log_param(
+                    "learning_rate", self.base_model_config.params_learning_rate
+                )
+                mlflow.log_param(
+                    "augmentation", self.training_config.params_is_augmentation
+                )
+                mlflow.log_param("head", get_head_type(self.model))
+
+            if self.context:
+                # fitting updates the weights the background save is writing
+                self.context.wait(self.training_config.updated_base_model_path)
+
+            metrics_logger = MlflowMetricsCallback(
+                run.info.run_id,
+                initial_step=initial_epoch * self._batches_per_epoch(),
             )
+            try:
+                with span("fit"):
+                    self.fit_model.fit(
+                        self.train_generator,
+                        epochs=self.training_config.params_epochs,
+                        initial_epoch=initial_epoch,
+                        steps_per_epoch=self.steps_per_epoch,
+                        validation_data=self.valid_generator,
+                        callbacks=[*callbacks, metrics_logger],
+                    )
+            finally:
+                metrics_logger.close()
 
-        self.save_model(path=self.training_config.trained_model_path, model=self.model)
-        mlflow.log_artifact(
-            str(self.training_config.trained_model_path), artifact_path="trained_model"
-        )
+            with span("save_model"):
+                self.save_model(
+                    path=self.training_config.trained_model_path, model=self.model
+                )
+            mlflow.log_artifact(
+                str(self.training_config.trained_model_path),
+                artifact_path="trained_model",
+            )
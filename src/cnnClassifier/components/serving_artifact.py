@@ -0,0 +1,149 @@
+import os
+import json
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier import logger
+
+FORMAT_VERSION = 1
+SPEC_FILE = "model.json"
+WEIGHTS_FILE = "weights.bin"
+# byte alignment of every array in the weights file
+ALIGNMENT = 64
+GROUPS = ("trainable", "non_trainable")
+
+
+def _group_variables(model: tf.keras.Model) -> dict:
+    return {
+        "trainable": model.trainable_variables,
+        "non_trainable": model.non_trainable_variables,
+    }
+
+
+def save_serving_model(model: tf.keras.Model, directory: Path) -> None:
+    """Write ``model`` as a fast-loading serving artifact.
+
+    ``model.json`` holds the architecture and an index of the weights;
+    ``weights.bin`` holds the raw, uncompressed arrays back to back, each
+    aligned to ``ALIGNMENT`` bytes so it can be memory-mapped in place.
+    Both files are replaced atomically, so processes that already mapped
+    the previous weights keep reading them.
+    """
+
+    directory = Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    index, offset = [], 0
+    tmp_weights = directory / f"{WEIGHTS_FILE}.tmp"
+    with open(tmp_weights, "wb") as f:
+        for group, variables in _group_variables(model).items():
+            for variable in variables:
+                array = np.ascontiguousarray(variable.numpy())
+                padding = -offset % ALIGNMENT
+                f.write(b"\0" * padding)
+                offset += padding
+                index.append(
+                    {
+                        "group": group,
+                        "path": variable.path,
+                        "dtype": array.dtype.str,
+                        "shape": list(array.shape),
+                        "offset": offset,
+                    }
+                )
+                f.write(array.tobytes())
+                offset += array.nbytes
+
+    architecture = json.loads(model.to_json())
+    # inference only: rebuilding the optimizer would create variables
+    architecture.pop("compile_config", None)
+    spec = {
+        "format_version": FORMAT_VERSION,
+        "architecture": architecture,
+        "weights_size": offset,
+        "weights": index,
+    }
+    tmp_spec = directory / f"{SPEC_FILE}.tmp"
+    with open(tmp_spec, "w") as f:
+        json.dump(spec, f)
+    os.replace(tmp_weights, directory / WEIGHTS_FILE)
+    os.replace(tmp_spec, directory / SPEC_FILE)
+    logger.info(
+        f"Saved serving model with {len(index)} arrays "
+        f"({offset / 2**20:.1f} MB) to {directory}"
+    )
+
+
+class MappedModel:
+    """Inference-only model whose weights live in a memory-mapped file.
+
+    The architecture is rebuilt with variable creation deferred, so no
+    weight buffer is allocated or initialized; the forward pass reads the
+    arrays of ``weights.bin`` in place through zero-copy tensors. Loading
+    costs a JSON parse and an ``mmap``, and every process serving the same
+    file shares its pages through the page cache. The mapping is
+    copy-on-write (TensorFlow only imports writable buffers), so nothing
+    ever reaches the file.
+    """
+
+    def __init__(self, directory: Path):
+        directory = Path(directory)
+        with open(directory / SPEC_FILE) as f:
+            spec = json.load(f)
+        if spec["format_version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"{directory} has serving format {spec['format_version']}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+        weights = np.memmap(directory / WEIGHTS_FILE, mode="c")
+        if weights.size != spec["weights_size"]:
+            raise ValueError(
+                f"{directory / WEIGHTS_FILE} holds {weights.size} bytes, "
+                f"{directory / SPEC_FILE} expects {spec['weights_size']}"
+            )
+
+        with tf.keras.StatelessScope(initialize_variables=False):
+            self.model = tf.keras.models.model_from_json(
+                json.dumps(spec["architecture"])
+            )
+
+        # paths of auto-named variables differ between processes, shapes not
+        expected = {
+            group: [
+                (tuple(variable.shape), np.dtype(variable.dtype).str)
+                for variable in variables
+            ]
+            for group, variables in _group_variables(self.model).items()
+        }
+        stored = {group: [] for group in GROUPS}
+        self.weights = {group: [] for group in GROUPS}
+        for entry in spec["weights"]:
+            dtype = np.dtype(entry["dtype"])
+            size = int(np.prod(entry["shape"])) * dtype.itemsize
+            array = weights[entry["offset"] : entry["offset"] + size]
+            array = array.view(dtype).reshape(entry["shape"])
+            stored[entry["group"]].append((array.shape, dtype.str))
+            self.weights[entry["group"]].append(
+                tf.experimental.dlpack.from_dlpack(array.__dlpack__())
+            )
+        if stored != expected:
+            raise ValueError(
+                f"Weights in {directory} do not match the rebuilt architecture"
+            )
+
+        self._forward = tf.function(self._call)
+
+    def _call(self, images: tf.Tensor) -> tf.Tensor:
+        outputs, _ = self.model.stateless_call(
+            self.weights["trainable"],
+            self.weights["non_trainable"],
+            images,
+            training=False,
+        )
+        return outputs
+
+    def predict_on_batch(self, images: np.ndarray) -> np.ndarray:
+        # an enclosing scope keeps a retrace from allocating the variables
+        with tf.keras.StatelessScope(initialize_variables=False):
+            return self._forward(tf.convert_to_tensor(images)).numpy()
@@ -0,0 +1,434 @@
+import os
+import json
+import math
+import random
+import itertools
+import multiprocessing
+import mlflow
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from mlflow.entities import Param
+from mlflow.tracking import MlflowClient
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+from cnnClassifier.entity.config_entity import SweepConfig
+from cnnClassifier.components.base_model import BaseModel
+from cnnClassifier.components.mlflow_logger import MlflowMetricsCallback
+from cnnClassifier.components.feature_cache import load_image
+from cnnClassifier.components.augmentation import (
+    Augmenter,
+    augmented_epochs_dataset,
+    materialize_epochs,
+)
+from cnnClassifier.components.manifest import Manifest
+from cnnClassifier.components.data_split import SPLIT_SEED, split_rows
+
+SEARCHES = ("grid", "random")
+
+# the median rule only applies once this many other trials reached the epoch
+PRUNE_MIN_TRIALS = 2
+
+
+def expand_trials(
+    space: dict, search: str, num_trials: int, seed: int = SPLIT_SEED
+) -> list:
+    """Return one ``{param: value}`` dict per trial: every combination of
+    ``space`` for a grid search, ``num_trials`` distinct ones for random."""
+
+    names = sorted(space)
+    grid = [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+    if search == "grid":
+        return grid
+    if search == "random":
+        return random.Random(seed).sample(grid, min(num_trials, len(grid)))
+    raise ValueError(f"Unknown search '{search}', expected one of {SEARCHES}")
+
+
+def fold_indices(labels: list, folds: int) -> list:
+    """Return ``(train_rows, validation_rows)`` per fold over the sorted
+    samples, stratified by label. A single fold is the fixed split used
+    everywhere else."""
+
+    if folds == 1:
+        return [(split_rows(labels, "training"), split_rows(labels, "validation"))]
+
+    labels = np.asarray(labels)
+    rng = np.random.RandomState(SPLIT_SEED)
+    fold_of = np.empty(len(labels), dtype=np.int64)
+    dealt = 0
+    for label in np.unique(labels):
+        # deal each class round-robin, continuing where the last one stopped
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        fold_of[rows] = (dealt + np.arange(len(rows))) % folds
+        dealt += len(rows)
+    return [
+        (np.flatnonzero(fold_of != k), np.flatnonzero(fold_of == k))
+        for k in range(folds)
+    ]
+
+
+def decode_images(
+    file_paths: list, hashes: list, image_size: tuple, out_file: Path
+) -> None:
+    """Decode and resize every image once into a uint8 ``.npy`` that trial
+    processes memory-map, so the OS page cache holds one shared copy. The
+    copy is reused while the manifest hashes are unchanged."""
+
+    out_file = Path(out_file)
+    index_file = out_file.with_suffix(".json")
+    index = {"image_size": list(image_size), "hashes": list(hashes)}
+    if out_file.exists() and index_file.exists():
+        with open(index_file) as f:
+            if json.load(f) == index:
+                logger.info(f"Reusing {len(file_paths)} decoded images in {out_file}")
+                return
+
+    logger.info(f"Decoding {len(file_paths)} images into {out_file}")
+    tmp_file = out_file.with_suffix(".tmp.npy")
+    images = np.lib.format.open_memmap(
+        tmp_file, mode="w+", dtype=np.uint8, shape=(len(file_paths), *image_size)
+    )
+    dataset = (
+        tf.data.Dataset.from_tensor_slices([str(p) for p in file_paths])
+        .map(
+            lambda p: tf.cast(tf.round(load_image(p, image_size) * 255.0), tf.uint8),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+        .batch(64)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    row = 0
+    for batch in dataset:
+        images[row : row + len(batch)] = batch.numpy()
+        row += len(batch)
+    images.flush()
+    del images
+
+    os.replace(tmp_file, out_file)
+    with open(index_file, "w") as f:
+        json.dump(index, f)
+
+
+class PruningCallback(tf.keras.callbacks.Callback):
+    """Median stopping rule shared by every trial process.
+
+    After each epoch a trial reports its validation accuracy for its fold
+    and stops if it falls below the median of the trials that reported the
+    same fold and epoch before it. Pruned trials skip their remaining folds.
+    """
+
+    def __init__(self, trial_id: str, fold: int, reports, lock, pruned):
+        super().__init__()
+        self.trial_id = trial_id
+        self.fold = fold
+        self.reports = reports
+        self.lock = lock
+        self.pruned = pruned
+
+    def on_epoch_end(self, epoch, logs=None):
+        score = float(logs["val_accuracy"])
+        key = f"{self.fold}/{epoch}"
+        with self.lock:
+            others = list(self.reports.get(key, []))
+            self.reports[key] = others + [score]
+
+        if len(others) >= PRUNE_MIN_TRIALS and score < np.median(others):
+            logger.info(
+                f"Pruning {self.trial_id} at epoch {epoch + 1}: val_accuracy "
+                f"{score:.4f} below the median {np.median(others):.4f}"
+            )
+            self.pruned[self.trial_id] = epoch
+            self.model.stop_training = True
+
+
+def _init_worker(threads: int) -> None:
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+
+def _dataset(
+    images: np.ndarray,
+    one_hot: np.ndarray,
+    rows: np.ndarray,
+    batch_size: int,
+    threads: int,
+    shuffle: bool,
+    augmenter: Augmenter = None,
+) -> tf.data.Dataset:
+    """Batch row indices and gather their pixels from the shared memmap."""
+
+    def gather(batch_rows, batch_labels):
+        batch = tf.numpy_function(lambda r: images[r], [batch_rows], tf.uint8)
+        batch = tf.ensure_shape(batch, (None, *images.shape[1:]))
+        return tf.cast(batch, tf.float32) / 255.0, batch_labels
+
+    dataset = tf.data.Dataset.from_tensor_slices((rows, one_hot[rows]))
+    if shuffle:
+        dataset = dataset.shuffle(len(rows), seed=SPLIT_SEED)
+    dataset = dataset.batch(batch_size).map(gather, num_parallel_calls=threads)
+    if augmenter:
+        dataset = augmenter.augment_dataset(dataset)
+
+    options = tf.data.Options()
+    options.threading.private_threadpool_size = threads
+    return dataset.prefetch(1).with_options(options)
+
+
+def run_trial(unit: dict, shared: tuple) -> dict:
+    """Train one fold of one trial in a pool process and return its result."""
+
+    config: SweepConfig = unit["config"]
+    trial_id, fold, params = unit["trial_id"], unit["fold"], unit["params"]
+    reports, lock, pruned = shared
+    result = {"trial": trial_id, "fold": fold, "status": "skipped"}
+    if trial_id in pruned:
+        return result
+
+    mlflow.set_tracking_uri(unit["tracking_uri"])
+    client = MlflowClient()
+    run_id = unit["run_id"]
+    if config.params_folds > 1:
+        run_id = client.create_run(
+            unit["experiment_id"],
+            run_name=f"{trial_id}_fold_{fold}",
+            tags={MLFLOW_PARENT_RUN_ID: unit["run_id"]},
+        ).info.run_id
+        client.log_param(run_id, "fold", fold)
+
+    threads = config.params_threads_per_trial
+    images = np.load(config.decoded_images_file, mmap_mode="r")
+    one_hot = np.eye(config.params_classes, dtype=np.float32)[unit["labels"]]
+    train_rows, valid_rows = unit["rows"]
+
+    batch_size, steps_per_epoch = params["BATCH_SIZE"], None
+    if unit["epochs_file"]:
+        train_data = augmented_epochs_dataset(
+            unit["epochs_file"], train_rows, one_hot, batch_size
+        )
+        steps_per_epoch = math.ceil(len(train_rows) / batch_size)
+    else:
+        augmenter = None
+        if config.params_is_augmentation:
+            augmenter = Augmenter(config.params_augmentations, config.params_image_size)
+        train_data = _dataset(
+            images, one_hot, train_rows, batch_size, threads, True, augmenter
+        )
+
+    callbacks = [MlflowMetricsCallback(run_id, client=client)]
+    if config.params_prune:
+        callbacks.append(PruningCallback(trial_id, fold, reports, lock, pruned))
+    try:
+        tf.keras.mixed_precision.set_global_policy(config.params_precision)
+        model = BaseModel._prepare_full_model(
+            model=tf.keras.models.load_model(config.base_model_path),
+            classes=config.params_classes,
+            freeze_all=True,
+            freeze_till=None,
+            learning_rate=params["LEARNING_RATE"],
+            precision=config.params_precision,
+            jit_compile=config.params_jit_compile,
+            head=params["HEAD"],
+            head_units=params["HEAD_UNITS"],
+            head_dropout=params["HEAD_DROPOUT"],
+        )
+        history = model.fit(
+            train_data,
+            epochs=params["EPOCHS"],
+            steps_per_epoch=steps_per_epoch,
+            validation_data=_dataset(
+                images, one_hot, valid_rows, batch_size, threads, False
+            ),
+            callbacks=callbacks,
+            verbose=2,
+        )
+        result.update(
+            status="pruned" if trial_id in pruned else "completed",
+            epochs=len(history.history["val_accuracy"]),
+            val_accuracy=float(history.history["val_accuracy"][-1]),
+            val_loss=float(history.history["val_loss"][-1]),
+        )
+    except Exception as e:
+        logger.exception(f"{trial_id} fold {fold} failed: {e}")
+        result.update(status="failed", error=str(e))
+    finally:
+        callbacks[0].close()
+        if config.params_folds > 1:
+            client.set_terminated(
+                run_id, "FAILED" if result["status"] == "failed" else "FINISHED"
+            )
+    return result
+
+
+def summarise(trials: dict, results: list) -> list:
+    """One entry per trial, completed trials first, best first."""
+
+    summary = []
+    for trial_id, params in trials.items():
+        folds = [r for r in results if r["trial"] == trial_id]
+        scores = [r["val_accuracy"] for r in folds if "val_accuracy" in r]
+        statuses = {r["status"] for r in folds}
+        status = next((s for s in ("failed", "pruned") if s in statuses), "completed")
+        summary.append(
+            {
+                "trial": trial_id,
+                "params": params,
+                "status": status,
+                "folds": sorted(folds, key=lambda r: r["fold"]),
+                "mean_val_accuracy": float(np.mean(scores)) if scores else None,
+                "std_val_accuracy": float(np.std(scores)) if scores else None,
+            }
+        )
+    summary.sort(
+        key=lambda t: (t["status"] != "completed", -(t["mean_val_accuracy"] or 0.0))
+    )
+    return summary
+
+
+class Sweep:
+    """Grid or random search over params, optionally cross-validated.
+
+    Images are decoded once into a memory-mapped array shared by every
+    trial process. Each ``(trial, fold)`` trains in a spawned process
+    limited to ``SWEEP_THREADS_PER_TRIAL`` CPU threads; folds of one trial
+    run in order across the pool, so a trial pruned on its first fold never
+    trains the others. Trials are nested MLflow runs under one sweep run
+    (and folds under their trial when ``SWEEP_FOLDS > 1``).
+    """
+
+    def __init__(self, config: SweepConfig):
+        self.config = config
+
+    def _trials(self) -> dict:
+        unknown = set(self.config.params_space) - set(self.config.params_defaults)
+        if unknown:
+            raise ValueError(
+                f"Cannot sweep {sorted(unknown)}, "
+                f"expected some of {sorted(self.config.params_defaults)}"
+            )
+        overrides = expand_trials(
+            self.config.params_space,
+            self.config.params_search,
+            self.config.params_num_trials,
+        )
+        return {
+            f"trial_{i:03d}": {**self.config.params_defaults, **trial}
+            for i, trial in enumerate(overrides)
+        }
+
+    def run(self) -> list:
+        config = self.config
+        manifest = Manifest.load(config.training_data)
+        file_paths, labels = manifest.paths, manifest.labels
+        decode_images(
+            file_paths,
+            manifest.hashes,
+            config.params_image_size,
+            config.decoded_images_file,
+        )
+        folds = fold_indices(labels, config.params_folds)
+        epochs_file = None
+        if config.params_is_augmentation and config.params_augmented_epochs:
+            epochs_file = materialize_epochs(
+                file_paths,
+                manifest.hashes,
+                Augmenter(config.params_augmentations, config.params_image_size),
+                config.params_augmented_epochs,
+                config.augmented_epochs_dir,
+            )
+        trials = self._trials()
+        logger.info(
+            f"Sweeping {len(trials)} trials x {len(folds)} folds "
+            f"on {config.params_workers} workers"
+        )
+
+        client = MlflowClient()
+        with mlflow.start_run(run_name="sweep") as sweep_run:
+            experiment_id = sweep_run.info.experiment_id
+            mlflow.log_params(
+                {
+                    "search": config.params_search,
+                    "num_trials": len(trials),
+                    "folds": config.params_folds,
+                    "prune": config.params_prune,
+                }
+            )
+
+            run_ids = {}
+            for trial_id, params in trials.items():
+                run_ids[trial_id] = client.create_run(
+                    experiment_id,
+                    run_name=trial_id,
+                    tags={MLFLOW_PARENT_RUN_ID: sweep_run.info.run_id},
+                ).info.run_id
+                client.log_batch(
+                    run_ids[trial_id],
+                    params=[Param(k.lower(), str(v)) for k, v in params.items()],
+                )
+
+            context = multiprocessing.get_context("spawn")
+            with context.Manager() as manager:
+                shared = (manager.dict(), manager.Lock(), manager.dict())
+                with ProcessPoolExecutor(
+                    max_workers=config.params_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(config.params_threads_per_trial,),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            run_trial,
+                            {
+                                "config": config,
+                                "trial_id": trial_id,
+                                "fold": fold,
+                                "params": params,
+                                "labels": np.array(labels),
+                                "rows": rows,
+                                "epochs_file": epochs_file,
+                                "run_id": run_ids[trial_id],
+                                "experiment_id": experiment_id,
+                                "tracking_uri": mlflow.get_tracking_uri(),
+                            },
+                            shared,
+                        )
+                        for fold, rows in enumerate(folds)
+                        for trial_id, params in trials.items()
+                    ]
+                    results = [future.result() for future in futures]
+
+            summary = summarise(trials, results)
+            for trial in summary:
+                run_id = run_ids[trial["trial"]]
+                client.set_tag(run_id, "status", trial["status"])
+                if trial["mean_val_accuracy"] is not None:
+                    client.log_metric(
+                        run_id, "mean_val_accuracy", trial["mean_val_accuracy"]
+                    )
+                    client.log_metric(
+                        run_id, "std_val_accuracy", trial["std_val_accuracy"]
+                    )
+                client.set_terminated(
+                    run_id, "FAILED" if trial["status"] == "failed" else "FINISHED"
+                )
+
+            best = summary[0]
+            if best["status"] != "completed":
+                raise RuntimeError("No sweep trial completed, see the logs")
+            logger.info(
+                f"Best trial {best['trial']}: mean val_accuracy "
+                f"{best['mean_val_accuracy']:.4f} with {best['params']}"
+            )
+            mlflow.log_metric("best_val_accuracy", best["mean_val_accuracy"])
+            mlflow.log_params(
+                {f"best_{k.lower()}": v for k, v in best["params"].items()}
+            )
+            save_json(config.results_file, {"best": best, "trials": summary})
+            mlflow.log_artifact(str(config.results_file))
+        return summary
@@ -0,0 +1,74 @@
+import threading
+import zipfile
+import tensorflow as tf
+from pathlib import Path, PurePosixPath
+from cnnClassifier import logger
+from cnnClassifier.components.data_split import SPLIT_SEED, split_samples
+from cnnClassifier.components.manifest import IMAGE_EXTENSIONS
+
+
+class ZipImageDataset:
+    """Stream training images straight out of the downloaded archive.
+
+    Only the central directory is read up front to index member names and
+    their class (the first path component, as the extracted tree would be
+    labelled). Members are read through one ``ZipFile`` handle per worker
+    thread and decoded by the parallel ``tf.data`` map workers.
+    """
+
+    def __init__(self, zip_path: Path, image_size: tuple, batch_size: int):
+        self.zip_path = Path(zip_path)
+        self.image_size = tuple(image_size)
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self.members, self.labels, self.class_names = self._build_index()
+
+    def _build_index(self) -> tuple:
+        with zipfile.ZipFile(self.zip_path) as archive:
+            names = [
+                info.filename
+                for info in archive.infolist()
+                if not info.is_dir()
+                and len(PurePosixPath(info.filename).parts) > 1
+                and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+            ]
+
+        class_names = sorted({PurePosixPath(name).parts[0] for name in names})
+        # class by class, members sorted, like the directory walk
+        names.sort(key=lambda name: (PurePosixPath(name).parts[0], name))
+        labels = [class_names.index(PurePosixPath(n).parts[0]) for n in names]
+
+        logger.info(
+            f"Indexed {len(names)} images belonging to {len(class_names)} classes "
+            f"in {self.zip_path}"
+        )
+        return names, labels, class_names
+
+    def _read_member(self, name: bytes) -> bytes:
+        archive = getattr(self._local, "archive", None)
+        if archive is None:
+            archive = self._local.archive = zipfile.ZipFile(self.zip_path)
+        return archive.read(name.decode("utf-8"))
+
+    def _load(self, name: tf.Tensor, label: tf.Tensor) -> tuple:
+        data = tf.numpy_function(self._read_member, [name], tf.string)
+        image = tf.io.decode_image(
+            tf.reshape(data, []), channels=self.image_size[-1], expand_animations=False
+        )
+        image = tf.image.resize(image, self.image_size[:2])
+        return image, tf.one_hot(label, len(self.class_names))
+
+    def dataset(self, subset: str) -> tf.data.Dataset:
+        """Return batched ``(image, one_hot_label)`` pairs for one subset with
+        pixel values in [0, 255], matching ``directory_split``."""
+
+        members, labels = split_samples(self.members, self.labels, subset)
+        dataset = tf.data.Dataset.from_tensor_slices((members, labels))
+        if subset == "training":
+            dataset = dataset.shuffle(len(members), seed=SPLIT_SEED)
+        dataset = dataset.map(
+            self._load,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=(subset != "training"),
+        )
+        return dataset.batch(self.batch_size)
@@ -2,8 +2,19 @@ from cnnClassifier.constants import CONFIG_FILE_PATH, PARAMS_FILE_PATH
 from cnnClassifier.utils.common import read_yaml, create_directories
 from cnnClassifier.entity.config_entity import (
     DataIngestionConfig,
+    DataShardingConfig,
+    AugmentationConfig,
     BaseModelConfig,
     TrainingConfig,
+    PredictionConfig,
+    EvaluationConfig,
+    ModelExportConfig,
+    DistillationConfig,
+    SweepConfig,
+    BatchScoringConfig,
+    ServingConfig,
+    StageRunnerConfig,
+    ProfilingConfig,
     DagshubConfig,
 )
 from pathlib import Path
@@ -28,8 +39,48 @@ class ConfigurationManager:
         return DataIngestionConfig(
             root_dir=Path(config.root_dir),
             source_url=config.source_url,
+            source_sha256=config.source_sha256,
             local_data_file=Path(config.local_data_file),
             unzip_dir=Path(config.unzip_dir),
+            manifest_workers=config.manifest_workers,
+            quarantine_dir=Path(config.quarantine_dir),
+            validation_report=Path(config.validation_report),
+            validation_workers=config.validation_workers,
+            download_workers=config.download_workers,
+            download_chunk_size=config.download_chunk_size_mb * 1024 * 1024,
+            params_read_from_zip=self.params.READ_FROM_ZIP,
+        )
+
+    def get_data_sharding_config(self) -> DataShardingConfig:
+        config = self.config.data_sharding
+        params = self.params
+
+        create_directories(config.root_dir)
+
+        return DataShardingConfig(
+            root_dir=Path(config.root_dir),
+            source_dir=Path(self.config.data_ingestion.unzip_dir),
+            shards_dir=Path(config.shards_dir),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_num_shards=params.NUM_SHARDS,
+            params_use_shards=params.USE_SHARDS,
+        )
+
+    def get_augmentation_config(self) -> AugmentationConfig:
+        config = self.config.augmentation
+        params = self.params
+
+        create_directories(config.root_dir)
+
+        return AugmentationConfig(
+            root_dir=Path(config.root_dir),
+            training_data=Path(self.config.data_ingestion.unzip_dir),
+            epochs_dir=Path(config.epochs_dir),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_is_augmentation=params.AUGMENTATION,
+            params_augmentations=[dict(spec) for spec in params.AUGMENTATIONS],
+            params_augmented_epochs=params.AUGMENTED_EPOCHS,
+            params_read_from_zip=params.READ_FROM_ZIP,
         )
 
     def get_base_model_config(self) -> BaseModelConfig:
@@ -47,6 +98,11 @@ class ConfigurationManager:
             params_include_top=params.INCLUDE_TOP,
             params_weights=params.WEIGHTS,
             params_classes=params.CLASSES,
+            params_precision=params.PRECISION,
+            params_jit_compile=params.JIT_COMPILE,
+            params_head=params.HEAD,
+            params_head_units=params.HEAD_UNITS,
+            params_head_dropout=params.HEAD_DROPOUT,
         )
 
     def get_training_config(self) -> TrainingConfig:
@@ -61,10 +117,186 @@ class ConfigurationManager:
             trained_model_path=Path(training.trained_model_path),
             updated_base_model_path=Path(base_model.updated_base_model_path),
             training_data=Path(self.config.data_ingestion.unzip_dir),
+            local_data_file=Path(self.config.data_ingestion.local_data_file),
+            feature_cache_dir=Path(training.feature_cache_dir),
+            shards_dir=Path(self.config.data_sharding.shards_dir),
+            augmented_epochs_dir=Path(self.config.augmentation.epochs_dir),
+            checkpoint_dir=Path(training.checkpoint_dir),
             params_epochs=params.EPOCHS,
             params_batch_size=params.BATCH_SIZE,
             params_is_augmentation=params.AUGMENTATION,
+            params_augmentations=[dict(spec) for spec in params.AUGMENTATIONS],
+            params_augmented_epochs=params.AUGMENTED_EPOCHS,
             params_image_size=tuple(params.IMAGE_SIZE),
+            params_cache_features=params.CACHE_FEATURES,
+            params_use_shards=params.USE_SHARDS,
+            params_cache_dataset=params.CACHE_DATASET,
+            params_read_from_zip=params.READ_FROM_ZIP,
+            params_precision=params.PRECISION,
+            params_jit_compile=params.JIT_COMPILE,
+            params_distribution=params.DISTRIBUTION,
+            params_num_cpu_devices=params.NUM_CPU_DEVICES,
+            params_checkpoint_every=params.CHECKPOINT_EVERY,
+            params_early_stopping_patience=params.EARLY_STOPPING_PATIENCE,
+        )
+
+    def get_prediction_config(self) -> PredictionConfig:
+        prediction = self.config.prediction
+        params = self.params
+
+        return PredictionConfig(
+            trained_model_path=Path(self.config.training.trained_model_path),
+            class_names=list(prediction.class_names),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_batch_size=params.PREDICTION_BATCH_SIZE,
+        )
+
+    def get_evaluation_config(self) -> EvaluationConfig:
+        evaluation = self.config.evaluation
+        params = self.params
+
+        create_directories(evaluation.root_dir)
+
+        return EvaluationConfig(
+            root_dir=Path(evaluation.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            training_data=Path(self.config.data_ingestion.unzip_dir),
+            local_data_file=Path(self.config.data_ingestion.local_data_file),
+            scores_file=Path(evaluation.scores_file),
+            data_dir=Path(evaluation.data_dir) if evaluation.data_dir else None,
+            class_names=list(self.config.prediction.class_names),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_batch_size=params.EVALUATION_BATCH_SIZE,
+            params_read_from_zip=params.READ_FROM_ZIP,
+        )
+
+    def get_model_export_config(self) -> ModelExportConfig:
+        export = self.config.model_export
+        params = self.params
+
+        create_directories(export.root_dir)
+
+        return ModelExportConfig(
+            root_dir=Path(export.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            training_data=Path(self.config.data_ingestion.unzip_dir),
+            local_data_file=Path(self.config.data_ingestion.local_data_file),
+            dynamic_range_model_path=Path(export.dynamic_range_model_path),
+            int8_model_path=Path(export.int8_model_path),
+            report_file=Path(export.report_file),
+            serving_model_dir=Path(export.serving_model_dir),
+            latency_runs=export.latency_runs,
+            class_names=list(self.config.prediction.class_names),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_batch_size=params.BATCH_SIZE,
+            params_calibration_samples=params.EXPORT_CALIBRATION_SAMPLES,
+            params_read_from_zip=params.READ_FROM_ZIP,
+        )
+
+    def get_distillation_config(self) -> DistillationConfig:
+        distillation = self.config.distillation
+        params = self.params
+
+        create_directories(distillation.root_dir)
+
+        return DistillationConfig(
+            root_dir=Path(distillation.root_dir),
+            teacher_model_path=Path(self.config.training.trained_model_path),
+            student_model_path=Path(distillation.student_model_path),
+            teacher_cache_dir=Path(distillation.teacher_cache_dir),
+            report_file=Path(distillation.report_file),
+            training_data=Path(self.config.data_ingestion.unzip_dir),
+            latency_runs=distillation.latency_runs,
+            class_names=list(self.config.prediction.class_names),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_batch_size=params.BATCH_SIZE,
+            params_distill=params.DISTILL,
+            params_student=params.STUDENT,
+            params_epochs=params.DISTILL_EPOCHS,
+            params_learning_rate=params.DISTILL_LEARNING_RATE,
+            params_temperature=params.DISTILL_TEMPERATURE,
+            params_alpha=params.DISTILL_ALPHA,
+            params_read_from_zip=params.READ_FROM_ZIP,
+        )
+
+    def get_sweep_config(self) -> SweepConfig:
+        sweep = self.config.sweep
+        params = self.params
+
+        create_directories(sweep.root_dir)
+
+        return SweepConfig(
+            root_dir=Path(sweep.root_dir),
+            base_model_path=Path(self.config.base_model.base_model_path),
+            training_data=Path(self.config.data_ingestion.unzip_dir),
+            decoded_images_file=Path(sweep.decoded_images_file),
+            results_file=Path(sweep.results_file),
+            augmented_epochs_dir=Path(self.config.augmentation.epochs_dir),
+            params_image_size=tuple(params.IMAGE_SIZE),
+            params_classes=params.CLASSES,
+            params_precision=params.PRECISION,
+            params_jit_compile=params.JIT_COMPILE,
+            params_defaults={
+                "LEARNING_RATE": params.LEARNING_RATE,
+                "BATCH_SIZE": params.BATCH_SIZE,
+                "EPOCHS": params.EPOCHS,
+                "HEAD": params.HEAD,
+                "HEAD_UNITS": params.HEAD_UNITS,
+                "HEAD_DROPOUT": params.HEAD_DROPOUT,
+            },
+            params_is_augmentation=params.AUGMENTATION,
+            params_augmentations=[dict(spec) for spec in params.AUGMENTATIONS],
+            params_augmented_epochs=params.AUGMENTED_EPOCHS,
+            params_search=params.SWEEP_SEARCH,
+            params_space={
+                name: list(values) for name, values in params.SWEEP_SPACE.items()
+            },
+            params_num_trials=params.SWEEP_NUM_TRIALS,
+            params_folds=params.SWEEP_FOLDS,
+            params_workers=params.SWEEP_WORKERS,
+            params_threads_per_trial=params.SWEEP_THREADS_PER_TRIAL,
+            params_prune=params.SWEEP_PRUNE,
+        )
+
+    def get_batch_scoring_config(self) -> BatchScoringConfig:
+        training_config = self.get_training_config()
+
+        return BatchScoringConfig(
+            trained_model_path=training_config.trained_model_path,
+            class_names=list(self.config.prediction.class_names),
+            params_image_size=training_config.params_image_size,
+            params_batch_size=self.params.SCORING_BATCH_SIZE,
+            params_workers=self.params.SCORING_WORKERS,
+        )
+
+    def get_serving_config(self) -> ServingConfig:
+        serving = self.config.serving
+
+        return ServingConfig(
+            host=serving.host,
+            port=serving.port,
+            max_batch_size=serving.max_batch_size,
+            max_wait_ms=serving.max_wait_ms,
+            max_queue_size=serving.max_queue_size,
+            model_dir=Path(serving.model_dir),
+        )
+
+    def get_stage_runner_config(self) -> StageRunnerConfig:
+        config = self.config.stage_runner
+
+        create_directories(config.root_dir)
+
+        return StageRunnerConfig(root_dir=Path(config.root_dir))
+
+    def get_profiling_config(self) -> ProfilingConfig:
+        config = self.config.profiling
+
+        create_directories(config.root_dir)
+
+        return ProfilingConfig(
+            root_dir=Path(config.root_dir),
+            report_file=Path(config.report_file),
+            trace_dir=Path(config.trace_dir),
         )
 
     def get_dagshub_config(self) -> DagshubConfig:
@@ -6,8 +6,38 @@ from pathlib import Path
 class DataIngestionConfig:
     root_dir: Path
     source_url: str
+    source_sha256: str
     local_data_file: Path
     unzip_dir: Path
+    manifest_workers: int
+    quarantine_dir: Path
+    validation_report: Path
+    validation_workers: int
+    download_workers: int
+    download_chunk_size: int
+    params_read_from_zip: bool
+
+
+@dataclass(frozen=True)
+class DataShardingConfig:
+    root_dir: Path
+    source_dir: Path
+    shards_dir: Path
+    params_image_size: tuple
+    params_num_shards: int
+    params_use_shards: bool
+
+
+@dataclass(frozen=True)
+class AugmentationConfig:
+    root_dir: Path
+    training_data: Path
+    epochs_dir: Path
+    params_image_size: tuple
+    params_is_augmentation: bool
+    params_augmentations: list
+    params_augmented_epochs: int
+    params_read_from_zip: bool
 
 
 @dataclass(frozen=True)
@@ -20,6 +50,11 @@ class BaseModelConfig:
     params_include_top: bool
     params_weights: str
     params_classes: int
+    params_precision: str
+    params_jit_compile: bool
+    params_head: str
+    params_head_units: int
+    params_head_dropout: float
 
 
 @dataclass(frozen=True)
@@ -28,10 +63,144 @@ class TrainingConfig:
     trained_model_path: Path
     updated_base_model_path: Path
     training_data: Path
+    local_data_file: Path
+    feature_cache_dir: Path
+    shards_dir: Path
+    augmented_epochs_dir: Path
+    checkpoint_dir: Path
     params_epochs: int
     params_batch_size: int
     params_is_augmentation: bool
+    params_augmentations: list
+    params_augmented_epochs: int
+    params_image_size: tuple
+    params_cache_features: bool
+    params_use_shards: bool
+    params_cache_dataset: bool
+    params_read_from_zip: bool
+    params_precision: str
+    params_jit_compile: bool
+    params_distribution: str
+    params_num_cpu_devices: int
+    params_checkpoint_every: int
+    params_early_stopping_patience: int
+
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    trained_model_path: Path
+    class_names: list
+    params_image_size: tuple
+    params_batch_size: int
+
+
+@dataclass(frozen=True)
+class EvaluationConfig:
+    root_dir: Path
+    trained_model_path: Path
+    training_data: Path
+    local_data_file: Path
+    scores_file: Path
+    data_dir: Path
+    class_names: list
+    params_image_size: tuple
+    params_batch_size: int
+    params_read_from_zip: bool
+
+
+@dataclass(frozen=True)
+class ModelExportConfig:
+    root_dir: Path
+    trained_model_path: Path
+    training_data: Path
+    local_data_file: Path
+    dynamic_range_model_path: Path
+    int8_model_path: Path
+    report_file: Path
+    serving_model_dir: Path
+    latency_runs: int
+    class_names: list
+    params_image_size: tuple
+    params_batch_size: int
+    params_calibration_samples: int
+    params_read_from_zip: bool
+
+
+@dataclass(frozen=True)
+class DistillationConfig:
+    root_dir: Path
+    teacher_model_path: Path
+    student_model_path: Path
+    teacher_cache_dir: Path
+    report_file: Path
+    training_data: Path
+    latency_runs: int
+    class_names: list
+    params_image_size: tuple
+    params_batch_size: int
+    params_distill: bool
+    params_student: str
+    params_epochs: int
+    params_learning_rate: float
+    params_temperature: float
+    params_alpha: float
+    params_read_from_zip: bool
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    root_dir: Path
+    base_model_path: Path
+    training_data: Path
+    decoded_images_file: Path
+    results_file: Path
+    augmented_epochs_dir: Path
+    params_image_size: tuple
+    params_classes: int
+    params_precision: str
+    params_jit_compile: bool
+    params_defaults: dict
+    params_is_augmentation: bool
+    params_augmentations: list
+    params_augmented_epochs: int
+    params_search: str
+    params_space: dict
+    params_num_trials: int
+    params_folds: int
+    params_workers: int
+    params_threads_per_trial: int
+    params_prune: bool
+
+
+@dataclass(frozen=True)
+class BatchScoringConfig:
+    trained_model_path: Path
+    class_names: list
     params_image_size: tuple
+    params_batch_size: int
+    params_workers: int
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    host: str
+    port: int
+    max_batch_size: int
+    max_wait_ms: float
+    max_queue_size: int
+    model_dir: Path
+
+
+@dataclass(frozen=True)
+class StageRunnerConfig:
+    root_dir: Path
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    root_dir: Path
+    report_file: Path
+    trace_dir: Path
 
 
 @dataclass(frozen=True)
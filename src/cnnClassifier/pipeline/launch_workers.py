@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from cnnClassifier import logger
+from cnnClassifier.components.distribution import local_cluster
+
+TRAINING_COMMAND = [
+    sys.executable,
+    "-m",
+    "cnnClassifier.pipeline.stage_3_model_training",
+]
+
+
+def launch_local_workers(
+    command: list, num_workers: int, env: dict = None, timeout: float = None
+) -> list:
+    """Run ``command`` once per worker of a localhost cluster, each process
+    with its own ``TF_CONFIG``, and return their exit codes.
+
+    Worker 0 is the chief: the only one that logs to MLflow and saves.
+    """
+
+    processes = []
+    for tf_config in local_cluster(num_workers):
+        worker_env = dict(os.environ if env is None else env)
+        worker_env["TF_CONFIG"] = json.dumps(tf_config)
+        processes.append(subprocess.Popen(command, env=worker_env))
+
+    try:
+        return [process.wait(timeout=timeout) for process in processes]
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train with DISTRIBUTION: multi_worker on a localhost cluster."
+    )
+    parser.add_argument("--num-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    exit_codes = launch_local_workers(TRAINING_COMMAND, args.num_workers)
+    logger.info(f"Worker exit codes: {exit_codes}")
+    if any(exit_codes):
+        sys.exit(1)
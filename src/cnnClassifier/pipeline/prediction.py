@@ -0,0 +1,171 @@
+import os
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.entity.config_entity import PredictionConfig
+
+
+class PredictionPipeline:
+    """Long-lived predictor: the trained model is loaded and traced once,
+    then every call reuses it."""
+
+    def __init__(self, config: PredictionConfig = None):
+        if config is None:
+            config = ConfigurationManager().get_prediction_config()
+
+        self.config = config
+        self.batch_size = config.params_batch_size
+        self.image_size = tuple(config.params_image_size)
+
+        logger.info(f"Loading trained model from {config.trained_model_path}")
+        self.model = self._load_model(config.trained_model_path)
+        self.warm_up()
+
+    def _load_model(self, path: Path):
+        return tf.keras.models.load_model(path)
+
+    def _predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        return self.model.predict(batch, batch_size=self.batch_size, verbose=0)
+
+    def warm_up(self) -> None:
+        """Run one dummy batch so the predict graph is traced before the first
+        real request arrives."""
+
+        dummy = np.zeros((self.batch_size, *self.image_size), dtype=np.float32)
+        self._predict_batch(dummy)
+        logger.info(f"Prediction model warmed up with batch size {self.batch_size}")
+
+    def load_image(self, image) -> np.ndarray:
+        """Load a path, raw encoded bytes or pixel array as a float32 array in
+        the [0, 255] range with the configured image size. Every input type
+        is resized bilinearly, like the training data."""
+
+        height, width = self.image_size[:2]
+
+        if isinstance(image, (str, Path)):
+            image = tf.io.read_file(str(image)).numpy()
+
+        if isinstance(image, bytes):
+            image = tf.io.decode_image(
+                image, channels=self.image_size[-1], expand_animations=False
+            )
+
+        array = np.asarray(image, dtype=np.float32)
+        if array.shape[:2] != (height, width):
+            array = tf.image.resize(array, (height, width)).numpy()
+        return array
+
+    def _as_list(self, images) -> list:
+        if isinstance(images, (str, Path, bytes)):
+            return [images]
+        if isinstance(images, np.ndarray) and images.ndim == len(self.image_size):
+            return [images]
+        return list(images)
+
+    def predict_proba(self, images) -> np.ndarray:
+        """Return class probabilities for a single image or a list of images.
+
+        Inputs are padded up to a multiple of the batch size so the model
+        always sees the fixed batch shape it was warmed up with.
+        """
+
+        images = self._as_list(images)
+        if not images:
+            return np.empty((0, len(self.config.class_names)), dtype=np.float32)
+
+        batch = np.stack([self.load_image(image) for image in images]) / 255.0
+
+        num_images = len(batch)
+        padding = -num_images % self.batch_size
+        if padding:
+            batch = np.concatenate(
+                [batch, np.zeros((padding, *batch.shape[1:]), dtype=batch.dtype)]
+            )
+
+        probabilities = self._predict_batch(batch)
+        return probabilities[:num_images]
+
+    def predict(self, images) -> list:
+        """Return the predicted class name and its confidence for each image."""
+
+        probabilities = self.predict_proba(images)
+        return [
+            {
+                "class": self.config.class_names[int(np.argmax(p))],
+                "confidence": float(np.max(p)),
+            }
+            for p in probabilities
+        ]
+
+
+class MappedPredictionPipeline(PredictionPipeline):
+    """``PredictionPipeline`` backed by a memory-mapped serving model.
+
+    ``config.trained_model_path`` points at the directory written by
+    ``save_serving_model``. The weights are read in place from the mapped
+    file, so loading is fast and workers serving the same file share its
+    memory.
+    """
+
+    def _load_model(self, path: Path):
+        from cnnClassifier.components.serving_artifact import MappedModel
+
+        return MappedModel(path)
+
+    def _predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        outputs = [
+            self.model.predict_on_batch(batch[start : start + self.batch_size])
+            for start in range(0, len(batch), self.batch_size)
+        ]
+        return np.concatenate(outputs).astype(np.float32)
+
+
+class TFLitePredictionPipeline(PredictionPipeline):
+    """``PredictionPipeline`` backed by an exported ``.tflite`` model.
+
+    ``config.trained_model_path`` points at the TFLite file. Float,
+    dynamic-range and full-integer models are supported; integer inputs and
+    outputs are (de)quantized with the scale and zero point stored in the
+    model.
+    """
+
+    def _load_model(self, path: Path):
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            Interpreter = tf.lite.Interpreter
+
+        interpreter = Interpreter(model_path=str(path), num_threads=os.cpu_count())
+        self.input_details = interpreter.get_input_details()[0]
+        self.output_details = interpreter.get_output_details()[0]
+        interpreter.resize_tensor_input(
+            self.input_details["index"], [self.batch_size, *self.image_size]
+        )
+        interpreter.allocate_tensors()
+        return interpreter
+
+    def _predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        input_dtype = self.input_details["dtype"]
+        if np.issubdtype(input_dtype, np.integer):
+            scale, zero_point = self.input_details["quantization"]
+            limits = np.iinfo(input_dtype)
+            batch = np.clip(
+                np.round(batch / scale + zero_point), limits.min, limits.max
+            )
+
+        outputs = []
+        for start in range(0, len(batch), self.batch_size):
+            self.model.set_tensor(
+                self.input_details["index"],
+                batch[start : start + self.batch_size].astype(input_dtype),
+            )
+            self.model.invoke()
+            outputs.append(self.model.get_tensor(self.output_details["index"]))
+        probabilities = np.concatenate(outputs)
+
+        if np.issubdtype(self.output_details["dtype"], np.integer):
+            scale, zero_point = self.output_details["quantization"]
+            probabilities = (probabilities.astype(np.float32) - zero_point) * scale
+        return probabilities.astype(np.float32)
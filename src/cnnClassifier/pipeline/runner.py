@@ -0,0 +1,176 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from pathlib import Path
+from cnnClassifier import logger
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.components.artifact_context import ArtifactContext
+from cnnClassifier.components.manifest import manifest_path
+from cnnClassifier.utils.profiling import span
+
+# names the manifest of the image tree at the config key that follows
+MANIFEST_PREFIX = "manifest:"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage and everything its result depends on.
+
+    ``inputs`` and ``outputs`` are dotted keys into config.yaml
+    (e.g. ``"base_model.updated_base_model_path"``) naming artifact paths.
+    ``"manifest:<key>"`` names the manifest stored next to the image tree
+    at ``<key>``. ``enabled_by`` is the params.yaml switch of an optional
+    stage: while it is false the stage writes nothing, so its outputs are
+    not required.
+    """
+
+    name: str
+    pipeline: type
+    config_sections: tuple = ()
+    params: tuple = ()
+    inputs: tuple = ()
+    outputs: tuple = ()
+    enabled_by: str = None
+
+
+def _path_digest(path: Path) -> list:
+    """Cheap change detector for an artifact: size and mtime of the file, or
+    of every file below a directory."""
+
+    if not path.exists():
+        return ["missing"]
+    if path.is_file():
+        stat = path.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    entries = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = Path(root) / name
+            stat = file_path.stat()
+            entries.append(
+                [file_path.relative_to(path).as_posix(), stat.st_size, stat.st_mtime_ns]
+            )
+    return entries
+
+
+class StageRunner:
+    """Run stages in order, skipping those whose fingerprint is unchanged.
+
+    A stage fingerprint hashes its config sections, params and the state of
+    its upstream artifacts. It is stored after the stage succeeds, so a
+    failed or interrupted stage always runs again. When the stages share an
+    ``ArtifactContext``, fingerprints are taken once its background saves
+    have landed.
+    """
+
+    def __init__(
+        self,
+        stages: list,
+        config_manager: ConfigurationManager,
+        context: ArtifactContext = None,
+    ):
+        self.stages = stages
+        self.config_manager = config_manager
+        self.context = context
+        self.fingerprints_dir = Path(config_manager.get_stage_runner_config().root_dir)
+
+    def _config_path(self, key: str) -> Path:
+        if key.startswith(MANIFEST_PREFIX):
+            return manifest_path(self._config_path(key[len(MANIFEST_PREFIX) :]))
+        value = self.config_manager.config
+        for part in key.split("."):
+            value = value[part]
+        return Path(value)
+
+    def fingerprint(self, stage: Stage) -> str:
+        config = self.config_manager.config
+        params = self.config_manager.params
+        state = {
+            "config": {
+                section: config.get(section) for section in stage.config_sections
+            },
+            "params": {key: params.get(key) for key in stage.params},
+            "inputs": {
+                key: _path_digest(self._config_path(key)) for key in stage.inputs
+            },
+        }
+        payload = json.dumps(state, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _fingerprint_path(self, stage: Stage) -> Path:
+        return self.fingerprints_dir / f"{stage.name.lower().replace(' ', '_')}.json"
+
+    def is_up_to_date(self, stage: Stage, fingerprint: str) -> bool:
+        path = self._fingerprint_path(stage)
+        if not path.exists():
+            return False
+        with open(path) as f:
+            stored = json.load(f)
+        outputs = stage.outputs
+        if stage.enabled_by and not self.config_manager.params.get(stage.enabled_by):
+            outputs = ()
+        outputs_exist = all(self._config_path(key).exists() for key in outputs)
+        return stored.get("fingerprint") == fingerprint and outputs_exist
+
+    def _store(self, stage: Stage, fingerprint: str) -> None:
+        os.makedirs(self.fingerprints_dir, exist_ok=True)
+        with open(self._fingerprint_path(stage), "w") as f:
+            json.dump(
+                {
+                    "stage": stage.name,
+                    "fingerprint": fingerprint,
+                    "completed_at": datetime.now(timezone.utc).isoformat(),
+                },
+                f,
+                indent=4,
+            )
+
+    def run(self, force: bool = False, from_stage: str = None) -> list:
+        """Run the pipeline and return the names of the stages that ran."""
+
+        names = [stage.name for stage in self.stages]
+        if from_stage is not None and from_stage not in names:
+            raise ValueError(f"Unknown stage '{from_stage}', expected one of {names}")
+
+        executed = []
+        produced = set()
+        try:
+            for stage in self.stages:
+                if stage.name == from_stage:
+                    force = True
+
+                # an input rewritten in this run may still be saving
+                stale = produced.intersection(stage.inputs)
+                if (
+                    not force
+                    and not stale
+                    and self.is_up_to_date(stage, self.fingerprint(stage))
+                ):
+                    logger.info(
+                        f"*********** {stage.name} up to date, skipping ***********"
+                    )
+                    continue
+
+                try:
+                    logger.info(f"*********** {stage.name} started ***********")
+                    logger.info(f"Stage name: {stage.name}")
+                    with span(stage.name):
+                        stage.pipeline().main()
+                    logger.info(f"*********** {stage.name} completed ***********")
+                except Exception as e:
+                    logger.exception(f"{stage.name} pipeline failed: {e}")
+                    raise
+
+                executed.append(stage)
+                produced.update(stage.outputs)
+        finally:
+            if self.context:
+                self.context.wait()
+            for stage in executed:
+                self._store(stage, self.fingerprint(stage))
+
+        return [stage.name for stage in executed]
@@ -0,0 +1,27 @@
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+
+STAGE_NAME = "Augmentation stage"
+
+
+class AugmentationPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        from cnnClassifier.components.augmentation import Augmentation
+
+        config_manager = ConfigurationManager()
+        augmentation = Augmentation(config=config_manager.get_augmentation_config())
+        augmentation.materialize()
+
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        pipeline = AugmentationPipeline()
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Augmentation pipeline failed: {e}")
+        raise
@@ -1,6 +1,7 @@
 from cnnClassifier.config.configuration import ConfigurationManager
 from cnnClassifier.components.data_ingestion import DataIngestion
 from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
 
 STAGE_NAME = "Data Ingestion stage"
 
@@ -13,8 +14,14 @@ class DataIngestionTrainingPipeline:
         config_manager = ConfigurationManager()
         data_ingestion_config = config_manager.get_data_ingestion_config()
         data_ingestion = DataIngestion(config=data_ingestion_config)
-        data_ingestion.download_file()
-        data_ingestion.extract_zip_file()
+        with span("download_file"):
+            data_ingestion.download_file()
+        with span("extract_zip_file"):
+            data_ingestion.extract_zip_file()
+        with span("build_manifest"):
+            data_ingestion.build_manifest()
+        with span("validate_images"):
+            data_ingestion.validate_images()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
+
+STAGE_NAME = "Data sharding stage"
+
+
+class DataShardingPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        config_manager = ConfigurationManager()
+        data_sharding_config = config_manager.get_data_sharding_config()
+        if not data_sharding_config.params_use_shards:
+            logger.info("USE_SHARDS is disabled, skipping data sharding")
+            return
+        from cnnClassifier.components.data_sharding import DataSharding
+
+        data_sharding = DataSharding(config=data_sharding_config)
+        with span("write_shards"):
+            data_sharding.write_shards()
+
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        pipeline = DataShardingPipeline()
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Data sharding pipeline failed: {e}")
+        raise
@@ -1,20 +1,25 @@
 from cnnClassifier.config.configuration import ConfigurationManager
-from cnnClassifier.components.base_model import BaseModel
+from cnnClassifier.components.artifact_context import ArtifactContext
 from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
 
 STAGE_NAME = "Prepare base model"
 
 
 class PrepareBaseModelTrainingPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, context: ArtifactContext = None):
+        self.context = context
 
     def main(self):
+        from cnnClassifier.components.base_model import BaseModel
+
         config_manager = ConfigurationManager()
         base_model_config = config_manager.get_base_model_config()
-        base_model = BaseModel(config=base_model_config)
-        base_model.get_base_model()
-        base_model.update_base_model()
+        base_model = BaseModel(config=base_model_config, context=self.context)
+        with span("get_base_model"):
+            base_model.get_base_model()
+        with span("update_base_model"):
+            base_model.update_base_model()
 
 
 if __name__ == "__main__":
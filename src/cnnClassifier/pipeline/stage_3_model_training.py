@@ -1,24 +1,26 @@
-from cnnClassifier.config.configuration import (
-    ConfigurationManager,
-    DagshubConfig,
-    BaseModelConfig,
-)
-from cnnClassifier.components.model_training import Training
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.components.artifact_context import ArtifactContext
 from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
 from cnnClassifier.global_flags import DAGSHUB_INITIALIZED
-import dagshub
 
 STAGE_NAME = "Training"
 
 
 class ModelTrainingPipeline:
-    def __init__(self, dagshub_config):
+    def __init__(self, dagshub_config, context: ArtifactContext = None):
         self.dagshub_config = dagshub_config
+        self.context = context
 
     def main(self):
         global DAGSHUB_INITIALIZED
+        from cnnClassifier.components.model_training import Training
+        from cnnClassifier.components.distribution import is_chief
+
+        # only the chief of a multi-worker cluster logs to MLflow
+        if self.dagshub_config and not DAGSHUB_INITIALIZED and is_chief():
+            import dagshub
 
-        if self.dagshub_config and not DAGSHUB_INITIALIZED:
             dagshub.init(
                 repo_owner=self.dagshub_config.repo_owner,
                 repo_name=self.dagshub_config.repo_name,
@@ -29,17 +31,27 @@ class ModelTrainingPipeline:
         config = ConfigurationManager()
         training_config = config.get_training_config()
         base_model_config = config.get_base_model_config()
-        training = Training(training_config, base_model_config)
-        training.get_base_model()
-        training.train_valid_generator()
-        training.train()
+        training = Training(training_config, base_model_config, self.context)
+        with span("get_base_model"):
+            training.get_base_model()
+        with span("train_valid_generator"):
+            training.train_valid_generator()
+        with span("train"):
+            training.train()
 
 
 if __name__ == "__main__":
     try:
         logger.info(f"*********** {STAGE_NAME} started ***********")
-        dagshub_config = DagshubConfig()
-        pipeline = ModelTrainingPipeline(dagshub_config)
+        config = ConfigurationManager()
+        dagshub_config = config.get_dagshub_config()
+        if config.params.DISTRIBUTION == "mirrored":
+            from cnnClassifier.components.distribution import configure_cpu_devices
+
+            configure_cpu_devices(config.params.NUM_CPU_DEVICES)
+        pipeline = ModelTrainingPipeline(
+            dagshub_config if dagshub_config.mlflow else None
+        )
         pipeline.main()
         logger.info(f"*********** {STAGE_NAME} completed ***********")
     except Exception as e:
@@ -0,0 +1,52 @@
+import argparse
+from dataclasses import replace
+from pathlib import Path
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
+
+STAGE_NAME = "Model evaluation stage"
+
+
+class ModelEvaluationPipeline:
+    def __init__(self, data_dir: Path = None):
+        self.data_dir = data_dir
+
+    def main(self):
+        from cnnClassifier.components.model_evaluation import Evaluation
+
+        config_manager = ConfigurationManager()
+        evaluation_config = config_manager.get_evaluation_config()
+        if self.data_dir is not None:
+            evaluation_config = replace(evaluation_config, data_dir=self.data_dir)
+        evaluation = Evaluation(config=evaluation_config)
+        with span("evaluate"):
+            scores = evaluation.evaluate()
+        evaluation.log_into_mlflow(scores)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score the trained model.")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="labelled image tree to evaluate instead of the validation split",
+    )
+    args = parser.parse_args()
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        dagshub_config = ConfigurationManager().get_dagshub_config()
+        if dagshub_config.mlflow:
+            import dagshub
+
+            dagshub.init(
+                repo_owner=dagshub_config.repo_owner,
+                repo_name=dagshub_config.repo_name,
+                mlflow=True,
+            )
+        pipeline = ModelEvaluationPipeline(data_dir=args.data_dir)
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Model evaluation pipeline failed: {e}")
+        raise
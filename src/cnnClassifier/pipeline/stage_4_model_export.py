@@ -0,0 +1,32 @@
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
+
+STAGE_NAME = "Model export stage"
+
+
+class ModelExportPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        from cnnClassifier.components.model_export import ModelExport
+
+        config_manager = ConfigurationManager()
+        model_export_config = config_manager.get_model_export_config()
+        model_export = ModelExport(config=model_export_config)
+        with span("export"):
+            model_export.export()
+        with span("evaluate"):
+            model_export.evaluate()
+
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        pipeline = ModelExportPipeline()
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Model export pipeline failed: {e}")
+        raise
@@ -0,0 +1,36 @@
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+from cnnClassifier.utils.profiling import span
+
+STAGE_NAME = "Distillation stage"
+
+
+class DistillationPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        config_manager = ConfigurationManager()
+        distillation_config = config_manager.get_distillation_config()
+        if not distillation_config.params_distill:
+            logger.info("DISTILL is disabled, skipping distillation")
+            return
+
+        from cnnClassifier.components.distillation import Distillation
+
+        distillation = Distillation(config=distillation_config)
+        with span("train"):
+            distillation.train()
+        with span("evaluate"):
+            distillation.evaluate()
+
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        pipeline = DistillationPipeline()
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Distillation pipeline failed: {e}")
+        raise
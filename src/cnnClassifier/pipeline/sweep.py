@@ -0,0 +1,36 @@
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.utils.common import logger
+
+STAGE_NAME = "Hyperparameter sweep"
+
+
+class SweepPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        from cnnClassifier.components.sweep import Sweep
+
+        config_manager = ConfigurationManager()
+        sweep = Sweep(config=config_manager.get_sweep_config())
+        sweep.run()
+
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"*********** {STAGE_NAME} started ***********")
+        dagshub_config = ConfigurationManager().get_dagshub_config()
+        if dagshub_config.mlflow:
+            import dagshub
+
+            dagshub.init(
+                repo_owner=dagshub_config.repo_owner,
+                repo_name=dagshub_config.repo_name,
+                mlflow=True,
+            )
+        pipeline = SweepPipeline()
+        pipeline.main()
+        logger.info(f"*********** {STAGE_NAME} completed ***********")
+    except Exception as e:
+        logger.exception(f"Sweep pipeline failed: {e}")
+        raise
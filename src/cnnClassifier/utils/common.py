@@ -1,8 +1,8 @@
 import os
 import yaml
 import json
-import joblib
 import base64
+import hashlib
 from box import ConfigBox
 from box.exceptions import BoxValueError
 from beartype import beartype
@@ -10,7 +10,6 @@ from pathlib import Path
 from beartype.typing import Any, Union, Annotated, Sequence
 from cnnClassifier import logger
 
-
 NonEmptyStr = Annotated[str, lambda s: s.strip() != ""]
 NonEmptyPath = Annotated[Path, lambda p: str(p).strip() != ""]
 
@@ -101,6 +100,8 @@ def save_bin(data: Any, path: NonEmptyPath) -> None:
         path (Path): Path to binary file.
     """
 
+    import joblib
+
     joblib.dump(data, path)
     logger.info(f"Binary file saved at: {path}")
 
@@ -116,6 +117,8 @@ def load_bin(path: NonEmptyPath) -> Any:
         Any: Object stored in the file.
     """
 
+    import joblib
+
     data = joblib.load(path)
     logger.info(f"Binary file loaded from: {path}")
     return data
@@ -136,6 +139,24 @@ def get_size(path: NonEmptyPath) -> str:
     return f"~ {size_in_kb} KB"
 
 
+@beartype
+def get_sha256(path: Union[NonEmptyStr, NonEmptyPath]) -> str:
+    """Compute the SHA-256 of a file, reading it in 1 MB chunks.
+
+    Args:
+        path (str | Path): Path of the file.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
 @beartype
 def decode_image(imgstring: NonEmptyStr, file_name: NonEmptyStr) -> None:
     """Decode base64 string into image file.
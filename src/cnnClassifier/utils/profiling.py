@@ -0,0 +1,124 @@
+import sys
+import time
+import resource
+import numpy as np
+from pathlib import Path
+from contextlib import contextmanager
+from cnnClassifier import logger
+from cnnClassifier.utils.common import save_json
+
+# profiler that module-level ``span`` calls report to; None disables them
+_active = None
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of the resident set size of this process."""
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def latency(fn, runs: int) -> dict:
+    """p50/p99 wall time of ``fn()`` over ``runs`` calls, after one warm-up
+    call that absorbs tracing."""
+
+    fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "p50_ms": round(float(np.percentile(times, 50) * 1000), 3),
+        "p99_ms": round(float(np.percentile(times, 99) * 1000), 3),
+    }
+
+
+class Profiler:
+    """Record wall time, CPU time and peak RSS of nested, named spans.
+
+    With a ``trace_dir`` every top-level span is also captured with the
+    TensorFlow profiler (one trace per span, viewable in TensorBoard).
+    """
+
+    def __init__(self, trace_dir: Path = None):
+        self.trace_dir = trace_dir
+        self.records = []
+        self._stack = []
+
+    @contextmanager
+    def span(self, name: str):
+        path = "/".join(self._stack + [name])
+        trace = self.trace_dir is not None and not self._stack
+        if trace:
+            import tensorflow as tf
+
+            logdir = Path(self.trace_dir) / name.lower().replace(" ", "_")
+            tf.profiler.experimental.start(str(logdir))
+
+        self._stack.append(name)
+        rss_before = peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        status = "failed"
+        try:
+            yield
+            status = "completed"
+        finally:
+            record = {
+                "name": path,
+                "status": status,
+                "wall_s": round(time.perf_counter() - wall, 3),
+                "cpu_s": round(time.process_time() - cpu, 3),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+                "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+            }
+            self._stack.pop()
+            if trace:
+                tf.profiler.experimental.stop()
+            self.records.append(record)
+            logger.info(
+                f"Profile {path}: wall {record['wall_s']}s, cpu {record['cpu_s']}s, "
+                f"peak RSS {record['peak_rss_mb']} MB"
+            )
+
+    def report(self) -> dict:
+        return {"spans": self.records}
+
+    def save(self, path: Path) -> None:
+        save_json(Path(path), self.report())
+
+    def log_to_mlflow(self, path: Path) -> None:
+        """Attach the saved report to a new MLflow run, with the wall time of
+        every top-level span as a metric."""
+
+        import mlflow
+
+        with mlflow.start_run(run_name="profiling"):
+            for record in self.records:
+                if "/" not in record["name"]:
+                    mlflow.log_metric(f"{record['name']} wall_s", record["wall_s"])
+            mlflow.log_artifact(str(path), artifact_path="profiling")
+
+
+@contextmanager
+def profiling(profiler: Profiler):
+    """Make ``profiler`` the target of ``span`` for the duration of the block."""
+
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+@contextmanager
+def span(name: str):
+    """Time a block on the active profiler; a no-op when none is active."""
+
+    if _active is None:
+        yield
+    else:
+        with _active.span(name):
+            yield
@@ -0,0 +1,97 @@
+import base64
+import threading
+import numpy as np
+import pytest
+from cnnClassifier.entity.config_entity import ServingConfig
+from app import create_app
+
+
+class FakePredictor:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def load_image(self, image):
+        if image != b"scan":
+            raise ValueError("not an image")
+        return np.zeros((2, 2, 3))
+
+    def predict(self, images):
+        self.batch_sizes.append(len(images))
+        return [{"class": "Normal", "confidence": 1.0} for _ in images]
+
+
+def make_app(predictor):
+    config = ServingConfig(
+        host="127.0.0.1",
+        port=0,
+        max_batch_size=4,
+        max_wait_ms=1,
+        max_queue_size=8,
+        model_dir=None,
+    )
+    return create_app(predictor, config)
+
+
+@pytest.fixture
+def client():
+    app = make_app(FakePredictor())
+    yield app.test_client()
+    app.config["BATCHER"].stop()
+
+
+def test_predict(client):
+    image = base64.b64encode(b"scan").decode("utf-8")
+    response = client.post("/predict", json={"image": image})
+    assert response.status_code == 200
+    assert response.get_json() == {"class": "Normal", "confidence": 1.0}
+
+
+def test_predict_invalid_image(client):
+    image = base64.b64encode(b"garbage").decode("utf-8")
+    response = client.post("/predict", json={"image": image})
+    assert response.status_code == 400
+
+
+def test_predict_missing_image(client):
+    assert client.post("/predict", json={}).status_code == 400
+
+
+def test_metrics(client):
+    image = base64.b64encode(b"scan").decode("utf-8")
+    client.post("/predict", json={"image": image})
+    metrics = client.get("/metrics").get_json()
+    assert metrics["queue_depth"] == 0
+    assert metrics["batch_size_histogram"] == {"1": 1}
+
+
+def test_prediction_timeout_returns_json_504(monkeypatch):
+    release = threading.Event()
+
+    class SlowPredictor(FakePredictor):
+        def predict(self, images):
+            release.wait(timeout=5)
+            return super().predict(images)
+
+    monkeypatch.setattr("app.REQUEST_TIMEOUT_SECONDS", 0.05)
+    app = make_app(SlowPredictor())
+    image = base64.b64encode(b"scan").decode("utf-8")
+    response = app.test_client().post("/predict", json={"image": image})
+    release.set()
+    app.config["BATCHER"].stop()
+
+    assert response.status_code == 504
+    assert response.get_json() == {"error": "Prediction timed out"}
+
+
+def test_prediction_error_returns_json_500():
+    class BrokenPredictor(FakePredictor):
+        def predict(self, images):
+            raise RuntimeError("Boom!")
+
+    app = make_app(BrokenPredictor())
+    image = base64.b64encode(b"scan").decode("utf-8")
+    response = app.test_client().post("/predict", json={"image": image})
+    app.config["BATCHER"].stop()
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Prediction failed"}
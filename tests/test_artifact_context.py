@@ -0,0 +1,84 @@
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.artifact_context import ArtifactContext
+from cnnClassifier.components.model_training import Training
+from cnnClassifier.entity.config_entity import TrainingConfig
+
+
+def small_model():
+    inputs = tf.keras.Input(shape=(4,))
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(inputs)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer="sgd", loss="categorical_crossentropy")
+    return model
+
+
+def training_config(tmp_path):
+    return TrainingConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.keras",
+        updated_base_model_path=tmp_path / "base_model_updated.keras",
+        training_data=tmp_path / "data",
+        local_data_file=tmp_path / "data.zip",
+        feature_cache_dir=tmp_path / "feature_cache",
+        shards_dir=tmp_path / "shards",
+        augmented_epochs_dir=tmp_path / "augmented_epochs",
+        checkpoint_dir=tmp_path / "checkpoints",
+        params_epochs=1,
+        params_batch_size=2,
+        params_is_augmentation=False,
+        params_augmentations=[],
+        params_augmented_epochs=0,
+        params_image_size=(4,),
+        params_cache_features=False,
+        params_use_shards=False,
+        params_cache_dataset=False,
+        params_read_from_zip=False,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_distribution="none",
+        params_num_cpu_devices=1,
+        params_checkpoint_every=1,
+        params_early_stopping_patience=0,
+    )
+
+
+def test_save_model_in_background(tmp_path):
+    context = ArtifactContext()
+    model = small_model()
+    path = tmp_path / "model.keras"
+
+    context.save_model(path, model)
+    assert context.get(str(path)) is model
+
+    context.wait(path)
+    assert path.exists()
+    assert tf.keras.models.load_model(path).output.shape[-1] == 2
+
+
+def test_wait_reraises_save_errors(tmp_path):
+    context = ArtifactContext()
+    context.save_model(tmp_path / "model.txt", small_model())
+    with pytest.raises(ValueError):
+        context.wait()
+
+
+def test_training_uses_in_memory_model(tmp_path):
+    config = training_config(tmp_path)
+    context = ArtifactContext()
+    model = small_model()
+    context.save_model(config.updated_base_model_path, model)
+
+    training = Training(config, base_model_config=None, context=context)
+    training.get_base_model()
+    assert training.model is model
+    context.wait()
+
+
+def test_standalone_training_loads_from_disk(tmp_path):
+    config = training_config(tmp_path)
+    small_model().save(config.updated_base_model_path)
+
+    training = Training(config, base_model_config=None)
+    training.get_base_model()
+    assert training.model.output.shape[-1] == 2
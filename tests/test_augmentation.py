@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.augmentation import (
+    Augmentation,
+    Augmenter,
+    augmented_epochs_dataset,
+    materialize_epochs,
+)
+from cnnClassifier.components.manifest import Manifest
+from cnnClassifier.components.model_training import Training
+from cnnClassifier.entity.config_entity import AugmentationConfig, TrainingConfig
+
+IMAGE_SIZE = (16, 16, 3)
+SPECS = [
+    {"type": "flip", "mode": "horizontal"},
+    {"type": "rotation", "factor": 0.1},
+    {"type": "zoom", "factor": 0.2},
+    {"type": "translation", "factor": 0.1},
+    {"type": "brightness", "factor": 0.1},
+    {"type": "contrast", "factor": 0.2},
+]
+
+
+@pytest.fixture
+def image_tree(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(10):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+    return root
+
+
+def random_images(batch=4):
+    return tf.random.stateless_uniform((batch, *IMAGE_SIZE), seed=[1, 2])
+
+
+def test_same_seed_same_batch():
+    augmenter = Augmenter(SPECS, IMAGE_SIZE)
+    images = random_images()
+
+    first = augmenter(images, [3, 4])
+    assert first.shape == images.shape
+    assert float(tf.reduce_min(first)) >= 0.0 and float(tf.reduce_max(first)) <= 1.0
+    np.testing.assert_array_equal(first, augmenter(images, [3, 4]))
+    assert not np.allclose(first, augmenter(images, [5, 6]))
+
+
+def test_zero_factors_are_identity():
+    specs = [
+        {"type": "rotation", "factor": 0.0},
+        {"type": "zoom", "factor": 0.0},
+        {"type": "translation", "factor": 0.0},
+    ]
+    images = random_images()
+    np.testing.assert_allclose(
+        Augmenter(specs, IMAGE_SIZE)(images, [0, 0]), images, atol=1e-5
+    )
+
+
+def test_flip_mirrors_or_keeps_each_image():
+    images = random_images(batch=8)
+    flipped = Augmenter([{"type": "flip"}], IMAGE_SIZE)(images, [7, 8]).numpy()
+
+    for original, result in zip(images.numpy(), flipped):
+        assert np.allclose(result, original, atol=1e-5) or np.allclose(
+            result, original[:, ::-1], atol=1e-5
+        )
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        [{"type": "cutout", "factor": 0.1}],
+        [{"type": "rotation"}],
+        [{"type": "flip", "mode": "diagonal"}],
+    ],
+)
+def test_invalid_specs(specs):
+    with pytest.raises(ValueError):
+        Augmenter(specs, IMAGE_SIZE)
+
+
+def test_materialized_epochs_are_reused(image_tree, tmp_path):
+    manifest = Manifest.load(image_tree)
+    paths, hashes, labels = manifest.paths, manifest.hashes, manifest.labels
+    augmenter = Augmenter(SPECS, IMAGE_SIZE)
+
+    epochs_file = materialize_epochs(
+        paths, hashes, augmenter, 3, tmp_path, batch_size=8
+    )
+    epochs = np.load(epochs_file, mmap_mode="r")
+    assert epochs.shape == (3, 20, *IMAGE_SIZE)
+    assert not np.array_equal(epochs[0], epochs[1])
+
+    mtime = epochs_file.stat().st_mtime_ns
+    assert materialize_epochs(paths, hashes, augmenter, 3, tmp_path) == epochs_file
+    assert epochs_file.stat().st_mtime_ns == mtime
+
+    one_hot = np.eye(2, dtype=np.float32)[labels]
+    rows = np.arange(0, 20, 2)
+    dataset = augmented_epochs_dataset(epochs_file, rows, one_hot, batch_size=4)
+    batches = list(dataset.take(6))  # three batches per epoch, two epochs
+    assert [len(images) for images, _ in batches] == [4, 4, 2, 4, 4, 2]
+    seen = np.concatenate([labels for _, labels in batches[:3]])
+    assert sorted(seen.argmax(axis=-1)) == sorted(np.array(labels)[rows])
+
+
+def test_stage_is_a_no_op_without_stored_epochs(image_tree, tmp_path):
+    config = AugmentationConfig(
+        root_dir=tmp_path,
+        training_data=image_tree,
+        epochs_dir=tmp_path / "epochs",
+        params_image_size=IMAGE_SIZE,
+        params_is_augmentation=True,
+        params_augmentations=SPECS,
+        params_augmented_epochs=0,
+        params_read_from_zip=False,
+    )
+    assert Augmentation(config).materialize() is None
+    assert not (tmp_path / "epochs").exists()
+
+
+@pytest.mark.parametrize("augmentation, augmented_epochs", [(False, 0), (True, 2)])
+def test_training_inputs(image_tree, tmp_path, augmentation, augmented_epochs):
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.GlobalAveragePooling2D()(inputs)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer="sgd", loss="categorical_crossentropy")
+    model.save(tmp_path / "base_model_updated.keras")
+
+    config = TrainingConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.keras",
+        updated_base_model_path=tmp_path / "base_model_updated.keras",
+        training_data=image_tree,
+        local_data_file=tmp_path / "data.zip",
+        feature_cache_dir=tmp_path / "feature_cache",
+        shards_dir=tmp_path / "shards",
+        augmented_epochs_dir=tmp_path / "augmented_epochs",
+        checkpoint_dir=tmp_path / "checkpoints",
+        params_epochs=1,
+        params_batch_size=4,
+        params_is_augmentation=augmentation,
+        params_augmentations=SPECS,
+        params_augmented_epochs=augmented_epochs,
+        params_image_size=IMAGE_SIZE,
+        params_cache_features=False,
+        params_use_shards=False,
+        params_cache_dataset=False,
+        params_read_from_zip=False,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_distribution="none",
+        params_num_cpu_devices=1,
+        params_checkpoint_every=1,
+        params_early_stopping_patience=0,
+    )
+    training = Training(config, base_model_config=None)
+    training.get_base_model()
+    training.train_valid_generator()
+
+    images, labels = next(iter(training.train_generator))
+    assert images.shape == (4, *IMAGE_SIZE)
+    assert labels.shape == (4, 2)
+    assert training.steps_per_epoch == (4 if augmented_epochs else None)
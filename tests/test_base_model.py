@@ -0,0 +1,82 @@
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.base_model import BaseModel, get_head_type
+
+
+@pytest.fixture
+def backbone_factory():
+    def build(precision):
+        tf.keras.mixed_precision.set_global_policy(precision)
+        inputs = tf.keras.Input(shape=(8, 8, 3))
+        outputs = tf.keras.layers.Conv2D(4, 3, name="block5_pool")(inputs)
+        return tf.keras.Model(inputs, outputs)
+
+    yield build
+    tf.keras.mixed_precision.set_global_policy("float32")
+
+
+def prepare(model, precision="float32", jit_compile=False):
+    return BaseModel._prepare_full_model(
+        model=model,
+        classes=2,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01,
+        precision=precision,
+        jit_compile=jit_compile,
+    )
+
+
+def test_float32_defaults(backbone_factory):
+    model = prepare(backbone_factory("float32"))
+    assert isinstance(model.optimizer, tf.keras.optimizers.SGD)
+    assert not model.jit_compile
+    assert len(model.trainable_weights) == 2
+
+
+@pytest.mark.parametrize("precision", ["mixed_bfloat16", "mixed_float16"])
+def test_mixed_precision_keeps_float32_softmax(backbone_factory, precision):
+    model = prepare(backbone_factory(precision), precision=precision)
+    assert model.layers[1].compute_dtype != "float32"
+    assert model.output.dtype == "float32"
+
+
+def test_loss_scaling_only_for_float16(backbone_factory):
+    fp16 = prepare(backbone_factory("mixed_float16"), precision="mixed_float16")
+    bf16 = prepare(backbone_factory("mixed_bfloat16"), precision="mixed_bfloat16")
+    assert isinstance(fp16.optimizer, tf.keras.mixed_precision.LossScaleOptimizer)
+    assert not isinstance(bf16.optimizer, tf.keras.mixed_precision.LossScaleOptimizer)
+
+
+def test_jit_compile(backbone_factory):
+    assert prepare(backbone_factory("float32"), jit_compile=True).jit_compile
+
+
+@pytest.mark.parametrize("head", ["flatten", "gap", "gap_dropout_dense"])
+def test_head_is_recorded_in_saved_model(tmp_path, backbone_factory, head):
+    model = BaseModel._prepare_full_model(
+        model=backbone_factory("float32"),
+        classes=2,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01,
+        head=head,
+    )
+    path = tmp_path / "model.keras"
+    model.save(path)
+
+    loaded = tf.keras.models.load_model(path)
+    assert get_head_type(loaded) == head
+    assert loaded.output.shape[-1] == 2
+
+
+def test_unknown_head(backbone_factory):
+    with pytest.raises(ValueError, match="Unknown head"):
+        BaseModel._prepare_full_model(
+            model=backbone_factory("float32"),
+            classes=2,
+            freeze_all=True,
+            freeze_till=None,
+            learning_rate=0.01,
+            head="attention",
+        )
@@ -0,0 +1,117 @@
+import csv
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+import tensorflow as tf
+from cnnClassifier.cli import main
+from cnnClassifier.components.batch_scoring import BatchScorer, resize_bilinear
+from cnnClassifier.components.manifest import Manifest, manifest_path
+from cnnClassifier.entity.config_entity import BatchScoringConfig
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+def test_resize_matches_tensorflow():
+    image = np.random.RandomState(0).randint(0, 256, size=(13, 7, 3))
+    for size in [(8, 8), (20, 5), (13, 7)]:
+        expected = tf.image.resize(image, size).numpy()
+        np.testing.assert_allclose(resize_bilinear(image, size), expected, atol=1e-3)
+
+
+@pytest.fixture
+def config(tmp_path):
+    root = tmp_path / "images"
+    for class_name in ["Normal", "Tumor"]:
+        (root / class_name).mkdir(parents=True)
+        for i in range(5):
+            value = tf.constant(i * 40, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill((10, 12, 3), value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.GlobalAveragePooling2D()(inputs)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    tf.keras.Model(inputs, outputs).save(tmp_path / "model.keras")
+
+    return BatchScoringConfig(
+        trained_model_path=tmp_path / "model.keras",
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=4,
+        params_workers=2,
+    )
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_scoring_resumes_after_interruption(config, tmp_path):
+    root, output = tmp_path / "images", tmp_path / "scores.csv"
+    (root / "Tumor" / "broken.png").write_bytes(b"not an image")
+
+    summary = BatchScorer(config).score(root, output)
+    assert summary["scored"] == 10 and summary["failed"] == 1
+    rows = read_csv(output)
+    assert len(rows) == 11
+    [broken] = [row for row in rows if row["path"].endswith("broken.png")]
+    assert broken["error"] and not broken["prediction"]
+    scored = [row for row in rows if not row["error"]]
+    assert all(row["prediction"] in ("Normal", "Tumor") for row in scored)
+    for row in scored:
+        total = float(row["prob_Normal"]) + float(row["prob_Tumor"])
+        assert total == pytest.approx(1.0, abs=1e-5)
+
+    # an interrupted run: the last row cut short, two rows never written
+    data = output.read_bytes()
+    lines = data.splitlines(keepends=True)
+    output.write_bytes(b"".join(lines[:-3]) + lines[-3][:10])
+
+    summary = BatchScorer(config).score(root, output)
+    assert summary["skipped"] == 8 and summary["scored"] + summary["failed"] == 3
+    assert sorted(read_csv(output), key=lambda row: row["path"]) == sorted(
+        rows, key=lambda row: row["path"]
+    )
+
+
+def test_parquet_scoring_from_a_manifest(config, tmp_path):
+    root, output = tmp_path / "images", tmp_path / "scores"
+    Manifest.build(root)
+
+    summary = BatchScorer(config).score(manifest_path(root), output)
+    assert summary["scored"] == 10
+    table = pq.read_table(output)
+    assert table.num_rows == 10
+    assert set(table.column("path").to_pylist()) == set(Manifest.load(root).paths)
+
+    summary = BatchScorer(config).score(manifest_path(root), output, "parquet")
+    assert summary["skipped"] == 10 and summary["scored"] == 0
+    assert pq.read_table(output).num_rows == 10
+
+
+def test_cli_applies_overrides(config, tmp_path, monkeypatch):
+    scored_with = []
+
+    class FakeConfigManager:
+        def get_batch_scoring_config(self):
+            return config
+
+    class FakeBatchScorer:
+        def __init__(self, config):
+            scored_with.append(config)
+
+        def score(self, source, output, output_format):
+            scored_with.extend([source, output, output_format])
+
+    monkeypatch.setattr("cnnClassifier.cli.ConfigurationManager", FakeConfigManager)
+    monkeypatch.setattr(
+        "cnnClassifier.components.batch_scoring.BatchScorer", FakeBatchScorer
+    )
+    main(["score", "images", "out", "--format", "csv", "--workers", "7"])
+
+    used, source, output, output_format = scored_with
+    assert used.params_workers == 7
+    assert used.params_batch_size == config.params_batch_size
+    assert (str(source), str(output), output_format) == ("images", "out", "csv")
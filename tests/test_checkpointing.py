@@ -0,0 +1,179 @@
+import mlflow
+import numpy as np
+import pytest
+import tensorflow as tf
+from types import SimpleNamespace
+from mlflow.tracking import MlflowClient
+from cnnClassifier.components.checkpointing import TrainingCheckpoint
+from cnnClassifier.components.model_training import Training
+from cnnClassifier.entity.config_entity import TrainingConfig
+
+
+class Preempted(Exception):
+    pass
+
+
+class PreemptAt(tf.keras.callbacks.Callback):
+    def __init__(self, epoch: int):
+        super().__init__()
+        self.epoch = epoch
+
+    def on_epoch_begin(self, epoch, logs=None):
+        if epoch == self.epoch:
+            raise Preempted()
+
+
+class EpochRecorder(tf.keras.callbacks.Callback):
+    def __init__(self):
+        super().__init__()
+        self.epochs = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epochs.append(epoch)
+
+
+def small_model():
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.Input(shape=(4,))
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(inputs)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer="adam", loss="categorical_crossentropy")
+    return model
+
+
+def datasets():
+    x = np.random.RandomState(0).rand(8, 4).astype(np.float32)
+    y = np.eye(2, dtype=np.float32)[[0, 1] * 4]
+    dataset = tf.data.Dataset.from_tensor_slices((x, y)).batch(2)
+    return dataset, dataset
+
+
+def test_resume_restores_epoch_and_optimizer(tmp_path):
+    train, valid = datasets()
+    model = small_model()
+    with pytest.raises(Preempted):
+        model.fit(
+            train,
+            validation_data=valid,
+            epochs=5,
+            callbacks=[TrainingCheckpoint(tmp_path, every_n_epochs=2), PreemptAt(3)],
+            verbose=0,
+        )
+    # epochs 0-2 ran, the checkpoint holds the state after epoch 1
+    iterations = int(model.optimizer.iterations) - 4
+    weights = model.get_weights()
+
+    resumed, recorder = small_model(), EpochRecorder()
+    checkpoint = TrainingCheckpoint(tmp_path, every_n_epochs=2)
+    assert checkpoint.resumable() and checkpoint.initial_epoch() == 2
+    checkpoint.set_model(resumed)
+    checkpoint.on_train_begin()
+    assert int(resumed.optimizer.iterations) == iterations
+    assert not np.allclose(resumed.get_weights()[0], weights[0])
+
+    resumed.fit(
+        train,
+        validation_data=valid,
+        epochs=5,
+        initial_epoch=checkpoint.initial_epoch(),
+        callbacks=[checkpoint, recorder],
+        verbose=0,
+    )
+    assert recorder.epochs == [2, 3, 4]
+    assert not tmp_path.exists()  # removed once training completes
+
+
+def test_resume_restores_early_stopping(tmp_path):
+    train, valid = datasets()
+    model = small_model()
+    early_stopping = tf.keras.callbacks.EarlyStopping(
+        patience=10, restore_best_weights=True
+    )
+    checkpoint = TrainingCheckpoint(tmp_path, early_stopping=early_stopping)
+    with pytest.raises(Preempted):
+        model.fit(
+            train,
+            validation_data=valid,
+            epochs=5,
+            callbacks=[early_stopping, checkpoint, PreemptAt(3)],
+            verbose=0,
+        )
+    assert early_stopping.best is not None
+
+    resumed = tf.keras.callbacks.EarlyStopping(patience=10, restore_best_weights=True)
+    checkpoint = TrainingCheckpoint(tmp_path, early_stopping=resumed)
+    for callback in (resumed, checkpoint):
+        callback.set_model(small_model())
+        callback.on_train_begin()
+    assert resumed.wait == early_stopping.wait
+    assert resumed.best == pytest.approx(early_stopping.best)
+    assert resumed.best_epoch == early_stopping.best_epoch
+    for restored, best in zip(resumed.best_weights, early_stopping.best_weights):
+        np.testing.assert_array_equal(restored, best)
+
+
+def test_preempted_training_resumes_its_mlflow_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+    config = TrainingConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.keras",
+        updated_base_model_path=tmp_path / "base_model_updated.keras",
+        training_data=tmp_path / "data",
+        local_data_file=tmp_path / "data.zip",
+        feature_cache_dir=tmp_path / "feature_cache",
+        shards_dir=tmp_path / "shards",
+        augmented_epochs_dir=tmp_path / "augmented_epochs",
+        checkpoint_dir=tmp_path / "checkpoints",
+        params_epochs=4,
+        params_batch_size=2,
+        params_is_augmentation=False,
+        params_augmentations=[],
+        params_augmented_epochs=0,
+        params_image_size=(4,),
+        params_cache_features=False,
+        params_use_shards=False,
+        params_cache_dataset=False,
+        params_read_from_zip=False,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_distribution="none",
+        params_num_cpu_devices=1,
+        params_checkpoint_every=1,
+        params_early_stopping_patience=10,
+    )
+
+    def attempt(extra_callbacks):
+        training = Training(config, SimpleNamespace(params_learning_rate=0.01))
+        training.strategy = tf.distribute.get_strategy()
+        training.model = training.fit_model = small_model()
+        training.train_generator, training.valid_generator = datasets()
+        training.steps_per_epoch, training.num_train_samples = None, 8
+        default_callbacks = training._callbacks
+
+        def with_extra_callbacks():
+            checkpoint, callbacks = default_callbacks()
+            return checkpoint, [*callbacks, *extra_callbacks]
+
+        monkeypatch.setattr(training, "_callbacks", with_extra_callbacks)
+        training.train()
+
+    try:
+        with pytest.raises(Preempted):
+            attempt([PreemptAt(2)])
+        recorder = EpochRecorder()
+        attempt([recorder])
+    finally:
+        mlflow.set_tracking_uri(None)
+
+    assert recorder.epochs == [2, 3]
+    assert config.trained_model_path.exists()
+    assert not config.checkpoint_dir.exists()
+
+    client = MlflowClient((tmp_path / "mlruns").as_uri())
+    [run] = client.search_runs(client.search_experiments()[0].experiment_id)
+    steps = [m.step for m in client.get_metric_history(run.info.run_id, "val_loss")]
+    assert sorted(steps) == [0, 1, 2, 3]
+    # 4 batches per epoch, logged every 10th: the resumed attempt starts at 8
+    batch_steps = client.get_metric_history(run.info.run_id, "batch_loss")
+    assert [m.step for m in batch_steps] == [10]
@@ -14,6 +14,7 @@ from cnnClassifier.utils.common import (
     save_bin,
     load_bin,
     get_size,
+    get_sha256,
     decode_image,
     encode_image_into_base64,
 )
@@ -129,6 +130,19 @@ def test_get_size(tmp_dir):
     assert "~" in size_str
 
 
+# ==========================
+# get_sha256 test
+# ==========================
+def test_get_sha256(tmp_dir):
+    import hashlib
+
+    file_path = tmp_dir / "test.txt"
+    file_path.write_bytes(b"12345")
+    expected = hashlib.sha256(b"12345").hexdigest()
+    assert get_sha256(file_path) == expected
+    assert get_sha256(str(file_path)) == expected
+
+
 # ==========================
 # Base64 image tests
 # ==========================
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import threading
+import urllib.error
+import zipfile
+import numpy as np
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+from cnnClassifier.entity.config_entity import DataIngestionConfig
+from cnnClassifier.components.data_ingestion import DataIngestion
+from cnnClassifier.components.data_split import list_samples
+from cnnClassifier.utils.common import save_json
+
+PAYLOAD = os.urandom(10_000)
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for a static file server with Range support."""
+
+    accept_ranges = True
+    head_status = 200
+    requests = []
+    bytes_sent = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _range(self):
+        header = self.headers.get("Range")
+        if not header or not self.accept_ranges:
+            return None
+        start, end = header.split("=")[1].split("-")
+        return int(start), int(end) if end else len(PAYLOAD) - 1
+
+    def do_HEAD(self):
+        if self.head_status != 200:
+            self.send_response(self.head_status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        if self.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        byte_range = self._range()
+        type(self).requests.append(self.headers.get("Range"))
+        if byte_range is None:
+            body = PAYLOAD
+            self.send_response(200)
+        else:
+            start, end = byte_range
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(PAYLOAD)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = PAYLOAD[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # counted first: the client may assert as soon as the body arrives
+        type(self).bytes_sent += len(body)
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    RangeHandler.accept_ranges = True
+    RangeHandler.head_status = 200
+    RangeHandler.requests = []
+    RangeHandler.bytes_sent = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/data.zip"
+    httpd.shutdown()
+
+
+def make_config(tmp_path, url, sha256=PAYLOAD_SHA256, workers=4):
+    return DataIngestionConfig(
+        root_dir=tmp_path,
+        source_url=url,
+        source_sha256=sha256,
+        local_data_file=tmp_path / "data.zip",
+        unzip_dir=tmp_path / "data",
+        manifest_workers=2,
+        quarantine_dir=tmp_path / "quarantine",
+        validation_report=tmp_path / "validation_report.json",
+        validation_workers=2,
+        download_workers=workers,
+        download_chunk_size=3_000,
+        params_read_from_zip=False,
+    )
+
+
+def test_parallel_chunked_download(tmp_path, server):
+    path = DataIngestion(make_config(tmp_path, server)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert len(RangeHandler.requests) == 4
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_skip_when_checksum_matches(tmp_path, server):
+    (tmp_path / "data.zip").write_bytes(PAYLOAD)
+    DataIngestion(make_config(tmp_path, server)).download_file()
+    assert RangeHandler.requests == []
+
+
+def test_redownload_when_checksum_differs(tmp_path, server):
+    (tmp_path / "data.zip").write_bytes(b"stale")
+    path = DataIngestion(make_config(tmp_path, server)).download_file()
+    assert path.read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_raises(tmp_path, server):
+    config = make_config(tmp_path, server, sha256="0" * 64)
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        DataIngestion(config).download_file()
+    assert not (tmp_path / "data.zip").exists()
+
+
+def test_resume_single_stream(tmp_path, server):
+    (tmp_path / "data.zip.part").write_bytes(PAYLOAD[:4_000])
+    path = DataIngestion(make_config(tmp_path, server, workers=1)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert RangeHandler.requests == ["bytes=4000-"]
+    assert RangeHandler.bytes_sent == len(PAYLOAD) - 4_000
+
+
+def test_resume_of_a_complete_partial_file(tmp_path, server):
+    (tmp_path / "data.zip.part").write_bytes(PAYLOAD)
+    path = DataIngestion(make_config(tmp_path, server, workers=1)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert RangeHandler.requests == [f"bytes={len(PAYLOAD)}-"]
+    assert RangeHandler.bytes_sent == 0
+
+
+def test_resume_of_an_oversized_partial_file_fails(tmp_path, server):
+    (tmp_path / "data.zip.part").write_bytes(PAYLOAD + b"extra")
+    with pytest.raises(urllib.error.HTTPError, match="416"):
+        DataIngestion(make_config(tmp_path, server, workers=1)).download_file()
+
+
+def test_resume_parallel_chunks(tmp_path, server):
+    part = bytearray(len(PAYLOAD))
+    part[:6_000] = PAYLOAD[:6_000]
+    (tmp_path / "data.zip.part").write_bytes(bytes(part))
+    save_json(
+        tmp_path / "data.zip.part.chunks",
+        {"size": len(PAYLOAD), "chunk_size": 3_000, "done": [0, 1]},
+    )
+
+    path = DataIngestion(make_config(tmp_path, server)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert sorted(RangeHandler.requests) == ["bytes=6000-8999", "bytes=9000-9999"]
+
+
+def test_server_without_range_support(tmp_path, server):
+    RangeHandler.accept_ranges = False
+    (tmp_path / "data.zip.part").write_bytes(b"garbage")
+    path = DataIngestion(make_config(tmp_path, server)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert RangeHandler.requests == [None]
+
+
+@pytest.mark.parametrize("status", [403, 405])
+def test_server_rejecting_head(tmp_path, server, status):
+    RangeHandler.head_status = status
+    (tmp_path / "data.zip.part").write_bytes(b"garbage")
+    path = DataIngestion(make_config(tmp_path, server)).download_file()
+    assert path.read_bytes() == PAYLOAD
+    assert RangeHandler.requests == [None]
+
+
+def test_validate_images_quarantines_corrupt_and_duplicates(tmp_path):
+    def write(relative, value):
+        path = tmp_path / "data" / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(np.full((8, 8, 3), value, dtype=np.uint8)).save(path)
+        return path
+
+    for i in range(4):
+        write(f"Normal/{i}.png", i)
+        write(f"Tumor/{i}.jpg", 100 + i)
+    write("Normal/copy.png", 2)  # duplicate of Normal/2.png
+    write("Tumor/mislabelled.png", 3)  # same bytes as Normal/3.png
+    truncated = write("Tumor/truncated.jpg", 200)
+    truncated.write_bytes(truncated.read_bytes()[:100])
+
+    ingestion = DataIngestion(make_config(tmp_path, "http://unused"))
+    ingestion.build_manifest()
+    report = ingestion.validate_images()
+
+    assert list(report["corrupt"]) == ["Tumor/truncated.jpg"]
+    assert report["duplicates"] == {"Normal/2.png": ["Normal/copy.png"]}
+    assert sorted(next(iter(report["label_conflicts"].values()))) == [
+        "Normal/3.png",
+        "Tumor/mislabelled.png",
+    ]
+    assert report["num_images"] == 11 and report["num_valid"] == 7
+    assert (tmp_path / "quarantine" / "corrupt" / "Tumor" / "truncated.jpg").exists()
+    assert not (tmp_path / "data" / "Normal" / "copy.png").exists()
+    assert (tmp_path / "validation_report.json").exists()
+
+    paths, labels, _ = list_samples(tmp_path / "data")
+    assert len(paths) == 7 and labels == [0] * 3 + [1] * 4
+
+
+def test_rerun_keeps_quarantined_members_out(tmp_path):
+    with zipfile.ZipFile(tmp_path / "data.zip", "w") as archive:
+        for i in range(3):
+            for class_name in ("Normal", "Tumor"):
+                image = Image.fromarray(
+                    np.full((8, 8, 3), i + 100 * (class_name == "Tumor"), np.uint8)
+                )
+                image.save(tmp_path / "image.png")
+                archive.write(tmp_path / "image.png", f"{class_name}/{i}.png")
+        archive.writestr("Tumor/truncated.png", b"not an image")
+        archive.write(tmp_path / "image.png", "Tumor/copy.png")
+
+    ingestion = DataIngestion(make_config(tmp_path, "http://unused"))
+    ingestion.extract_zip_file()
+    ingestion.build_manifest()
+    first = ingestion.validate_images()
+    assert (tmp_path / "quarantine" / "duplicate" / "Tumor" / "copy.png").exists()
+
+    ingestion.extract_zip_file()
+    assert not (tmp_path / "data" / "Tumor" / "copy.png").exists()
+    assert not (tmp_path / "data" / "Tumor" / "truncated.png").exists()
+    ingestion.build_manifest()
+    second = ingestion.validate_images()
+
+    assert second == first
+    assert list(second["corrupt"]) == ["Tumor/truncated.png"]
+    assert second["duplicates"] == {"Tumor/2.png": ["Tumor/copy.png"]}
+    assert second["num_images"] == 8 and second["num_valid"] == 6
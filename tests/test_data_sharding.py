@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.entity.config_entity import DataShardingConfig
+from cnnClassifier.components.data_sharding import DataSharding, parse_example
+from cnnClassifier.utils.common import load_json
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+@pytest.fixture
+def image_tree(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(5):
+            image = tf.fill((12, 10, 3), tf.constant(label * 200, dtype=tf.uint8))
+            path = root / class_name / f"{class_name}-{i}.png"
+            tf.io.write_file(str(path), tf.io.encode_png(image))
+    return root
+
+
+@pytest.fixture
+def config(tmp_path, image_tree):
+    return DataShardingConfig(
+        root_dir=tmp_path / "data_sharding",
+        source_dir=image_tree,
+        shards_dir=tmp_path / "data_sharding" / "shards",
+        params_image_size=IMAGE_SIZE,
+        params_num_shards=3,
+        params_use_shards=True,
+    )
+
+
+def read_subset(shards_dir, subset):
+    files = sorted(str(p) for p in (shards_dir / subset).glob("*.tfrecord"))
+    dataset = tf.data.TFRecordDataset(files).map(
+        lambda record: parse_example(record, IMAGE_SIZE)
+    )
+    return [(image.numpy(), int(label)) for image, label in dataset]
+
+
+def test_write_shards(config):
+    DataSharding(config).write_shards()
+
+    assert len(list((config.shards_dir / "training").glob("*.tfrecord"))) == 3
+    metadata = load_json(config.shards_dir / "metadata.json")
+    assert metadata.class_names == ["Normal", "Tumor"]
+    assert metadata.num_examples.training == 8
+    assert metadata.num_examples.validation == 2
+
+    examples = read_subset(config.shards_dir, "training")
+    assert len(examples) == 8
+    for image, label in examples:
+        assert image.dtype == np.uint8
+        assert image.shape == IMAGE_SIZE
+        assert np.all(image == label * 200)
+
+
+def test_rewrite_replaces_stale_shards(config):
+    DataSharding(config).write_shards()
+    stale = config.shards_dir / "training" / "shard-00000-of-00099.tfrecord"
+    stale.write_bytes(b"")
+
+    DataSharding(config).write_shards()
+    assert not stale.exists()
+    assert len(read_subset(config.shards_dir, "training")) == 8
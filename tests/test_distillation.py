@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.distillation import (
+    Distillation,
+    build_student,
+    distillation_loss,
+)
+from cnnClassifier.components.feature_cache import FeatureCache
+from cnnClassifier.entity.config_entity import DistillationConfig
+
+IMAGE_SIZE = (16, 16, 3)
+
+
+@pytest.fixture
+def config(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(10):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.Flatten()(inputs)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    tf.keras.Model(inputs, outputs).save(tmp_path / "model.keras")
+
+    return DistillationConfig(
+        root_dir=tmp_path,
+        teacher_model_path=tmp_path / "model.keras",
+        student_model_path=tmp_path / "student.keras",
+        teacher_cache_dir=tmp_path / "teacher_cache",
+        report_file=tmp_path / "report.json",
+        training_data=root,
+        latency_runs=3,
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=4,
+        params_distill=True,
+        params_student="small_cnn",
+        params_epochs=1,
+        params_learning_rate=0.001,
+        params_temperature=4.0,
+        params_alpha=0.9,
+        params_read_from_zip=False,
+    )
+
+
+def test_soft_loss_vanishes_when_student_matches_teacher():
+    logits = tf.constant([[2.0, -1.0], [0.5, 0.5]])
+    soft = tf.nn.softmax(logits / 4.0)
+    y_true = tf.concat([tf.zeros_like(soft), soft], axis=-1)
+    loss = distillation_loss(num_classes=2, temperature=4.0, alpha=1.0)
+    assert float(loss(y_true, logits)) == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("student", ["small_cnn", "mobilenet_v2"])
+def test_students_output_logits(student):
+    model = build_student(student, (32, 32, 3), classes=2)
+    assert model.output.shape[-1] == 2
+    assert model.layers[-1].activation.__name__ == "linear"
+
+
+def test_unknown_student():
+    with pytest.raises(ValueError, match="Unknown student"):
+        build_student("resnet", IMAGE_SIZE, classes=2)
+
+
+def test_distill_and_report(config, monkeypatch):
+    distillation = Distillation(config)
+    distillation.train()
+    report = distillation.evaluate()
+
+    assert config.student_model_path.exists()
+    assert config.report_file.exists()
+    student = tf.keras.models.load_model(config.student_model_path)
+    probabilities = student.predict(np.zeros((1, *IMAGE_SIZE)), verbose=0)
+    assert probabilities.sum() == pytest.approx(1.0, abs=1e-5)
+    assert report["num_validation_images"] == 4
+    assert set(report["models"]) == {"teacher", "student"}
+    assert 0.0 <= report["student_vs_teacher"]["agreement"] <= 1.0
+
+    # the teacher ran once; a rerun reads every output from the cache
+    def fail(*args, **kwargs):
+        raise AssertionError("teacher recomputed")
+
+    monkeypatch.setattr(FeatureCache, "_compute", fail)
+    distillation.train()
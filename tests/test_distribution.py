@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import subprocess
+import tensorflow as tf
+from cnnClassifier.components.distribution import is_chief, local_cluster
+from cnnClassifier.pipeline.launch_workers import launch_local_workers
+
+IMAGE_SIZE = (16, 16, 3)
+
+WORKER_SCRIPT = """
+import sys
+from pathlib import Path
+from cnnClassifier.components.model_training import Training
+from cnnClassifier.entity.config_entity import BaseModelConfig, TrainingConfig
+
+root = Path(sys.argv[1])
+training = Training(
+    TrainingConfig(
+        root_dir=root,
+        trained_model_path=root / "model.keras",
+        updated_base_model_path=root / "base_model_updated.keras",
+        training_data=root / "data",
+        local_data_file=root / "data.zip",
+        feature_cache_dir=root / "feature_cache",
+        shards_dir=root / "shards",
+        augmented_epochs_dir=root / "augmented_epochs",
+        checkpoint_dir=root / "checkpoints",
+        params_epochs=1,
+        params_batch_size=2,
+        params_is_augmentation=True,
+        params_augmentations=[{"type": "flip"}, {"type": "rotation", "factor": 0.1}],
+        params_augmented_epochs=0,
+        params_image_size=(16, 16, 3),
+        params_cache_features=False,
+        params_use_shards=False,
+        params_cache_dataset=False,
+        params_read_from_zip=False,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_distribution=sys.argv[2],
+        params_num_cpu_devices=2,
+        params_checkpoint_every=1,
+        params_early_stopping_patience=0,
+    ),
+    BaseModelConfig(
+        root_dir=root,
+        base_model_path=root / "base_model.keras",
+        updated_base_model_path=root / "base_model_updated.keras",
+        params_image_size=(16, 16, 3),
+        params_learning_rate=0.01,
+        params_include_top=False,
+        params_weights=None,
+        params_classes=2,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_head="gap",
+        params_head_units=8,
+        params_head_dropout=0.0,
+    ),
+)
+training.get_base_model()
+training.train_valid_generator()
+training.train()
+print("REPLICAS", training.strategy.num_replicas_in_sync, training.global_batch_size)
+"""
+
+
+def make_workspace(tmp_path):
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (tmp_path / "data" / class_name).mkdir(parents=True)
+        for i in range(16):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (tmp_path / "data" / class_name / f"{i}.png").write_bytes(data)
+
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.Conv2D(4, 3, activation="relu")(inputs)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(
+        optimizer="sgd", loss="categorical_crossentropy", metrics=["accuracy"]
+    )
+    model.save(tmp_path / "base_model_updated.keras")
+
+    env = dict(os.environ)
+    env.pop("TF_CONFIG", None)
+    env["MLFLOW_ALLOW_FILE_STORE"] = "true"
+    env["MLFLOW_TRACKING_URI"] = (tmp_path / "mlruns").as_uri()
+    env["TF_CPP_MIN_LOG_LEVEL"] = "2"
+    return env
+
+
+def test_is_chief(monkeypatch):
+    monkeypatch.delenv("TF_CONFIG", raising=False)
+    assert is_chief()
+
+    for tf_config, expected in zip(local_cluster(2), (True, False)):
+        monkeypatch.setenv("TF_CONFIG", json.dumps(tf_config))
+        assert is_chief() is expected
+
+    monkeypatch.setenv("TF_CONFIG", json.dumps({"task": {"type": "chief"}}))
+    assert is_chief()
+
+    cluster = {"chief": ["localhost:1"], "worker": ["localhost:2", "localhost:3"]}
+    for task, expected in (
+        ({"type": "chief", "index": 0}, True),
+        ({"type": "worker", "index": 0}, False),
+        ({"type": "worker", "index": 1}, False),
+    ):
+        monkeypatch.setenv("TF_CONFIG", json.dumps({"cluster": cluster, "task": task}))
+        assert is_chief() is expected
+
+
+def test_mirrored_over_logical_cpu_devices(tmp_path):
+    env = make_workspace(tmp_path)
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT, str(tmp_path), "mirrored"],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "REPLICAS 2 4" in result.stdout
+    assert (tmp_path / "model.keras").exists()
+
+
+def test_two_local_workers(tmp_path):
+    env = make_workspace(tmp_path)
+    exit_codes = launch_local_workers(
+        [sys.executable, "-c", WORKER_SCRIPT, str(tmp_path), "multi_worker"],
+        num_workers=2,
+        env=env,
+        timeout=300,
+    )
+
+    assert exit_codes == [0, 0]
+    # only the chief saves the model and logs the run
+    assert (tmp_path / "model.keras").exists()
+    runs = list((tmp_path / "mlruns").glob("*/*/meta.yaml"))
+    assert len(runs) == 1
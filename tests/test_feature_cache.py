@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.feature_cache import FeatureCache, backbone_fingerprint
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+@pytest.fixture
+def backbone():
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    outputs = tf.keras.layers.Conv2D(2, 3, name="conv")(inputs)
+    return tf.keras.Model(inputs, outputs, name="backbone")
+
+
+def write_images(directory, count, offset=0):
+    paths = []
+    for i in range(offset, offset + count):
+        image = tf.fill((8, 8, 3), tf.constant(i * 10, dtype=tf.uint8))
+        path = directory / f"img_{i}.png"
+        tf.io.write_file(str(path), tf.io.encode_png(image))
+        paths.append(str(path))
+    return paths
+
+
+def make_cache(tmp_path, backbone):
+    key = backbone_fingerprint(backbone, weights=None, image_size=IMAGE_SIZE)
+    return FeatureCache(tmp_path / "cache", backbone, key, IMAGE_SIZE, batch_size=2)
+
+
+def test_features_match_backbone(tmp_path, backbone):
+    paths = write_images(tmp_path, 3)
+    features, rows = make_cache(tmp_path, backbone).get_features(paths)
+
+    images = np.stack([np.full(IMAGE_SIZE, i * 10 / 255.0) for i in range(3)])
+    np.testing.assert_allclose(
+        features[rows], backbone.predict(images, verbose=0), rtol=1e-5, atol=1e-6
+    )
+
+
+def test_cached_features_are_reused(tmp_path, backbone, monkeypatch):
+    paths = write_images(tmp_path, 3)
+    make_cache(tmp_path, backbone).get_features(paths)
+
+    cache = make_cache(tmp_path, backbone)
+    monkeypatch.setattr(
+        cache, "_compute", lambda *args: pytest.fail("features recomputed")
+    )
+    features, rows = cache.get_features(paths)
+    assert features.shape[0] == 3
+    assert isinstance(features, np.memmap)
+
+
+def test_cache_grows_with_new_and_duplicate_images(tmp_path, backbone):
+    paths = write_images(tmp_path, 2)
+    make_cache(tmp_path, backbone).get_features(paths)
+
+    new_paths = write_images(tmp_path, 2, offset=2)
+    features, rows = make_cache(tmp_path, backbone).get_features(
+        paths + new_paths + paths[:1]
+    )
+    assert features.shape[0] == 4
+    assert rows.tolist() == [0, 1, 2, 3, 0]
+
+
+def test_fingerprint_depends_on_weights(backbone):
+    key = backbone_fingerprint(backbone, weights=None, image_size=IMAGE_SIZE)
+    conv = backbone.get_layer("conv")
+    conv.set_weights([w + 1 for w in conv.get_weights()])
+    assert backbone_fingerprint(backbone, None, IMAGE_SIZE) != key
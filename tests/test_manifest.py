@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.data_split import split_files
+from cnnClassifier.components.manifest import Manifest, manifest_path, scan_tree
+from cnnClassifier.utils.common import get_sha256
+
+
+def write_png(path, value, shape=(6, 8, 3)):
+    data = tf.io.encode_png(tf.fill(shape, tf.constant(value, tf.uint8))).numpy()
+    path.write_bytes(data)
+
+
+@pytest.fixture
+def image_tree(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(5 + 5 * label):
+            write_png(root / class_name / f"{i}.png", label * 100 + i)
+    (root / "Normal" / "notes.txt").write_text("not an image")
+    return root
+
+
+def test_build_indexes_every_image(image_tree):
+    manifest = Manifest.build(image_tree, workers=2)
+
+    assert manifest_path(image_tree) == image_tree.parent / "data.manifest.npz"
+    assert manifest.class_names == ["Normal", "Tumor"]
+    assert manifest.labels == [0] * 5 + [1] * 10
+    assert manifest.paths[0] == str(image_tree / "Normal" / "0.png")
+    assert manifest.hashes[0] == get_sha256(image_tree / "Normal" / "0.png")
+    assert set(manifest.columns["width"]) == {8}
+    assert set(manifest.columns["height"]) == {6}
+
+    stored = Manifest.load(image_tree)
+    assert stored.paths == manifest.paths
+    assert stored.hashes == manifest.hashes
+
+
+def test_scan_lists_the_tree_without_writing(image_tree):
+    file_paths, labels, class_names = scan_tree(image_tree, workers=2)
+    assert not manifest_path(image_tree).exists()
+
+    manifest = Manifest.build(image_tree)
+    assert (file_paths, labels, class_names) == (
+        manifest.paths,
+        manifest.labels,
+        manifest.class_names,
+    )
+
+
+def test_refresh_only_rereads_changed_files(image_tree):
+    Manifest.build(image_tree)
+    mtime = manifest_path(image_tree).stat().st_mtime_ns
+
+    Manifest.build(image_tree)
+    assert manifest_path(image_tree).stat().st_mtime_ns == mtime
+
+    changed = image_tree / "Tumor" / "3.png"
+    write_png(changed, 255, shape=(4, 4, 3))
+    os.utime(changed, ns=(1, 1))
+    (image_tree / "Normal" / "4.png").unlink()
+
+    manifest = Manifest.build(image_tree)
+    assert len(manifest) == 14
+    row = manifest.paths.index(str(changed))
+    assert manifest.hashes[row] == get_sha256(changed)
+    assert manifest.columns["width"][row] == 4
+
+
+def test_split_is_stratified_and_disjoint(image_tree):
+    train, train_labels, _ = split_files(image_tree, "training")
+    valid, valid_labels, _ = split_files(image_tree, "validation")
+
+    assert not set(train) & set(valid)
+    assert len(train) + len(valid) == 15
+    assert np.bincount(valid_labels).tolist() == [1, 2]
+    assert valid == sorted(valid)
+    assert split_files(image_tree, "validation")[0] == valid  # deterministic
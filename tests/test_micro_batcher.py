@@ -0,0 +1,95 @@
+import threading
+import time
+import pytest
+from cnnClassifier.components.micro_batcher import MicroBatcher, QueueFullError
+
+
+def test_concurrent_requests_are_batched():
+    batches = []
+    release = threading.Event()
+
+    def predict_fn(items):
+        release.wait(timeout=5)
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(
+        predict_fn, max_batch_size=4, max_wait_ms=200, max_queue_size=16
+    )
+    futures = [batcher.submit(i) for i in range(8)]
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(8)]
+    assert sum(len(batch) for batch in batches) == 8
+    assert max(len(batch) for batch in batches) == 4
+
+    metrics = batcher.metrics()
+    assert (
+        sum(size * count for size, count in metrics["batch_size_histogram"].items())
+        == 8
+    )
+    assert metrics["queue_depth"] == 0
+    batcher.stop()
+
+
+def test_flush_after_max_wait():
+    batcher = MicroBatcher(
+        lambda items: items, max_batch_size=64, max_wait_ms=5, max_queue_size=16
+    )
+    assert batcher.submit("scan").result(timeout=5) == "scan"
+    assert batcher.metrics()["batch_size_histogram"] == {1: 1}
+    batcher.stop()
+
+
+def test_queue_full():
+    release = threading.Event()
+
+    def predict_fn(items):
+        release.wait(timeout=5)
+        return items
+
+    batcher = MicroBatcher(
+        predict_fn, max_batch_size=1, max_wait_ms=0, max_queue_size=1
+    )
+    batcher.submit(0)
+    with pytest.raises(QueueFullError):
+        for i in range(10):
+            batcher.submit(i)
+    release.set()
+    batcher.stop()
+
+
+def test_predict_errors_propagate():
+    def predict_fn(items):
+        raise RuntimeError("Boom!")
+
+    batcher = MicroBatcher(
+        predict_fn, max_batch_size=2, max_wait_ms=1, max_queue_size=4
+    )
+    with pytest.raises(RuntimeError, match="Boom!"):
+        batcher.submit(1).result(timeout=5)
+    batcher.stop()
+
+
+def test_cancelled_requests_are_not_predicted():
+    release, predicted = threading.Event(), []
+
+    def predict_fn(items):
+        release.wait(timeout=5)
+        predicted.extend(items)
+        return items
+
+    batcher = MicroBatcher(
+        predict_fn, max_batch_size=1, max_wait_ms=0, max_queue_size=4
+    )
+    first = batcher.submit("first")
+    while batcher.metrics()["queue_depth"]:  # "first" is being predicted
+        time.sleep(0.01)
+    queued = batcher.submit("queued")
+    assert queued.cancel()
+    release.set()
+
+    assert first.result(timeout=5) == "first"
+    assert batcher.submit("next").result(timeout=5) == "next"
+    assert predicted == ["first", "next"]
+    batcher.stop()
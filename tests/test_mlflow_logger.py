@@ -0,0 +1,98 @@
+import threading
+import mlflow
+import numpy as np
+import pytest
+import tensorflow as tf
+from mlflow.tracking import MlflowClient
+from cnnClassifier.components.mlflow_logger import MlflowMetricsCallback
+
+
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(uri)
+    yield uri
+    mlflow.set_tracking_uri(None)
+
+
+def fit_small_model(callback, epochs=2):
+    inputs = tf.keras.Input(shape=(4,))
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(inputs)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(
+        optimizer="sgd", loss="categorical_crossentropy", metrics=["accuracy"]
+    )
+
+    x = np.random.rand(32, 4).astype(np.float32)
+    y = np.eye(2, dtype=np.float32)[np.arange(32) % 2]
+    model.fit(
+        x,
+        y,
+        batch_size=4,
+        epochs=epochs,
+        validation_data=(x, y),
+        callbacks=[callback],
+        verbose=0,
+    )
+
+
+def test_metrics_reach_the_file_store(tracking_uri):
+    with mlflow.start_run() as run:
+        callback = MlflowMetricsCallback(run.info.run_id, log_every_n_batches=2)
+        fit_small_model(callback)
+
+    client = MlflowClient(tracking_uri)
+    val_loss = client.get_metric_history(run.info.run_id, "val_loss")
+    assert [m.step for m in val_loss] == [0, 1]
+    for name in ("train_loss", "train_accuracy", "val_accuracy"):
+        assert len(client.get_metric_history(run.info.run_id, name)) == 2
+    batch_loss = client.get_metric_history(run.info.run_id, "batch_loss")
+    assert [m.step for m in batch_loss] == [2, 4, 6, 8, 10, 12, 14, 16]
+    assert not callback._thread.is_alive()
+
+
+class SlowClient:
+    def __init__(self):
+        self.release = threading.Event()
+        self.logged = []
+
+    def log_batch(self, run_id, metrics):
+        self.release.wait()
+        self.logged.extend(metrics)
+
+
+def test_slow_backend_drops_batch_metrics_but_keeps_epochs():
+    client = SlowClient()
+    callback = MlflowMetricsCallback(
+        "run",
+        log_every_n_batches=1,
+        max_queue_size=4,
+        flush_interval_s=0,
+        client=client,
+    )
+    for batch in range(50):
+        callback.on_train_batch_end(batch, {"loss": 1.0, "accuracy": 0.5})
+    assert callback.dropped > 0
+
+    client.release.set()
+    callback.on_epoch_end(0, {"loss": 1.0, "val_loss": 2.0})
+    callback.close()
+
+    names = [m.key for m in client.logged]
+    assert names.count("train_loss") == 1
+    assert names.count("val_loss") == 1
+    assert (
+        names.count("batch_loss") + names.count("batch_accuracy")
+        <= 100 - callback.dropped
+    )
+
+
+def test_send_errors_do_not_stop_training():
+    class BrokenClient:
+        def log_batch(self, run_id, metrics):
+            raise ConnectionError("offline")
+
+    callback = MlflowMetricsCallback("run", client=BrokenClient())
+    callback.on_epoch_end(0, {"loss": 1.0})
+    callback.close()
@@ -0,0 +1,139 @@
+import json
+import mlflow
+import numpy as np
+import pytest
+import tensorflow as tf
+from dataclasses import replace
+from mlflow.tracking import MlflowClient
+from cnnClassifier.components.data_split import split_files
+from cnnClassifier.components.manifest import manifest_path
+from cnnClassifier.components.model_evaluation import Evaluation, StreamingMetrics
+from cnnClassifier.entity.config_entity import EvaluationConfig
+
+IMAGE_SIZE = (16, 16, 3)
+
+
+def exact_roc_auc(scores, positive):
+    pos, neg = scores[positive], scores[~positive]
+    wins = (pos[:, None] > neg[None, :]).sum() + 0.5 * (pos[:, None] == neg).sum()
+    return wins / (len(pos) * len(neg))
+
+
+def test_streaming_metrics_match_the_full_computation():
+    rng = np.random.RandomState(0)
+    labels = rng.randint(0, 3, size=500)
+    logits = rng.normal(size=(500, 3)) + 1.5 * np.eye(3)[labels]
+    probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+    metrics = StreamingMetrics(["a", "b", "c"])
+    for start in range(0, 500, 64):
+        metrics.update(probabilities[start : start + 64], labels[start : start + 64])
+    result = metrics.result()
+
+    predicted = probabilities.argmax(axis=1)
+    assert result["num_images"] == 500
+    assert result["accuracy"] == pytest.approx(np.mean(predicted == labels))
+    assert result["confusion_matrix"][1][2] == np.sum((labels == 1) & (predicted == 2))
+    assert result["loss"] == pytest.approx(
+        -np.mean(np.log(probabilities[np.arange(500), labels]))
+    )
+    for c, name in enumerate(["a", "b", "c"]):
+        class_metrics = result["per_class"][name]
+        assert class_metrics["precision"] == pytest.approx(
+            np.mean(labels[predicted == c] == c)
+        )
+        assert class_metrics["recall"] == pytest.approx(
+            np.mean(predicted[labels == c] == c)
+        )
+        assert class_metrics["roc_auc"] == pytest.approx(
+            exact_roc_auc(probabilities[:, c], labels == c), abs=1e-3
+        )
+
+
+def test_roc_auc_is_undefined_for_a_single_class():
+    metrics = StreamingMetrics(["Normal", "Tumor"])
+    metrics.update(np.array([[0.9, 0.1], [0.4, 0.6]]), np.array([0, 0]))
+    result = metrics.result()
+    assert result["per_class"]["Normal"]["roc_auc"] is None
+    assert result["macro_roc_auc"] is None
+    assert result["per_class"]["Tumor"]["precision"] == 0.0
+
+
+@pytest.fixture
+def config(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(10):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.GlobalAveragePooling2D()(inputs)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    tf.keras.Model(inputs, outputs).save(tmp_path / "model.keras")
+
+    return EvaluationConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.keras",
+        training_data=root,
+        local_data_file=tmp_path / "data.zip",
+        scores_file=tmp_path / "scores.json",
+        data_dir=None,
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=3,
+        params_read_from_zip=False,
+    )
+
+
+def test_evaluates_the_validation_split(config, tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+    evaluation = Evaluation(config)
+    try:
+        scores = evaluation.evaluate()
+        evaluation.log_into_mlflow(scores)
+    finally:
+        mlflow.set_tracking_uri(None)
+
+    _, valid_labels, _ = split_files(config.training_data, "validation")
+    assert scores["num_images"] == len(valid_labels) == 4
+    assert np.sum(scores["confusion_matrix"], axis=1).tolist() == [2, 2]
+    assert scores["throughput"]["images_per_second"] > 0
+    with open(config.scores_file) as f:
+        assert json.load(f)["accuracy"] == scores["accuracy"]
+
+    client = MlflowClient((tmp_path / "mlruns").as_uri())
+    [run] = client.search_runs(client.search_experiments()[0].experiment_id)
+    assert run.data.metrics["eval_accuracy"] == scores["accuracy"]
+    assert "eval_recall_Tumor" in run.data.metrics
+
+
+def test_evaluates_any_directory(config, tmp_path):
+    other = tmp_path / "other"
+    (other / "Tumor").mkdir(parents=True)
+    for i in range(5):
+        data = tf.io.encode_png(tf.fill(IMAGE_SIZE, tf.constant(200, tf.uint8)))
+        (other / "Tumor" / f"{i}.png").write_bytes(data.numpy())
+
+    scores = Evaluation(replace(config, data_dir=other)).evaluate()
+    assert scores["num_images"] == 5
+    assert scores["per_class"]["Tumor"]["support"] == 5
+    assert scores["per_class"]["Normal"]["support"] == 0
+    assert not manifest_path(other).exists()  # nothing written into the input
+
+    (other / "Cyst").mkdir()
+    (other / "Cyst" / "0.png").write_bytes((other / "Tumor" / "0.png").read_bytes())
+    with pytest.raises(ValueError):
+        Evaluation(replace(config, data_dir=other)).evaluate()
+
+
+def test_rejects_an_empty_directory(config, tmp_path):
+    empty = tmp_path / "empty"
+    (empty / "Tumor").mkdir(parents=True)
+
+    with pytest.raises(ValueError, match="No images"):
+        Evaluation(replace(config, data_dir=empty)).evaluate()
+    assert not config.scores_file.exists()
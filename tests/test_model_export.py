@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from dataclasses import replace
+from cnnClassifier.components.model_export import ModelExport
+from cnnClassifier.entity.config_entity import ModelExportConfig, PredictionConfig
+from cnnClassifier.pipeline.prediction import (
+    PredictionPipeline,
+    TFLitePredictionPipeline,
+)
+
+IMAGE_SIZE = (16, 16, 3)
+
+
+@pytest.fixture
+def config(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(10):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+
+    tf.keras.utils.set_random_seed(0)  # int8 error depends on the weights
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.Conv2D(4, 3, activation="relu")(inputs)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(2, activation="softmax", dtype="float32")(x)
+    tf.keras.Model(inputs, outputs).save(tmp_path / "model.keras")
+
+    return ModelExportConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.keras",
+        training_data=root,
+        local_data_file=tmp_path / "data.zip",
+        dynamic_range_model_path=tmp_path / "model_dynamic_range.tflite",
+        int8_model_path=tmp_path / "model_int8.tflite",
+        report_file=tmp_path / "report.json",
+        serving_model_dir=tmp_path / "serving_model",
+        latency_runs=3,
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=4,
+        params_calibration_samples=8,
+        params_read_from_zip=False,
+    )
+
+
+def test_export_writes_both_variants_and_report(config):
+    model_export = ModelExport(config)
+    model_export.export()
+    report = model_export.evaluate()
+
+    assert config.report_file.exists()
+    assert report["num_validation_images"] == 4
+    assert set(report["variants"]) == {"keras", "dynamic_range", "int8", "mapped"}
+    assert report["variants"]["keras"]["accuracy_delta"] == 0.0
+    assert report["variants"]["mapped"]["agreement_with_keras"] == 1.0
+    for variant in report["variants"].values():
+        assert 0.0 <= variant["accuracy"] <= 1.0
+        assert variant["latency"]["p50_ms"] > 0
+        assert variant["load_seconds"] > 0
+
+
+def test_tflite_predictor_matches_keras_api(config):
+    ModelExport(config).export()
+    prediction_config = PredictionConfig(
+        trained_model_path=config.trained_model_path,
+        class_names=config.class_names,
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=4,
+    )
+    keras = PredictionPipeline(prediction_config)
+    images = [np.full(IMAGE_SIZE, i * 40, dtype=np.float32) for i in range(5)]
+    expected = keras.predict_proba(images)
+
+    for path in (config.dynamic_range_model_path, config.int8_model_path):
+        tflite = TFLitePredictionPipeline(
+            replace(prediction_config, trained_model_path=path)
+        )
+        probabilities = tflite.predict_proba(images)
+        assert probabilities.shape == (5, 2)
+        assert probabilities.dtype == np.float32
+        np.testing.assert_allclose(probabilities, expected, atol=0.05)
+        assert [r["class"] for r in tflite.predict(images)] == [
+            r["class"] for r in keras.predict(images)
+        ]
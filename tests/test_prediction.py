@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier.entity.config_entity import PredictionConfig
+from cnnClassifier.pipeline.prediction import PredictionPipeline
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.Flatten()(inputs)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    model = tf.keras.Model(inputs, outputs)
+    path = tmp_path / "model.keras"
+    model.save(path)
+    return path
+
+
+@pytest.fixture
+def pipeline(model_path):
+    config = PredictionConfig(
+        trained_model_path=model_path,
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=4,
+    )
+    return PredictionPipeline(config)
+
+
+def test_model_loaded_once(monkeypatch, pipeline):
+    def fail(*args, **kwargs):
+        raise AssertionError("model reloaded")
+
+    monkeypatch.setattr(tf.keras.models, "load_model", fail)
+    pipeline.predict(np.zeros(IMAGE_SIZE))
+    pipeline.predict(np.zeros(IMAGE_SIZE))
+
+
+def test_predict_single_array(pipeline):
+    result = pipeline.predict(np.zeros(IMAGE_SIZE))
+    assert len(result) == 1
+    assert result[0]["class"] in ("Normal", "Tumor")
+    assert 0.0 <= result[0]["confidence"] <= 1.0
+
+
+def test_predict_proba_pads_to_fixed_batches(pipeline):
+    calls = []
+    predict = pipeline.model.predict
+
+    def spy(x, **kwargs):
+        calls.append(x.shape[0])
+        return predict(x, **kwargs)
+
+    pipeline.model.predict = spy
+    images = [np.full(IMAGE_SIZE, i, dtype=np.float32) for i in range(5)]
+    probabilities = pipeline.predict_proba(images)
+
+    assert probabilities.shape == (5, 2)
+    assert calls == [8]
+
+
+def test_predict_paths_and_resize(tmp_path, pipeline):
+    image = tf.cast(tf.random.uniform((16, 12, 3), maxval=255), tf.uint8)
+    path = tmp_path / "scan.jpg"
+    tf.io.write_file(str(path), tf.io.encode_jpeg(image))
+
+    result = pipeline.predict([path, str(path), Path(path).read_bytes()])
+    assert len(result) == 3
+    assert result[0] == result[1]
+
+
+def test_paths_bytes_and_arrays_are_preprocessed_alike(tmp_path, pipeline):
+    image = tf.cast(tf.random.uniform((16, 12, 3), maxval=255, seed=0), tf.uint8)
+    path = tmp_path / "scan.png"
+    tf.io.write_file(str(path), tf.io.encode_png(image))
+
+    from_path = pipeline.load_image(path)
+    np.testing.assert_array_equal(from_path, pipeline.load_image(path.read_bytes()))
+    np.testing.assert_array_equal(from_path, pipeline.load_image(image.numpy()))
+    expected = tf.image.resize(image, IMAGE_SIZE[:2]).numpy()
+    np.testing.assert_allclose(from_path, expected, atol=1e-4)
+
+    probabilities = pipeline.predict_proba([path, path.read_bytes(), image.numpy()])
+    np.testing.assert_allclose(probabilities[0], probabilities[1])
+    np.testing.assert_allclose(probabilities[0], probabilities[2])
+
+
+def test_predict_empty(pipeline):
+    assert pipeline.predict([]) == []
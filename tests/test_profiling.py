@@ -0,0 +1,43 @@
+import json
+import pytest
+from cnnClassifier.utils.profiling import Profiler, profiling, span
+
+
+def test_nested_spans_are_recorded_innermost_first(tmp_path):
+    profiler = Profiler()
+    with profiling(profiler):
+        with span("Training model"):
+            with span("fit"):
+                sum(range(10_000))
+
+    names = [record["name"] for record in profiler.records]
+    assert names == ["Training model/fit", "Training model"]
+    outer = profiler.records[1]
+    assert outer["status"] == "completed"
+    assert outer["wall_s"] >= profiler.records[0]["wall_s"]
+    assert outer["peak_rss_mb"] > 0
+
+    profiler.save(tmp_path / "report.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["spans"] == profiler.records
+
+
+def test_failed_span_is_recorded():
+    profiler = Profiler()
+    with pytest.raises(RuntimeError), profiling(profiler), span("broken"):
+        raise RuntimeError("Boom!")
+    assert profiler.records[0]["status"] == "failed"
+
+
+def test_span_without_active_profiler_is_a_no_op():
+    profiler = Profiler()
+    with span("ignored"):
+        pass
+    assert profiler.records == []
+
+
+def test_top_level_spans_write_tensorflow_traces(tmp_path):
+    profiler = Profiler(trace_dir=tmp_path)
+    with profiling(profiler), span("Prepare base model"), span("get_base_model"):
+        pass
+    assert any((tmp_path / "prepare_base_model").rglob("*.xplane.pb"))
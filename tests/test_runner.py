@@ -0,0 +1,162 @@
+import pytest
+import yaml
+from dataclasses import replace
+from pathlib import Path
+from cnnClassifier.config.configuration import ConfigurationManager
+from cnnClassifier.pipeline.runner import Stage, StageRunner
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {
+        "artifacts_root": "artifacts",
+        "prepare": {"output_path": "artifacts/prepare/out.txt"},
+        "train": {"output_path": "artifacts/train/model.txt"},
+        "stage_runner": {"root_dir": "artifacts/stage_runner"},
+    }
+    params = {"EPOCHS": 1, "SEED": 0}
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+    (tmp_path / "params.yaml").write_text(yaml.safe_dump(params))
+    return tmp_path
+
+
+def make_runner(workspace, calls):
+    class Prepare:
+        def main(self):
+            calls.append("prepare")
+            out = workspace / "artifacts/prepare/out.txt"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(str(len(calls)))
+
+    class Train:
+        def main(self):
+            calls.append("train")
+            out = workspace / "artifacts/train/model.txt"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text("model")
+
+    stages = [
+        Stage(
+            name="Prepare",
+            pipeline=Prepare,
+            config_sections=("prepare",),
+            params=("SEED",),
+            outputs=("prepare.output_path",),
+        ),
+        Stage(
+            name="Train",
+            pipeline=Train,
+            config_sections=("train",),
+            params=("EPOCHS",),
+            inputs=("prepare.output_path",),
+            outputs=("train.output_path",),
+        ),
+    ]
+    config_manager = ConfigurationManager(
+        workspace / "config.yaml", workspace / "params.yaml"
+    )
+    return StageRunner(stages, config_manager)
+
+
+def set_param(workspace, key, value):
+    path = workspace / "params.yaml"
+    params = yaml.safe_load(path.read_text())
+    params[key] = value
+    path.write_text(yaml.safe_dump(params))
+
+
+def test_second_run_skips_everything(workspace):
+    calls = []
+    assert make_runner(workspace, calls).run() == ["Prepare", "Train"]
+    assert make_runner(workspace, calls).run() == []
+    assert calls == ["prepare", "train"]
+
+
+def test_param_change_reruns_stage_and_downstream(workspace):
+    calls = []
+    make_runner(workspace, calls).run()
+
+    set_param(workspace, "EPOCHS", 5)
+    assert make_runner(workspace, calls).run() == ["Train"]
+
+    set_param(workspace, "SEED", 1)
+    assert make_runner(workspace, calls).run() == ["Prepare", "Train"]
+
+
+def test_missing_output_reruns_stage(workspace):
+    calls = []
+    make_runner(workspace, calls).run()
+    (workspace / "artifacts/train/model.txt").unlink()
+    assert make_runner(workspace, calls).run() == ["Train"]
+
+
+def test_manifest_input_reruns_stage_when_the_manifest_changes(workspace):
+    calls = []
+    runner = make_runner(workspace, calls)
+    manifest = workspace / "artifacts/prepare/out.txt.manifest.npz"
+    assert runner._config_path("manifest:prepare.output_path") == Path(
+        "artifacts/prepare/out.txt.manifest.npz"
+    )
+    runner.stages[1] = replace(
+        runner.stages[1], inputs=("manifest:prepare.output_path",)
+    )
+    runner.run()
+
+    manifest.write_bytes(b"rows")
+    assert runner.run() == ["Train"]
+    assert runner.run() == []
+
+
+def test_outputs_of_a_disabled_stage_are_not_required(workspace):
+    calls = []
+    set_param(workspace, "TRAIN", False)
+    runner = make_runner(workspace, calls)
+    runner.stages[1] = replace(runner.stages[1], enabled_by="TRAIN")
+    runner.run()
+    (workspace / "artifacts/train/model.txt").unlink()
+    assert runner.run() == []
+
+    set_param(workspace, "TRAIN", True)
+    runner = make_runner(workspace, calls)
+    runner.stages[1] = replace(runner.stages[1], enabled_by="TRAIN", params=("TRAIN",))
+    assert runner.run() == ["Train"]
+    (workspace / "artifacts/train/model.txt").unlink()
+    assert runner.run() == ["Train"]
+
+
+def test_force_and_from_stage(workspace):
+    calls = []
+    make_runner(workspace, calls).run()
+    assert make_runner(workspace, calls).run(force=True) == ["Prepare", "Train"]
+    assert make_runner(workspace, calls).run(from_stage="Train") == ["Train"]
+    with pytest.raises(ValueError, match="Unknown stage"):
+        make_runner(workspace, calls).run(from_stage="Deploy")
+
+
+def test_failed_stage_is_not_recorded(workspace):
+    class Broken:
+        def main(self):
+            raise RuntimeError("Boom!")
+
+    runner = make_runner(workspace, [])
+    runner.stages[1] = Stage(name="Train", pipeline=Broken)
+    with pytest.raises(RuntimeError, match="Boom!"):
+        runner.run()
+
+    calls = []
+    assert make_runner(workspace, calls).run() == ["Train"]
+
+
+def test_fingerprints_wait_for_background_saves(workspace):
+    saved = []
+
+    class Context:
+        def wait(self):
+            saved.append(len(list((workspace / "artifacts/stage_runner").glob("*"))))
+
+    runner = make_runner(workspace, [])
+    runner.context = Context()
+    runner.run()
+    assert saved == [0]
+    assert make_runner(workspace, []).run() == []
@@ -0,0 +1,81 @@
+import json
+import numpy as np
+import pytest
+import tensorflow as tf
+from cnnClassifier.components.serving_artifact import (
+    MappedModel,
+    SPEC_FILE,
+    WEIGHTS_FILE,
+    save_serving_model,
+)
+from cnnClassifier.entity.config_entity import PredictionConfig
+from cnnClassifier.pipeline.prediction import (
+    MappedPredictionPipeline,
+    PredictionPipeline,
+)
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+@pytest.fixture
+def model():
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    x = tf.keras.layers.Conv2D(4, 3, activation="relu")(inputs)
+    x = tf.keras.layers.BatchNormalization()(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    x = tf.keras.layers.Dropout(0.5)(x)
+    outputs = tf.keras.layers.Dense(2, activation="softmax")(x)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer="sgd", loss="categorical_crossentropy")
+    return model
+
+
+def test_mapped_model_matches_keras_without_allocating_weights(model, tmp_path):
+    save_serving_model(model, tmp_path / "serving")
+    model.save(tmp_path / "model.keras")
+
+    mapped = MappedModel(tmp_path / "serving")
+    assert all(v._value is None for v in mapped.model.variables)
+    for num_images in (3, 1):
+        images = np.random.RandomState(num_images).rand(num_images, *IMAGE_SIZE)
+        images = images.astype(np.float32)
+        np.testing.assert_array_equal(
+            mapped.predict_on_batch(images), model.predict_on_batch(images)
+        )
+
+    config = PredictionConfig(
+        trained_model_path=tmp_path / "model.keras",
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=2,
+    )
+    images = [np.full(IMAGE_SIZE, i * 50, dtype=np.float32) for i in range(5)]
+    expected = PredictionPipeline(config).predict(images)
+    config = PredictionConfig(
+        trained_model_path=tmp_path / "serving",
+        class_names=["Normal", "Tumor"],
+        params_image_size=IMAGE_SIZE,
+        params_batch_size=2,
+    )
+    assert MappedPredictionPipeline(config).predict(images) == expected
+    # the mapping is copy-on-write: serving never modifies the file
+    save_serving_model(model, tmp_path / "again")
+    assert (tmp_path / "serving" / WEIGHTS_FILE).read_bytes() == (
+        tmp_path / "again" / WEIGHTS_FILE
+    ).read_bytes()
+
+
+def test_rejects_an_inconsistent_artifact(model, tmp_path):
+    save_serving_model(model, tmp_path)
+    with open(tmp_path / WEIGHTS_FILE, "ab") as f:
+        f.write(b"\0" * 64)
+    with pytest.raises(ValueError, match="bytes"):
+        MappedModel(tmp_path)
+
+    save_serving_model(model, tmp_path)
+    spec = json.loads((tmp_path / SPEC_FILE).read_text())
+    spec["format_version"] += 1
+    (tmp_path / SPEC_FILE).write_text(json.dumps(spec))
+    with pytest.raises(ValueError, match="format"):
+        MappedModel(tmp_path)
@@ -4,7 +4,13 @@ from cnnClassifier.pipeline.stage_1_data_ingestion import DataIngestionTrainingP
 
 def test_pipeline_runs(monkeypatch):
 
-    called = {"get_config": False, "download_file": False, "extract_zip": False}
+    called = {
+        "get_config": False,
+        "download_file": False,
+        "extract_zip": False,
+        "build_manifest": False,
+        "validate_images": False,
+    }
 
     class FakeConfig:
         pass
@@ -25,6 +31,12 @@ def test_pipeline_runs(monkeypatch):
         def extract_zip_file(self):
             called["extract_zip"] = True
 
+        def build_manifest(self):
+            called["build_manifest"] = True
+
+        def validate_images(self):
+            called["validate_images"] = True
+
     monkeypatch.setattr(
         "cnnClassifier.pipeline.stage_1_data_ingestion.ConfigurationManager",
         FakeConfigManager,
@@ -39,6 +51,8 @@ def test_pipeline_runs(monkeypatch):
     assert called["get_config"] is True
     assert called["download_file"] is True
     assert called["extract_zip"] is True
+    assert called["build_manifest"] is True
+    assert called["validate_images"] is True
 
 
 def test_pipeline_exception(monkeypatch):
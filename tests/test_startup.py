@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+
+HEAVY_MODULES = ("tensorflow", "keras", "mlflow", "dagshub", "gdown", "joblib")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "main",
+        "cnnClassifier.config.configuration",
+        "cnnClassifier.pipeline.runner",
+        "cnnClassifier.pipeline.stage_3_model_training",
+    ],
+)
+def test_orchestration_imports_stay_light(module):
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages = {name.split(".")[0] for name in result.stdout.split()}
+    assert not packages.intersection(HEAVY_MODULES)
@@ -0,0 +1,160 @@
+import json
+import threading
+import mlflow
+import numpy as np
+import pytest
+import tensorflow as tf
+from mlflow.tracking import MlflowClient
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
+from cnnClassifier.components.data_split import list_samples, split_files
+from cnnClassifier.components.manifest import Manifest
+from cnnClassifier.components.sweep import (
+    PruningCallback,
+    Sweep,
+    decode_images,
+    expand_trials,
+    fold_indices,
+)
+from cnnClassifier.entity.config_entity import SweepConfig
+
+IMAGE_SIZE = (16, 16, 3)
+
+
+@pytest.fixture
+def image_tree(tmp_path):
+    root = tmp_path / "data"
+    for label, class_name in enumerate(["Normal", "Tumor"]):
+        (root / class_name).mkdir(parents=True)
+        for i in range(10):
+            value = tf.constant(label * 150 + i * 5, dtype=tf.uint8)
+            data = tf.io.encode_png(tf.fill(IMAGE_SIZE, value)).numpy()
+            (root / class_name / f"{i}.png").write_bytes(data)
+    return root
+
+
+def test_expand_trials():
+    space = {"LEARNING_RATE": [0.1, 0.01, 0.001], "BATCH_SIZE": [8, 16]}
+
+    grid = expand_trials(space, "grid", num_trials=0)
+    assert len(grid) == 6
+    assert {"BATCH_SIZE": 8, "LEARNING_RATE": 0.1} in grid
+
+    sampled = expand_trials(space, "random", num_trials=4)
+    assert len(sampled) == 4
+    assert all(trial in grid for trial in sampled)
+    assert sampled == expand_trials(space, "random", num_trials=4)
+
+    with pytest.raises(ValueError):
+        expand_trials(space, "bayesian", num_trials=4)
+
+
+def test_single_fold_is_the_project_split(image_tree):
+    paths, labels, _ = list_samples(image_tree)
+    [(train, valid)] = fold_indices(labels, folds=1)
+
+    expected_valid, _, _ = split_files(image_tree, "validation")
+    assert [paths[i] for i in valid] == expected_valid
+    assert len(train) + len(valid) == len(paths)
+
+
+def test_k_folds_partition_the_samples():
+    labels = np.array([0] * 12 + [1] * 8)
+    folds = fold_indices(labels, folds=4)
+    valid = np.concatenate([v for _, v in folds])
+    assert sorted(valid) == list(range(20))
+    for train, valid in folds:
+        assert not set(train) & set(valid)
+        assert len(train) + len(valid) == 20
+        assert np.bincount(labels[valid]).tolist() == [3, 2]  # stratified
+
+
+def test_decode_images_once(image_tree, tmp_path):
+    manifest = Manifest.load(image_tree)
+    out_file = tmp_path / "images.npy"
+
+    decode_images(manifest.paths, manifest.hashes, IMAGE_SIZE, out_file)
+    images = np.load(out_file, mmap_mode="r")
+    assert images.shape == (20, *IMAGE_SIZE)
+    assert images.dtype == np.uint8
+    assert images[0].max() == 0 and images[-1].min() == 195
+
+    mtime = out_file.stat().st_mtime_ns
+    decode_images(manifest.paths, manifest.hashes, IMAGE_SIZE, out_file)
+    assert out_file.stat().st_mtime_ns == mtime
+
+
+def test_pruning_below_the_median():
+    reports, pruned = {"0/0": [0.8, 0.9]}, {}
+    model = tf.keras.Sequential([tf.keras.Input((1,)), tf.keras.layers.Dense(1)])
+    callback = PruningCallback("trial_002", 0, reports, threading.Lock(), pruned)
+    callback.set_model(model)
+    model.stop_training = False  # reset by fit at the start of training
+
+    callback.on_epoch_end(0, {"val_accuracy": 0.9})
+    assert not model.stop_training
+
+    callback.on_epoch_end(0, {"val_accuracy": 0.5})
+    assert model.stop_training
+    assert pruned == {"trial_002": 0}
+    assert reports["0/0"] == [0.8, 0.9, 0.9, 0.5]
+
+
+def test_sweep_logs_nested_runs(image_tree, tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+
+    inputs = tf.keras.Input(shape=IMAGE_SIZE)
+    outputs = tf.keras.layers.Conv2D(4, 3, activation="relu")(inputs)
+    tf.keras.Model(inputs, outputs).save(tmp_path / "base_model.keras")
+
+    config = SweepConfig(
+        root_dir=tmp_path,
+        base_model_path=tmp_path / "base_model.keras",
+        training_data=image_tree,
+        decoded_images_file=tmp_path / "images.npy",
+        results_file=tmp_path / "results.json",
+        augmented_epochs_dir=tmp_path / "augmented_epochs",
+        params_image_size=IMAGE_SIZE,
+        params_classes=2,
+        params_precision="float32",
+        params_jit_compile=False,
+        params_defaults={
+            "LEARNING_RATE": 0.01,
+            "BATCH_SIZE": 4,
+            "EPOCHS": 1,
+            "HEAD": "gap",
+            "HEAD_UNITS": 8,
+            "HEAD_DROPOUT": 0.0,
+        },
+        params_is_augmentation=True,
+        params_augmentations=[{"type": "flip"}, {"type": "zoom", "factor": 0.1}],
+        params_augmented_epochs=2,
+        params_search="grid",
+        params_space={"LEARNING_RATE": [0.1, 0.01]},
+        params_num_trials=2,
+        params_folds=2,
+        params_workers=2,
+        params_threads_per_trial=1,
+        params_prune=True,
+    )
+    try:
+        summary = Sweep(config).run()
+    finally:
+        mlflow.set_tracking_uri(None)
+
+    assert [t["status"] for t in summary] == ["completed", "completed"]
+    assert all(len(t["folds"]) == 2 for t in summary)
+    with open(config.results_file) as f:
+        assert json.load(f)["best"]["trial"] == summary[0]["trial"]
+
+    client = MlflowClient((tmp_path / "mlruns").as_uri())
+    runs = client.search_runs(client.search_experiments()[0].experiment_id)
+    by_name = {run.info.run_name: run for run in runs}
+    sweep_id = by_name["sweep"].info.run_id
+    assert "best_val_accuracy" in by_name["sweep"].data.metrics
+    for trial in ("trial_000", "trial_001"):
+        trial_run = by_name[trial]
+        assert trial_run.data.tags[MLFLOW_PARENT_RUN_ID] == sweep_id
+        assert "mean_val_accuracy" in trial_run.data.metrics
+        fold_run = by_name[f"{trial}_fold_1"]
+        assert fold_run.data.tags[MLFLOW_PARENT_RUN_ID] == trial_run.info.run_id
@@ -0,0 +1,57 @@
+import zipfile
+import numpy as np
+import pytest
+import tensorflow as tf
+from pathlib import Path
+from cnnClassifier.components.data_split import (
+    directory_split,
+    split_files,
+    split_samples,
+)
+from cnnClassifier.components.zip_dataset import ZipImageDataset
+
+IMAGE_SIZE = (8, 8, 3)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    root = tmp_path / "data"
+    zip_path = tmp_path / "data.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for label, class_name in enumerate(["Normal", "Tumor"]):
+            (root / class_name).mkdir(parents=True)
+            for i in range(5):
+                value = tf.constant(label * 100 + i * 10, dtype=tf.uint8)
+                data = tf.io.encode_png(tf.fill((10, 12, 3), value)).numpy()
+                (root / class_name / f"{class_name}-{i}.png").write_bytes(data)
+                zf.writestr(f"{class_name}/{class_name}-{i}.png", data)
+        zf.writestr("README.txt", "not an image")
+    return zip_path, root
+
+
+def test_index_reads_only_images(archive):
+    zip_path, _ = archive
+    dataset = ZipImageDataset(zip_path, IMAGE_SIZE, batch_size=4)
+    assert dataset.class_names == ["Normal", "Tumor"]
+    assert len(dataset.members) == 10
+    assert dataset.labels == [0] * 5 + [1] * 5
+
+
+@pytest.mark.parametrize("subset", ["training", "validation"])
+def test_split_matches_extracted_tree(archive, subset):
+    zip_path, root = archive
+    dataset = ZipImageDataset(zip_path, IMAGE_SIZE, batch_size=4)
+
+    members, _ = split_samples(dataset.members, dataset.labels, subset)
+    file_paths, _, _ = split_files(root, subset)
+    assert members == [Path(p).relative_to(root).as_posix() for p in file_paths]
+
+
+def test_images_match_directory_reader(archive):
+    zip_path, root = archive
+    from_zip = ZipImageDataset(zip_path, IMAGE_SIZE, batch_size=2).dataset("validation")
+    from_dir = directory_split(root, "validation", IMAGE_SIZE[:2], batch_size=2)
+
+    for (zip_x, zip_y), (dir_x, dir_y) in zip(from_zip, from_dir):
+        np.testing.assert_allclose(zip_x.numpy(), dir_x.numpy())
+        np.testing.assert_array_equal(zip_y.numpy(), dir_y.numpy())